@@ -1,5 +1,6 @@
 from .orchestrator import OrchestratorAgent
 from .liquidation_agent import LiquidationAgent
 from .indicator_agent import IndicatorAgent
+from .indicator_liquidation_agent import IndicatorLiquidationAgent
 
-__all__ = ["OrchestratorAgent", "LiquidationAgent", "IndicatorAgent"]
+__all__ = ["OrchestratorAgent", "LiquidationAgent", "IndicatorAgent", "IndicatorLiquidationAgent"]
@@ -1,27 +1,17 @@
-from langchain_cerebras import ChatCerebras
 from langchain_core.messages import HumanMessage, SystemMessage
-from typing import Dict, Any
-from datetime import datetime
-from config.settings import settings
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from string import Template
 from mcp_server.client import mcp_client
+from agents.llm import get_llm
+from agents.utils import collect_stream, extract_json, output_tool, parse_output, validate_output
+from models.schemas import IndicatorAgentOutput
+import asyncio
 import json
+import numpy as np
 
 
-class IndicatorAgent:
-    """
-    Indicator Agent - Specialized in analyzing technical indicators
-    (RSI, MACD, EMA) for trading signals
-    """
-
-    def __init__(self):
-        self.llm = ChatCerebras(
-            api_key=settings.cerebras_api_key,
-            model="llama3.1-8b",  # Fast model for specialized task
-            temperature=0.3,  # More deterministic for technical analysis
-            max_tokens=1500
-        )
-
-        self.system_prompt = """You are the Indicator Agent for tradeSmart.AI, an expert in technical indicator analysis.
+_INDICATOR_SYSTEM_PROMPT = """You are the Indicator Agent for tradeSmart.AI, an expert in technical indicator analysis.
 
 Your ONLY job is to analyze technical indicators and provide trading signals:
 
@@ -45,39 +35,100 @@ Your ONLY job is to analyze technical indicators and provide trading signals:
    - Volume > 1.5x average: Strong conviction
    - Volume < 0.5x average: Weak conviction
 
-Return your findings in this EXACT JSON format:
-{
-    "market_bias": "<bullish|bearish|neutral>",
-    "indicators": {
-        "rsi": <number>,
-        "rsi_signal": "<oversold|neutral|overbought>",
-        "macd": {
-            "macd_line": <number>,
-            "signal_line": <number>,
-            "histogram": <number>
-        },
-        "macd_signal": "<bullish|bearish|neutral>",
-        "ema_20": <number>,
-        "ema_50": <number>,
-        "trend": "<uptrend|downtrend|sideways>",
-        "volume_ratio": <number>
-    },
-    "key_signals": [
-        "<actionable signal 1>",
-        "<actionable signal 2>",
-        ...
-    ],
-    "confidence": "<high|medium|low>",
-    "analysis_summary": "<brief summary of market condition and recommended action>"
-}
+Call the `emit_analysis` tool with your findings.
 
 Be data-driven. Cite specific indicator values. Provide clear, actionable signals."""
 
+_INDICATOR_SYSTEM_MSG = SystemMessage(content=_INDICATOR_SYSTEM_PROMPT)
+
+_INDICATOR_BATCH_SYSTEM_PROMPT = f"""{_INDICATOR_SYSTEM_PROMPT}
+
+You will receive indicator data for several symbols, each under a "## <symbol>" heading.
+Analyze each symbol independently, then call the `emit_analysis` tool ONCE with
+an object keyed by symbol, holding each symbol's findings."""
+
+_INDICATOR_BATCH_SYSTEM_MSG = SystemMessage(content=_INDICATOR_BATCH_SYSTEM_PROMPT)
+
+_INDICATOR_CONTEXT_TEMPLATE = Template("""
+Symbol: $symbol
+Timeframe: $timeframe
+
+Current Technical Indicators:
+
+RSI: $rsi
+RSI Signal: $rsi_signal
+
+MACD:
+  - MACD Line: $macd_line
+  - Signal Line: $signal_line
+  - Histogram: $histogram
+  - Signal: $macd_signal
+
+EMA:
+  - EMA 20: $ema_20
+  - EMA 50: $ema_50
+  - Trend: $trend
+
+Volume:
+  - Volume Ratio: ${volume_ratio}x average
+
+Task: Analyze these indicators to determine:
+1. Overall market bias (bullish, bearish, or neutral)
+2. Key trading signals and entry/exit opportunities
+3. Confidence level in the analysis
+4. Actionable recommendations for traders
+""")
+
+# Symbols row-marshaled into one batched LLM call
+_BATCH_SIZE = 8
+# Output token budget for a full batch
+_BATCH_MAX_TOKENS = 4000
+
+
+def compute_bias(rsi: np.ndarray, macd_signal: np.ndarray, trend: np.ndarray) -> np.ndarray:
+    """
+    Rule-based market bias over arrays of symbols
+
+    Each of RSI < 40, a bullish MACD and an uptrend counts as a bullish
+    signal; RSI > 60, a bearish MACD and a downtrend count as bearish.
+
+    Args:
+        rsi: RSI per symbol (NaN where missing)
+        macd_signal: MACD signal per symbol
+        trend: Trend per symbol
+
+    Returns:
+        Array of 'bullish', 'bearish' or 'neutral' per symbol
+    """
+    bull = (rsi < 40).astype(np.int8) + (macd_signal == 'bullish') + (trend == 'uptrend')
+    bear = (rsi > 60).astype(np.int8) + (macd_signal == 'bearish') + (trend == 'downtrend')
+    return np.where(bull > bear, 'bullish', np.where(bear > bull, 'bearish', 'neutral'))
+
+
+class IndicatorAgent:
+    """
+    Indicator Agent - Specialized in analyzing technical indicators
+    (RSI, MACD, EMA) for trading signals
+    """
+
+    def __init__(self):
+        # Fast model, low temperature for deterministic technical analysis
+        self.llm = get_llm("llama3.1-8b", 0.3, 1500).bind_tools(
+            [output_tool(IndicatorAgentOutput, "Report the indicator analysis")],
+            tool_choice="required"
+        )
+
+        self.batch_llm = get_llm("llama3.1-8b", 0.3, _BATCH_MAX_TOKENS).bind_tools(
+            [output_tool(IndicatorAgentOutput, "Report the indicator analysis per symbol", keyed=True)],
+            tool_choice="required"
+        )
+
     async def analyze(
         self,
         symbol: str,
         timeframe: str = "1h",
-        limit: int = 240
+        limit: int = 240,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Analyze technical indicators for a symbol
@@ -86,76 +137,231 @@ Be data-driven. Cite specific indicator values. Provide clear, actionable signal
             symbol: Trading pair (e.g., BTC/USD)
             timeframe: Candle timeframe
             limit: Number of candles to analyze
+            force_refresh: Bypass cached MCP data
 
         Returns:
             Dictionary with indicator analysis and signals
         """
-        # Fetch indicator data from MCP
-        indicator_data = await mcp_client.calculate_indicators(
-            symbol=symbol,
-            timeframe=timeframe,
-            limit=limit
+        indicators, analysis_context = await self._prepare_context(
+            symbol, timeframe, limit, force_refresh
         )
 
-        # Prepare analysis context
-        indicators = indicator_data.get('indicators', {})
+        return await self._analyze_context(indicators, analysis_context, symbol, timeframe)
 
-        analysis_context = f"""
-Symbol: {symbol}
-Timeframe: {timeframe}
+    async def batch_analyze(
+        self,
+        symbols: List[str],
+        timeframe: str = "1h",
+        limit: int = 240,
+        force_refresh: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze technical indicators for several symbols, packing up to
+        _BATCH_SIZE symbols into each LLM call
 
-Current Technical Indicators:
+        Args:
+            symbols: Trading pairs
+            timeframe: Candle timeframe
+            limit: Number of candles to analyze
+            force_refresh: Bypass cached MCP data
 
-RSI: {indicators.get('rsi', 'N/A')}
-RSI Signal: {indicators.get('rsi_signal', 'N/A')}
+        Returns:
+            Dictionary mapping each symbol to its indicator analysis
+        """
+        symbols = list(dict.fromkeys(symbols))
+        prepared = await asyncio.gather(*(
+            self._prepare_context(symbol, timeframe, limit, force_refresh)
+            for symbol in symbols
+        ))
+        contexts = dict(zip(symbols, prepared))
+        # Rule-based bias for every symbol at once, used if the LLM output is unusable
+        biases = dict(zip(
+            symbols,
+            self._determine_market_biases([indicators for indicators, _ in prepared])
+        ))
+
+        # Rough chars-per-token estimate; oversized fragments would
+        # starve the rest of the batch, so analyze those one by one
+        fragment_budget = _BATCH_MAX_TOKENS // _BATCH_SIZE
+        if any(len(context) // 4 > fragment_budget for _, context in prepared):
+            results = await asyncio.gather(*(
+                self._analyze_context(
+                    indicators, context, symbol, timeframe, biases[symbol]
+                )
+                for symbol, (indicators, context) in contexts.items()
+            ))
+            return dict(zip(symbols, results))
+
+        batches = [
+            symbols[i:i + _BATCH_SIZE]
+            for i in range(0, len(symbols), _BATCH_SIZE)
+        ]
+        batch_results = await asyncio.gather(*(
+            self._analyze_batch(batch, contexts, biases, timeframe)
+            for batch in batches
+        ))
 
-MACD:
-  - MACD Line: {indicators.get('macd', {}).get('macd_line', 'N/A')}
-  - Signal Line: {indicators.get('macd', {}).get('signal_line', 'N/A')}
-  - Histogram: {indicators.get('macd', {}).get('histogram', 'N/A')}
-  - Signal: {indicators.get('macd_signal', 'N/A')}
+        results = {}
+        for batch_result in batch_results:
+            results.update(batch_result)
+        return results
 
-EMA:
-  - EMA 20: {indicators.get('ema_20', 'N/A')}
-  - EMA 50: {indicators.get('ema_50', 'N/A')}
-  - Trend: {indicators.get('trend', 'N/A')}
+    async def _analyze_batch(
+        self,
+        symbols: List[str],
+        contexts: Dict[str, Tuple[Dict[str, Any], str]],
+        biases: Dict[str, str],
+        timeframe: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run one batched LLM call for a group of symbols
 
-Volume:
-  - Volume Ratio: {indicators.get('volume_ratio', 'N/A')}x average
+        Args:
+            symbols: Trading pairs in this batch
+            contexts: Prepared (indicators, context) per symbol
+            biases: Fallback market bias per symbol
+            timeframe: Candle timeframe
 
-Task: Analyze these indicators to determine:
-1. Overall market bias (bullish, bearish, or neutral)
-2. Key trading signals and entry/exit opportunities
-3. Confidence level in the analysis
-4. Actionable recommendations for traders
-"""
+        Returns:
+            Dictionary mapping each symbol to its indicator analysis
+        """
+        batch_context = "\n".join(
+            f"## {symbol}\n{contexts[symbol][1]}" for symbol in symbols
+        )
 
-        # Call LLM for analysis
         messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=analysis_context)
+            _INDICATOR_BATCH_SYSTEM_MSG,
+            HumanMessage(content=batch_context)
         ]
 
-        response = await self.llm.ainvoke(messages)
-        analysis_text = response.content
+        analysis_text = await collect_stream(self.batch_llm, messages)
 
-        # Parse JSON response
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in analysis_text:
-                json_start = analysis_text.find("```json") + 7
-                json_end = analysis_text.find("```", json_start)
-                analysis_text = analysis_text[json_start:json_end].strip()
-            elif "```" in analysis_text:
-                json_start = analysis_text.find("```") + 3
-                json_end = analysis_text.find("```", json_start)
-                analysis_text = analysis_text[json_start:json_end].strip()
-
-            analysis_result = json.loads(analysis_text)
+            combined = extract_json(analysis_text)
         except json.JSONDecodeError:
+            combined = None
+
+        if not isinstance(combined, dict):
+            combined = {}
+
+        return {
+            symbol: self._finalize(
+                validate_output(combined.get(symbol), IndicatorAgentOutput),
+                analysis_text, contexts[symbol][0], symbol, timeframe, biases[symbol]
+            )
+            for symbol in symbols
+        }
+
+    async def _analyze_context(
+        self,
+        indicators: Dict[str, Any],
+        analysis_context: str,
+        symbol: str,
+        timeframe: str,
+        market_bias: str = "neutral"
+    ) -> Dict[str, Any]:
+        """
+        Run the single-symbol LLM call on a prepared context
+
+        Args:
+            indicators: Raw indicator data
+            analysis_context: Prepared LLM context
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            market_bias: Fallback market bias if the LLM output is unusable
+
+        Returns:
+            Dictionary with indicator analysis and signals
+        """
+        # Call LLM for analysis
+        messages = [
+            _INDICATOR_SYSTEM_MSG,
+            HumanMessage(content=analysis_context)
+        ]
+
+        analysis_text = await collect_stream(self.llm, messages)
+
+        analysis_result = parse_output(analysis_text, IndicatorAgentOutput)
+
+        return self._finalize(
+            analysis_result, analysis_text, indicators, symbol, timeframe, market_bias
+        )
+
+    async def _prepare_context(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        force_refresh: bool = False
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Fetch indicator data and build the LLM analysis context
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles to analyze
+            force_refresh: Bypass cached MCP data
+
+        Returns:
+            Tuple of (raw indicators, analysis context text)
+        """
+        # Fetch indicator data from MCP
+        indicator_data = await mcp_client.calculate_indicators(
+            symbol=symbol,
+            timeframe=timeframe,
+            limit=limit,
+            force_refresh=force_refresh
+        )
+
+        # Prepare analysis context
+        indicators = indicator_data.get('indicators', {})
+
+        macd = indicators.get('macd') or {}
+        analysis_context = _INDICATOR_CONTEXT_TEMPLATE.substitute(
+            symbol=symbol,
+            timeframe=timeframe,
+            rsi=indicators.get('rsi', 'N/A'),
+            rsi_signal=indicators.get('rsi_signal', 'N/A'),
+            macd_line=macd.get('macd_line', 'N/A'),
+            signal_line=macd.get('signal_line', 'N/A'),
+            histogram=macd.get('histogram', 'N/A'),
+            macd_signal=indicators.get('macd_signal', 'N/A'),
+            ema_20=indicators.get('ema_20', 'N/A'),
+            ema_50=indicators.get('ema_50', 'N/A'),
+            trend=indicators.get('trend', 'N/A'),
+            volume_ratio=indicators.get('volume_ratio', 'N/A')
+        )
+
+        return indicators, analysis_context
+
+    def _finalize(
+        self,
+        analysis_result: Optional[Dict[str, Any]],
+        analysis_text: str,
+        indicators: Dict[str, Any],
+        symbol: str,
+        timeframe: str,
+        market_bias: str = "neutral"
+    ) -> Dict[str, Any]:
+        """
+        Apply the parse fallback and attach metadata to an LLM result
+
+        Args:
+            analysis_result: Parsed LLM output, or None if parsing failed
+            analysis_text: Raw LLM output
+            indicators: Raw indicator data used for the analysis
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            market_bias: Market bias to report if parsing failed
+
+        Returns:
+            Dictionary with indicator analysis and signals
+        """
+        if not isinstance(analysis_result, dict):
             # Fallback to structured data if LLM didn't return proper JSON
             analysis_result = {
-                "market_bias": "neutral",
+                "market_bias": market_bias,
                 "indicators": indicators,
                 "key_signals": ["Unable to parse detailed signals"],
                 "confidence": "medium",
@@ -163,7 +369,7 @@ Task: Analyze these indicators to determine:
             }
 
         # Add metadata
-        analysis_result['timestamp'] = datetime.utcnow()
+        analysis_result['timestamp'] = datetime.now(timezone.utc)
         analysis_result['symbol'] = symbol
         analysis_result['timeframe'] = timeframe
 
@@ -179,37 +385,29 @@ Task: Analyze these indicators to determine:
         Returns:
             Market bias: bullish, bearish, or neutral
         """
-        bullish_signals = 0
-        bearish_signals = 0
+        return self._determine_market_biases([indicators])[0]
 
-        # RSI check
-        rsi = indicators.get('rsi')
-        if rsi:
-            if rsi < 40:
-                bullish_signals += 1
-            elif rsi > 60:
-                bearish_signals += 1
+    def _determine_market_biases(self, indicators_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Determine market bias for many symbols in one vectorized pass
 
-        # MACD check
-        macd_signal = indicators.get('macd_signal')
-        if macd_signal == 'bullish':
-            bullish_signals += 1
-        elif macd_signal == 'bearish':
-            bearish_signals += 1
+        Args:
+            indicators_list: Indicator data per symbol
 
-        # Trend check
-        trend = indicators.get('trend')
-        if trend == 'uptrend':
-            bullish_signals += 1
-        elif trend == 'downtrend':
-            bearish_signals += 1
-
-        if bullish_signals > bearish_signals:
-            return 'bullish'
-        elif bearish_signals > bullish_signals:
-            return 'bearish'
-        else:
-            return 'neutral'
+        Returns:
+            Market bias per symbol, in input order
+        """
+        rsi = np.array(
+            [indicators.get('rsi') or np.nan for indicators in indicators_list],
+            dtype=np.float64
+        )
+        macd_signal = np.array(
+            [indicators.get('macd_signal') or '' for indicators in indicators_list]
+        )
+        trend = np.array(
+            [indicators.get('trend') or '' for indicators in indicators_list]
+        )
+        return compute_bias(rsi, macd_signal, trend).tolist()
 
     def _generate_key_signals(self, indicators: Dict[str, Any], market_bias: str) -> list:
         """
@@ -0,0 +1,127 @@
+from langchain_core.messages import HumanMessage, SystemMessage
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from agents.liquidation_agent import LiquidationAgent, _LIQUIDATION_SYSTEM_PROMPT
+from agents.indicator_agent import IndicatorAgent, _INDICATOR_SYSTEM_PROMPT
+import asyncio
+from agents.llm import get_llm
+from agents.utils import collect_stream, extract_json, output_tool, validate_items, validate_output
+from models.schemas import (
+    IndicatorAgentOutput,
+    IndicatorLiquidationAgentOutput,
+    LiquidationAgentOutput,
+    LiquidationZone
+)
+import json
+
+
+_INDICATOR_LIQUIDATION_SYSTEM_PROMPT = f"""You perform two independent analyses for tradeSmart.AI in a single pass.
+
+## TASK A: Indicators
+{_INDICATOR_SYSTEM_PROMPT}
+
+## TASK B: Liquidation
+{_LIQUIDATION_SYSTEM_PROMPT}
+
+Call the `emit_analysis` tool ONCE with both results: `indicators` for TASK A
+and `liquidation` for TASK B."""
+
+_INDICATOR_LIQUIDATION_SYSTEM_MSG = SystemMessage(content=_INDICATOR_LIQUIDATION_SYSTEM_PROMPT)
+
+
+class IndicatorLiquidationAgent:
+    """
+    Indicator + Liquidation Agent - Runs both specialized analyses
+    in a single LLM call and splits the result back per agent
+    """
+
+    def __init__(
+        self,
+        liquidation_agent: Optional[LiquidationAgent] = None,
+        indicator_agent: Optional[IndicatorAgent] = None
+    ):
+        self.liquidation_agent = liquidation_agent or LiquidationAgent()
+        self.indicator_agent = indicator_agent or IndicatorAgent()
+
+        # Same fast model as the specialized agents, room for both analyses
+        self.llm = get_llm("llama3.1-8b", 0.3, 3000).bind_tools(
+            [output_tool(
+                IndicatorLiquidationAgentOutput,
+                "Report the indicator and liquidation analyses"
+            )],
+            tool_choice="required"
+        )
+
+    async def analyze(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        lookback_periods: int = 240,
+        force_refresh: bool = False,
+        on_liquidation_zones: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run liquidation and indicator analysis with one LLM call
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            lookback_periods: Number of candles to analyze
+            force_refresh: Bypass cached MCP data
+            on_liquidation_zones: Optional callback invoked with the
+                schema-valid liquidation zones as soon as they stream in
+
+        Returns:
+            Tuple of (liquidation analysis, indicator analysis), shaped
+            exactly like LiquidationAgent.analyze / IndicatorAgent.analyze
+        """
+        (liquidation_data, liquidation_context), (indicators, indicator_context) = await asyncio.gather(
+            self.liquidation_agent._prepare_context(
+                symbol, timeframe, lookback_periods, force_refresh
+            ),
+            self.indicator_agent._prepare_context(
+                symbol, timeframe, lookback_periods, force_refresh
+            )
+        )
+
+        analysis_context = f"""## TASK A: Indicators
+{indicator_context}
+## TASK B: Liquidation
+{liquidation_context}"""
+
+        messages = [
+            _INDICATOR_LIQUIDATION_SYSTEM_MSG,
+            HumanMessage(content=analysis_context)
+        ]
+
+        on_field = None
+        if on_liquidation_zones:
+            # Only zones that pass the schema reach the callback, so nothing
+            # is annotated that the finalized analysis would reject
+            on_field = {
+                "liquidation.liquidation_zones": lambda zones: on_liquidation_zones(
+                    validate_items(zones, LiquidationZone)
+                )
+            }
+
+        analysis_text = await collect_stream(self.llm, messages, on_field=on_field)
+
+        # Parse JSON response
+        try:
+            combined = extract_json(analysis_text)
+        except json.JSONDecodeError:
+            combined = None
+
+        if not isinstance(combined, dict):
+            combined = {}
+
+        # Each agent applies its own fallback if its section is missing
+        liquidation_analysis = self.liquidation_agent._finalize(
+            validate_output(combined.get('liquidation'), LiquidationAgentOutput),
+            analysis_text, liquidation_data, symbol, timeframe
+        )
+        indicator_analysis = self.indicator_agent._finalize(
+            validate_output(combined.get('indicators'), IndicatorAgentOutput),
+            analysis_text, indicators, symbol, timeframe
+        )
+
+        return liquidation_analysis, indicator_analysis
@@ -1,27 +1,20 @@
-from langchain_cerebras import ChatCerebras
 from langchain_core.messages import HumanMessage, SystemMessage
-from typing import Dict, Any
-from datetime import datetime
-from config.settings import settings
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from string import Template
 from mcp_server.client import mcp_client
-import json
+from agents.llm import get_llm
+from agents.utils import collect_stream, output_tool, parse_output
+from models.schemas import LiquidationAgentOutput
+import asyncio
+import logging
+import time
+import orjson
 
+logger = logging.getLogger(__name__)
 
-class LiquidationAgent:
-    """
-    Liquidation Agent - Specialized in detecting support/resistance
-    and liquidation zones
-    """
 
-    def __init__(self):
-        self.llm = ChatCerebras(
-            api_key=settings.cerebras_api_key,
-            model="llama3.1-8b",  # Fast model for specialized task
-            temperature=0.3,  # More deterministic for technical analysis
-            max_tokens=1500
-        )
-
-        self.system_prompt = """You are the Liquidation Agent for tradeSmart.AI, an expert in identifying price levels where liquidations occur.
+_LIQUIDATION_SYSTEM_PROMPT = """You are the Liquidation Agent for tradeSmart.AI, an expert in identifying price levels where liquidations occur.
 
 Your ONLY job is to identify:
 1. Major support levels (where buyers step in and liquidations might trigger on the downside)
@@ -37,30 +30,60 @@ Analysis process:
    - Proximity to current price
    - Historical reactions at those levels
 
-Return your findings in this EXACT JSON format:
-{
-    "support_levels": [
-        {"price": <number>, "strength": "<weak|medium|strong>", "reasoning": "<brief explanation>"},
-        ...
-    ],
-    "resistance_levels": [
-        {"price": <number>, "strength": "<weak|medium|strong>", "reasoning": "<brief explanation>"},
-        ...
-    ],
-    "liquidation_zones": [
-        {"start_price": <number>, "end_price": <number>, "strength": "<weak|medium|strong>", "label": "<description>"},
-        ...
-    ],
-    "analysis_summary": "<brief summary of key findings>"
-}
+Call the `emit_analysis` tool with your findings.
 
 Be precise with numbers. Focus on actionable levels. No speculation - only data-driven analysis."""
 
+_LIQUIDATION_SYSTEM_MSG = SystemMessage(content=_LIQUIDATION_SYSTEM_PROMPT)
+
+_LIQUIDATION_CONTEXT_TEMPLATE = Template("""
+Symbol: $symbol
+Timeframe: $timeframe
+Current Price: $$$current_price
+
+Detected Support Levels:
+$support_levels
+
+Detected Resistance Levels:
+$resistance_levels
+
+Recent Price Action (last 20 candles, CSV):
+$recent_candles
+
+Task: Analyze these levels and identify the most significant liquidation zones where cascading liquidations are likely to occur. Consider price clustering, historical reactions, and current market structure.
+""")
+
+# Max concurrent annotation writes to the MCP server
+_ANNOTATION_CONCURRENCY = 16
+
+# Candle columns sent to the LLM, in CSV order (time is epoch seconds), and
+# the matching keys of the columnar get_ohlc_data payload
+_CANDLE_FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+_CANDLE_COLUMNS = ('t', 'o', 'h', 'l', 'c', 'v')
+
+# Candles included in the prompt context
+_CONTEXT_CANDLES = 20
+
+
+class LiquidationAgent:
+    """
+    Liquidation Agent - Specialized in detecting support/resistance
+    and liquidation zones
+    """
+
+    def __init__(self):
+        # Fast model, low temperature for deterministic technical analysis
+        self.llm = get_llm("llama3.1-8b", 0.3, 1500).bind_tools(
+            [output_tool(LiquidationAgentOutput, "Report the liquidation analysis")],
+            tool_choice="required"
+        )
+
     async def analyze(
         self,
         symbol: str,
         timeframe: str = "1h",
-        lookback_periods: int = 240
+        lookback_periods: int = 240,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Analyze liquidation levels for a symbol
@@ -69,65 +92,119 @@ Be precise with numbers. Focus on actionable levels. No speculation - only data-
             symbol: Trading pair (e.g., BTC/USD)
             timeframe: Candle timeframe
             lookback_periods: Number of periods to analyze
+            force_refresh: Bypass cached MCP data
 
         Returns:
             Dictionary with support, resistance, and liquidation zones
         """
-        # Fetch liquidation data from MCP
-        liquidation_data = await mcp_client.detect_liquidation_levels(
-            symbol=symbol,
-            timeframe=timeframe,
-            lookback_periods=lookback_periods
+        liquidation_data, analysis_context = await self._prepare_context(
+            symbol, timeframe, lookback_periods, force_refresh
         )
 
-        # Fetch OHLC data for context
-        ohlc_data = await mcp_client.get_ohlc_data(
+        # Call LLM for analysis
+        messages = [
+            _LIQUIDATION_SYSTEM_MSG,
+            HumanMessage(content=analysis_context)
+        ]
+
+        analysis_text = await collect_stream(self.llm, messages)
+
+        analysis_result = parse_output(analysis_text, LiquidationAgentOutput)
+
+        return self._finalize(analysis_result, analysis_text, liquidation_data, symbol, timeframe)
+
+    async def _prepare_context(
+        self,
+        symbol: str,
+        timeframe: str,
+        lookback_periods: int,
+        force_refresh: bool = False
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Fetch liquidation and OHLC data and build the LLM analysis context
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            lookback_periods: Number of periods to analyze
+            force_refresh: Bypass cached MCP data
+
+        Returns:
+            Tuple of (raw liquidation data, analysis context text)
+        """
+        # Liquidation levels and the context candles are independent, so
+        # both requests share the MCP session concurrently. Only the candles
+        # the prompt shows are fetched, as columns so the payload does not
+        # repeat every field name per candle
+        liquidation_data, ohlc_data = await asyncio.gather(
+            mcp_client.detect_liquidation_levels(
+                symbol=symbol,
+                timeframe=timeframe,
+                lookback_periods=lookback_periods,
+                force_refresh=force_refresh
+            ),
+            mcp_client.get_ohlc_data(
+                symbol=symbol,
+                timeframe=timeframe,
+                limit=min(lookback_periods, _CONTEXT_CANDLES),
+                force_refresh=force_refresh,
+                format="columns"
+            )
+        )
+
+        # Prepare analysis context
+        analysis_context = _LIQUIDATION_CONTEXT_TEMPLATE.substitute(
             symbol=symbol,
             timeframe=timeframe,
-            limit=min(lookback_periods, 100)  # Limit for context
+            current_price=liquidation_data.get('current_price', 'N/A'),
+            support_levels=orjson.dumps(liquidation_data.get('support_levels', [])).decode(),
+            resistance_levels=orjson.dumps(liquidation_data.get('resistance_levels', [])).decode(),
+            recent_candles=self._format_candles(ohlc_data.get('data') or {})
         )
 
-        # Prepare analysis context
-        analysis_context = f"""
-Symbol: {symbol}
-Timeframe: {timeframe}
-Current Price: ${liquidation_data.get('current_price', 'N/A')}
+        return liquidation_data, analysis_context
 
-Detected Support Levels:
-{json.dumps(liquidation_data.get('support_levels', []), indent=2)}
+    @staticmethod
+    def _format_candles(columns: Dict[str, List[Any]]) -> str:
+        """
+        Format candles as compact CSV for the LLM prompt
 
-Detected Resistance Levels:
-{json.dumps(liquidation_data.get('resistance_levels', []), indent=2)}
+        Args:
+            columns: OHLC columns ('t', 'o', 'h', 'l', 'c', 'v')
 
-Recent Price Action (last 20 candles):
-{json.dumps(ohlc_data.get('data', [])[-20:] if ohlc_data.get('data') else [], indent=2)}
+        Returns:
+            CSV text with a header row
+        """
+        lines = [",".join(_CANDLE_FIELDS)]
+        if columns:
+            lines.extend(
+                ",".join(map(str, candle))
+                for candle in zip(*(columns[key] for key in _CANDLE_COLUMNS))
+            )
+        return "\n".join(lines)
 
-Task: Analyze these levels and identify the most significant liquidation zones where cascading liquidations are likely to occur. Consider price clustering, historical reactions, and current market structure.
-"""
+    def _finalize(
+        self,
+        analysis_result: Optional[Dict[str, Any]],
+        analysis_text: str,
+        liquidation_data: Dict[str, Any],
+        symbol: str,
+        timeframe: str
+    ) -> Dict[str, Any]:
+        """
+        Apply the parse fallback and attach metadata to an LLM result
 
-        # Call LLM for analysis
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=analysis_context)
-        ]
+        Args:
+            analysis_result: Parsed LLM output, or None if parsing failed
+            analysis_text: Raw LLM output
+            liquidation_data: Raw liquidation data used for the analysis
+            symbol: Trading pair
+            timeframe: Candle timeframe
 
-        response = await self.llm.ainvoke(messages)
-        analysis_text = response.content
-
-        # Parse JSON response
-        try:
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in analysis_text:
-                json_start = analysis_text.find("```json") + 7
-                json_end = analysis_text.find("```", json_start)
-                analysis_text = analysis_text[json_start:json_end].strip()
-            elif "```" in analysis_text:
-                json_start = analysis_text.find("```") + 3
-                json_end = analysis_text.find("```", json_start)
-                analysis_text = analysis_text[json_start:json_end].strip()
-
-            analysis_result = json.loads(analysis_text)
-        except json.JSONDecodeError:
+        Returns:
+            Dictionary with support, resistance, and liquidation zones
+        """
+        if not isinstance(analysis_result, dict):
             # Fallback to structured data if LLM didn't return proper JSON
             analysis_result = {
                 "support_levels": liquidation_data.get('support_levels', []),
@@ -137,7 +214,7 @@ Task: Analyze these levels and identify the most significant liquidation zones w
             }
 
         # Add metadata
-        analysis_result['timestamp'] = datetime.utcnow()
+        analysis_result['timestamp'] = datetime.now(timezone.utc)
         analysis_result['symbol'] = symbol
         analysis_result['timeframe'] = timeframe
         analysis_result['current_price'] = liquidation_data.get('current_price')
@@ -161,16 +238,15 @@ Task: Analyze these levels and identify the most significant liquidation zones w
         Returns:
             List of created annotation IDs
         """
-        annotation_ids = []
-
         # Get current time for annotation timerange
-        current_time = int(datetime.utcnow().timestamp())
+        current_time = int(time.time())
         time_range = 86400 * 10  # 10 days in seconds
 
-        # Create annotations for liquidation zones
-        for zone in analysis_result.get('liquidation_zones', []):
-            try:
-                result = await mcp_client.create_liquidation_zone(
+        semaphore = asyncio.Semaphore(_ANNOTATION_CONCURRENCY)
+
+        async def create_zone(zone: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await mcp_client.create_liquidation_zone(
                     symbol=symbol,
                     start_price=zone.get('start_price'),
                     end_price=zone.get('end_price'),
@@ -179,9 +255,18 @@ Task: Analyze these levels and identify the most significant liquidation zones w
                     label=zone.get('label', 'Liquidation Zone'),
                     strength=zone.get('strength', 'medium')
                 )
-                if result.get('success'):
-                    annotation_ids.append(result.get('annotation_id'))
-            except Exception as e:
-                print(f"Error creating annotation: {e}")
+
+        # Create annotations for liquidation zones concurrently
+        results = await asyncio.gather(
+            *(create_zone(zone) for zone in analysis_result.get('liquidation_zones', [])),
+            return_exceptions=True
+        )
+
+        annotation_ids = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error creating annotation: %s", result)
+            elif result.get('success'):
+                annotation_ids.append(result.get('annotation_id'))
 
         return annotation_ids
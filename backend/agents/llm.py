@@ -0,0 +1,57 @@
+"""
+Shared Cerebras LLM clients for all agents
+"""
+from functools import lru_cache
+from langchain_cerebras import ChatCerebras
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from config.settings import settings
+import httpx
+
+
+# One connection pool shared by every model so keep-alive
+# connections to the Cerebras API stay warm across agents
+_http_async_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+)
+
+
+@lru_cache(maxsize=None)
+def _get_rate_limiter(model: str) -> InMemoryRateLimiter:
+    """
+    Get the token bucket shared by every client of a model
+
+    Args:
+        model: Cerebras model name
+
+    Returns:
+        Rate limiter sized to settings.cerebras_rpm
+    """
+    return InMemoryRateLimiter(
+        requests_per_second=settings.cerebras_rpm / 60,
+        check_every_n_seconds=0.1,
+        max_bucket_size=max(1, settings.cerebras_rpm // 6)  # ~10s of burst
+    )
+
+
+@lru_cache(maxsize=None)
+def get_llm(model: str, temperature: float, max_tokens: int) -> ChatCerebras:
+    """
+    Get a shared ChatCerebras client for a model configuration
+
+    Args:
+        model: Cerebras model name
+        temperature: Sampling temperature
+        max_tokens: Max completion tokens
+
+    Returns:
+        Cached ChatCerebras instance using the shared HTTP pool and
+        the model's rate limiter
+    """
+    return ChatCerebras(
+        api_key=settings.cerebras_api_key,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        http_async_client=_http_async_client,
+        rate_limiter=_get_rate_limiter(model)
+    )
@@ -1,33 +1,24 @@
-from langchain_cerebras import ChatCerebras
 from langchain_core.messages import HumanMessage, SystemMessage
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, List, Tuple
 from config.settings import settings
+from datetime import datetime, timezone
 from agents.liquidation_agent import LiquidationAgent
 from agents.indicator_agent import IndicatorAgent
+from agents.indicator_liquidation_agent import IndicatorLiquidationAgent
 from mcp_server.client import mcp_client
+from repositories.annotation_repository import AnnotationRepository
+from services.cache_service import cache_service
+from utils.helpers import timeframe_to_seconds
 import asyncio
-import json
+import hashlib
+import time
+from agents.llm import get_llm
+from agents.utils import collect_stream, output_tool, parse_output
+from models.schemas import StrategySynthesisOutput
+import orjson
 
 
-class OrchestratorAgent:
-    """
-    Orchestrator Agent - Coordinates specialized agents and synthesizes
-    their findings into actionable trading strategies
-    """
-
-    def __init__(self):
-        self.llm = ChatCerebras(
-            api_key=settings.cerebras_api_key,
-            model="llama3.1-70b",  # Larger model for orchestration
-            temperature=0.7,  # More creative for strategy synthesis
-            max_tokens=2500
-        )
-
-        self.liquidation_agent = LiquidationAgent()
-        self.indicator_agent = IndicatorAgent()
-
-        self.system_prompt = """You are the Orchestrator Agent for tradeSmart.AI, the master coordinator of AI trading analysis.
+_ORCHESTRATOR_SYSTEM_PROMPT = """You are the Orchestrator Agent for tradeSmart.AI, the master coordinator of AI trading analysis.
 
 Your role is to:
 1. Understand user prompts about trading strategies
@@ -48,27 +39,64 @@ When building a strategy:
    - Risk management parameters (stop-loss, take-profit, position sizing)
    - Reasoning that explains WHY this strategy makes sense
 
-Return your strategy in this EXACT JSON format:
-{
-    "strategy_type": "<swing|scalp|day_trade|position>",
-    "entry_conditions": [
-        {"description": "<condition>", "parameters": {<key>: <value>}}
-    ],
-    "exit_conditions": [
-        {"description": "<condition>", "parameters": {<key>: <value>}}
-    ],
-    "risk_management": {
-        "stop_loss": <price>,
-        "take_profit": [<price1>, <price2>],
-        "position_size_pct": <percentage>,
-        "risk_reward_ratio": <ratio>
-    },
-    "reasoning": "<detailed explanation of why this strategy works>",
-    "confidence_score": <0.0-1.0>
-}
+Call the `emit_analysis` tool with your strategy.
 
 Always be precise, data-driven, and actionable. Focus on creating strategies that are practical and executable."""
 
+_ORCHESTRATOR_SYSTEM_MSG = SystemMessage(content=_ORCHESTRATOR_SYSTEM_PROMPT)
+
+_FAST_SYNTHESIS_SYSTEM_PROMPT = """You are the Orchestrator Agent for tradeSmart.AI.
+
+Given the Liquidation Agent and Indicator Agent findings as JSON, build ONE trading strategy for the user's request:
+- Entry and exit prices taken from the liquidation levels and zones
+- Timing and confirmation taken from the indicator signals
+- Concrete risk management (stop-loss, take-profit levels, position size, risk/reward)
+
+Call the `emit_analysis` tool with the strategy. No prose."""
+
+_FAST_SYNTHESIS_SYSTEM_MSG = SystemMessage(content=_FAST_SYNTHESIS_SYSTEM_PROMPT)
+
+# Model for the fast, strict synthesis path and its attempts before falling back to 70B
+_FAST_SYNTHESIS_MODEL = "llama3.1-8b"
+_FAST_SYNTHESIS_ATTEMPTS = 2
+
+# Bounds concurrent analysis runs so bursts queue here instead of
+# piling onto the LLM rate limiters
+_ANALYSIS_SEMAPHORE = asyncio.Semaphore(settings.max_concurrent_analyses)
+
+
+class OrchestratorAgent:
+    """
+    Orchestrator Agent - Coordinates specialized agents and synthesizes
+    their findings into actionable trading strategies
+    """
+
+    def __init__(self):
+        strategy_tools = [output_tool(StrategySynthesisOutput, "Report the trading strategy")]
+
+        # Larger model, more creative for strategy synthesis
+        self.llm = get_llm("llama3.1-70b", 0.7, 2500).bind_tools(
+            strategy_tools,
+            tool_choice="required"
+        )
+
+        # Fast model with a strict prompt, used when settings.orchestrator_model selects it
+        self.fast_llm = get_llm(_FAST_SYNTHESIS_MODEL, 0.2, 800).bind_tools(
+            strategy_tools,
+            tool_choice="required"
+        )
+
+        self.liquidation_agent = LiquidationAgent()
+        self.indicator_agent = IndicatorAgent()
+        # Runs both specialized analyses in one LLM call
+        self.analysis_agent = IndicatorLiquidationAgent(
+            self.liquidation_agent,
+            self.indicator_agent
+        )
+        # In-flight strategy builds keyed by their inputs, so identical
+        # concurrent requests share one run
+        self._inflight: Dict[Tuple[str, str, str, str], asyncio.Task] = {}
+
     async def build_strategy(
         self,
         user_prompt: str,
@@ -88,23 +116,171 @@ Always be precise, data-driven, and actionable. Focus on creating strategies tha
         Returns:
             Complete strategy with all analyses
         """
-        start_time = datetime.utcnow()
+        key = (user_prompt, symbol, timeframe, risk_tolerance)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._build_strategy(user_prompt, symbol, timeframe, risk_tolerance)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
 
-        # Step 1: Run specialized agents in PARALLEL for speed
-        liquidation_task = asyncio.create_task(
-            self.liquidation_agent.analyze(symbol, timeframe)
-        )
-        indicator_task = asyncio.create_task(
-            self.indicator_agent.analyze(symbol, timeframe)
+        # Shield so one caller disconnecting does not cancel the shared run
+        return await asyncio.shield(task)
+
+    async def _replace_annotations(
+        self,
+        stale_task: asyncio.Task,
+        symbol: str,
+        liquidation_analysis: Dict[str, Any],
+        timeframe: str
+    ) -> List[str]:
+        """
+        Delete annotations written for streamed zones and annotate the final ones
+
+        Args:
+            stale_task: Task creating annotations from the streamed zones
+            symbol: Trading pair
+            liquidation_analysis: Finalized liquidation analysis
+            timeframe: Candle timeframe
+
+        Returns:
+            IDs of the annotations matching the finalized zones
+        """
+        stale_ids = await stale_task
+        await asyncio.gather(*(
+            AnnotationRepository.delete_annotation(annotation_id)
+            for annotation_id in stale_ids if annotation_id is not None
+        ), return_exceptions=True)
+
+        return await self.liquidation_agent.create_annotations(
+            symbol=symbol,
+            analysis_result=liquidation_analysis,
+            timeframe=timeframe
         )
 
-        # Wait for both agents
-        liquidation_analysis, indicator_analysis = await asyncio.gather(
-            liquidation_task,
-            indicator_task
+    async def _build_strategy(
+        self,
+        user_prompt: str,
+        symbol: str,
+        timeframe: str,
+        risk_tolerance: str
+    ) -> Dict[str, Any]:
+        """
+        Run the analyses and synthesis for one strategy request
+
+        Args:
+            user_prompt: User's natural language strategy request
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            risk_tolerance: Risk tolerance level
+
+        Returns:
+            Complete strategy with all analyses
+        """
+        async with _ANALYSIS_SEMAPHORE:
+            start_ns = time.monotonic_ns()
+
+            annotations_task = None
+            streamed_zones = None
+
+            def start_annotations(zones: List[Dict[str, Any]]):
+                nonlocal annotations_task, streamed_zones
+                streamed_zones = zones
+                annotations_task = asyncio.create_task(
+                    self.liquidation_agent.create_annotations(
+                        symbol=symbol,
+                        analysis_result={"liquidation_zones": zones},
+                        timeframe=timeframe
+                    )
+                )
+
+            # Step 1: Run both specialized analyses in a single LLM call; chart
+            # annotations only need the liquidation zones, so they start writing
+            # as soon as the zones stream in and overlap the rest of the run
+            liquidation_analysis, indicator_analysis = await self.analysis_agent.analyze(
+                symbol, timeframe, on_liquidation_zones=start_annotations
+            )
+
+            # Step 2: Annotations must match the finalized analysis. If its
+            # validation dropped or changed the streamed zones, replace them;
+            # if the zones never streamed, annotate from the result
+            final_zones = liquidation_analysis.get('liquidation_zones', [])
+            if annotations_task is not None and streamed_zones != final_zones:
+                annotations_task = asyncio.create_task(
+                    self._replace_annotations(
+                        annotations_task, symbol, liquidation_analysis, timeframe
+                    )
+                )
+            elif annotations_task is None:
+                annotations_task = asyncio.create_task(
+                    self.liquidation_agent.create_annotations(
+                        symbol=symbol,
+                        analysis_result=liquidation_analysis,
+                        timeframe=timeframe
+                    )
+                )
+
+            # Step 3: Synthesize findings into strategy
+            strategy_data = await self._synthesize_strategy(
+                user_prompt, symbol, timeframe, risk_tolerance,
+                liquidation_analysis, indicator_analysis
+            )
+
+            annotation_ids = await annotations_task
+
+            # Calculate execution time
+            execution_time = (time.monotonic_ns() - start_ns) / 1e9
+
+            # Build final response
+            result = {
+                "success": True,
+                "strategy": strategy_data,
+                "liquidation_analysis": liquidation_analysis,
+                "indicator_analysis": indicator_analysis,
+                "chart_annotations": annotation_ids,
+                "execution_time_seconds": round(execution_time, 2),
+                "timestamp": datetime.now(timezone.utc)
+            }
+
+            return result
+
+    async def _synthesize_strategy(
+        self,
+        user_prompt: str,
+        symbol: str,
+        timeframe: str,
+        risk_tolerance: str,
+        liquidation_analysis: Dict[str, Any],
+        indicator_analysis: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Synthesize agent findings into a strategy, memoized in Redis
+
+        Identical inputs within one candle reuse the previous synthesis
+        and skip the LLM call. With settings.orchestrator_model set to
+        the 8B model, a strict fast path runs first and the 70B model is
+        only used if its output fails validation twice.
+
+        Args:
+            user_prompt: User's natural language strategy request
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            risk_tolerance: Risk tolerance level
+            liquidation_analysis: Liquidation Agent findings
+            indicator_analysis: Indicator Agent findings
+
+        Returns:
+            Strategy data
+        """
+        cache_key = self._synthesis_cache_key(
+            user_prompt, symbol, timeframe, risk_tolerance,
+            liquidation_analysis, indicator_analysis
         )
+        cached_strategy = await cache_service.get(cache_key)
+        if isinstance(cached_strategy, dict):
+            return cached_strategy
 
-        # Step 2: Synthesize findings into strategy
         synthesis_context = f"""
 User Request: {user_prompt}
 Symbol: {symbol}
@@ -112,10 +288,10 @@ Timeframe: {timeframe}
 Risk Tolerance: {risk_tolerance}
 
 === LIQUIDATION AGENT FINDINGS ===
-{json.dumps(liquidation_analysis, indent=2, default=str)}
+{orjson.dumps(liquidation_analysis, default=str).decode()}
 
 === INDICATOR AGENT FINDINGS ===
-{json.dumps(indicator_analysis, indent=2, default=str)}
+{orjson.dumps(indicator_analysis, default=str).decode()}
 
 Task: Create a complete trading strategy that:
 1. Aligns with the user's request
@@ -126,28 +302,29 @@ Task: Create a complete trading strategy that:
 
 Generate the strategy now."""
 
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=synthesis_context)
-        ]
-
-        response = await self.llm.ainvoke(messages)
-        strategy_text = response.content
-
-        # Parse strategy JSON
-        try:
-            # Extract JSON from response
-            if "```json" in strategy_text:
-                json_start = strategy_text.find("```json") + 7
-                json_end = strategy_text.find("```", json_start)
-                strategy_text = strategy_text[json_start:json_end].strip()
-            elif "```" in strategy_text:
-                json_start = strategy_text.find("```") + 3
-                json_end = strategy_text.find("```", json_start)
-                strategy_text = strategy_text[json_start:json_end].strip()
-
-            strategy_data = json.loads(strategy_text)
-        except json.JSONDecodeError:
+        strategy_data = None
+
+        if settings.orchestrator_model == _FAST_SYNTHESIS_MODEL:
+            messages = [
+                _FAST_SYNTHESIS_SYSTEM_MSG,
+                HumanMessage(content=synthesis_context)
+            ]
+            for _ in range(_FAST_SYNTHESIS_ATTEMPTS):
+                strategy_text = await collect_stream(self.fast_llm, messages)
+                strategy_data = parse_output(strategy_text, StrategySynthesisOutput)
+                if strategy_data is not None:
+                    break
+
+        if strategy_data is None:
+            messages = [
+                _ORCHESTRATOR_SYSTEM_MSG,
+                HumanMessage(content=synthesis_context)
+            ]
+
+            strategy_text = await collect_stream(self.llm, messages)
+            strategy_data = parse_output(strategy_text, StrategySynthesisOutput)
+
+        if strategy_data is None:
             # Fallback - use service layer to build strategy
             from services.strategy_service import StrategyService
             strategy_obj = await StrategyService.build_strategy(
@@ -158,30 +335,47 @@ Generate the strategy now."""
                 indicator_analysis=indicator_analysis
             )
             strategy_data = strategy_obj.model_dump()
+        else:
+            await cache_service.set(
+                cache_key, strategy_data, expiration=timeframe_to_seconds(timeframe)
+            )
 
-        # Step 3: Create chart annotations for liquidation zones
-        annotation_ids = await self.liquidation_agent.create_annotations(
-            symbol=symbol,
-            analysis_result=liquidation_analysis,
-            timeframe=timeframe
-        )
+        return strategy_data
+
+    @staticmethod
+    def _synthesis_cache_key(
+        user_prompt: str,
+        symbol: str,
+        timeframe: str,
+        risk_tolerance: str,
+        liquidation_analysis: Dict[str, Any],
+        indicator_analysis: Dict[str, Any]
+    ) -> str:
+        """
+        Build a stable cache key for a synthesis request
+
+        Per-run timestamps are left out so identical findings hash equally.
 
-        # Calculate execution time
-        end_time = datetime.utcnow()
-        execution_time = (end_time - start_time).total_seconds()
+        Args:
+            user_prompt: User's natural language strategy request
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            risk_tolerance: Risk tolerance level
+            liquidation_analysis: Liquidation Agent findings
+            indicator_analysis: Indicator Agent findings
 
-        # Build final response
-        result = {
-            "success": True,
-            "strategy": strategy_data,
-            "liquidation_analysis": liquidation_analysis,
-            "indicator_analysis": indicator_analysis,
-            "chart_annotations": annotation_ids,
-            "execution_time_seconds": round(execution_time, 2),
-            "timestamp": datetime.utcnow()
-        }
+        Returns:
+            Redis key for the synthesized strategy
+        """
+        digest = hashlib.blake2b(
+            f"{symbol}|{timeframe}|{risk_tolerance}|{user_prompt}|".encode(),
+            digest_size=16
+        )
+        for analysis in (liquidation_analysis, indicator_analysis):
+            findings = {k: v for k, v in analysis.items() if k != 'timestamp'}
+            digest.update(orjson.dumps(findings, default=str, option=orjson.OPT_SORT_KEYS))
 
-        return result
+        return f"strategy:synthesis:{digest.hexdigest()}"
 
     async def quick_analysis(
         self,
@@ -198,26 +392,64 @@ Generate the strategy now."""
         Returns:
             Quick analysis summary
         """
-        # Run agents in parallel
-        liquidation_task = asyncio.create_task(
-            self.liquidation_agent.analyze(symbol, timeframe)
-        )
-        indicator_task = asyncio.create_task(
-            self.indicator_agent.analyze(symbol, timeframe)
-        )
+        async with _ANALYSIS_SEMAPHORE:
+            liquidation_analysis, indicator_analysis = await self.analysis_agent.analyze(
+                symbol, timeframe
+            )
 
-        liquidation_analysis, indicator_analysis = await asyncio.gather(
-            liquidation_task,
-            indicator_task
-        )
+            return {
+                "success": True,
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "market_bias": indicator_analysis.get('market_bias'),
+                "key_support": liquidation_analysis.get('support_levels', [])[:2],
+                "key_resistance": liquidation_analysis.get('resistance_levels', [])[:2],
+                "key_signals": indicator_analysis.get('key_signals', []),
+                "timestamp": datetime.now(timezone.utc)
+            }
+
+    async def batch_quick_analysis(
+        self,
+        symbols: List[str],
+        timeframe: str = "1h"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Quick market analysis for many symbols at once
+
+        Indicator analysis is batched several symbols per LLM call, and
+        key levels come straight from the (cached) liquidation detector,
+        so N symbols cost roughly N / batch size LLM requests.
+
+        Args:
+            symbols: Trading pairs
+            timeframe: Candle timeframe
+
+        Returns:
+            Dictionary mapping each symbol to its quick analysis summary
+        """
+        async with _ANALYSIS_SEMAPHORE:
+            symbols = list(dict.fromkeys(symbols))
+            indicator_results, liquidation_results = await asyncio.gather(
+                self.indicator_agent.batch_analyze(symbols, timeframe),
+                asyncio.gather(*(
+                    mcp_client.detect_liquidation_levels(symbol=symbol, timeframe=timeframe)
+                    for symbol in symbols
+                ))
+            )
 
-        return {
-            "success": True,
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "market_bias": indicator_analysis.get('market_bias'),
-            "key_support": liquidation_analysis.get('support_levels', [])[:2],
-            "key_resistance": liquidation_analysis.get('resistance_levels', [])[:2],
-            "key_signals": indicator_analysis.get('key_signals', []),
-            "timestamp": datetime.utcnow()
-        }
+            timestamp = datetime.now(timezone.utc)
+            results = {}
+            for symbol, liquidation_data in zip(symbols, liquidation_results):
+                indicator_analysis = indicator_results[symbol]
+                results[symbol] = {
+                    "success": True,
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "market_bias": indicator_analysis.get('market_bias'),
+                    "key_support": liquidation_data.get('support_levels', [])[:2],
+                    "key_resistance": liquidation_data.get('resistance_levels', [])[:2],
+                    "key_signals": indicator_analysis.get('key_signals', []),
+                    "timestamp": timestamp
+                }
+
+            return results
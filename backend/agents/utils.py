@@ -0,0 +1,281 @@
+"""
+Shared helpers for agent LLM calls and response parsing
+"""
+from typing import Any, Callable, Dict, List, Optional, Type
+from pydantic import BaseModel, ValidationError
+from langchain_core.utils.function_calling import convert_to_openai_tool
+import json
+import re
+
+
+# Payload of a markdown code fence, with or without a language tag
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+# First character of a JSON object or array
+_JSON_START_RE = re.compile(r"[\[{]")
+_DECODER = json.JSONDecoder()
+# Sentinel for a field that has not fully streamed in yet
+_MISSING = object()
+
+# Name of the tool every agent calls to return its findings
+EMIT_TOOL_NAME = "emit_analysis"
+
+
+def output_tool(
+    model: Type[BaseModel],
+    description: str,
+    keyed: bool = False
+) -> Dict[str, Any]:
+    """
+    Build the emit_analysis tool declaring an agent's output schema
+
+    Sending the schema as a tool keeps it out of the system prompt.
+
+    Args:
+        model: Output model the tool arguments must match
+        description: Tool description shown to the LLM
+        keyed: If True, arguments are an object mapping keys (e.g.
+            symbols) to instances of the model
+
+    Returns:
+        OpenAI-format tool definition
+    """
+    parameters = convert_to_openai_tool(model)["function"]["parameters"]
+    if keyed:
+        parameters = {"type": "object", "additionalProperties": parameters}
+
+    return {
+        "type": "function",
+        "function": {
+            "name": EMIT_TOOL_NAME,
+            "description": description,
+            "parameters": parameters
+        }
+    }
+
+
+def extract_json(text: str) -> Any:
+    """
+    Decode the JSON payload of an LLM response in a single pass
+
+    Accepts bare JSON or JSON wrapped in a markdown code fence, and
+    ignores any prose before or after the JSON value.
+
+    Args:
+        text: Raw LLM response text
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        json.JSONDecodeError: If the response contains no valid JSON
+    """
+    # JSON mode responses are bare JSON: decode in place without
+    # scanning for a fence (which could also match inside a string)
+    payload = text.lstrip()
+    if payload[:1] in ("{", "["):
+        value, _ = _DECODER.raw_decode(payload)
+        return value
+
+    match = _FENCE_RE.search(text)
+    payload = match.group(1) if match else text
+
+    start = _JSON_START_RE.search(payload)
+    if not start:
+        raise json.JSONDecodeError("No JSON value found", payload, 0)
+
+    value, _ = _DECODER.raw_decode(payload, start.start())
+    return value
+
+
+def validate_output(data: Any, model: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+    """
+    Validate decoded LLM output against its Pydantic schema
+
+    Args:
+        data: Decoded JSON value
+        model: Expected output model
+
+    Returns:
+        JSON-compatible dict of the validated output, or None if invalid
+    """
+    try:
+        return model.model_validate(data).model_dump(mode="json")
+    except ValidationError:
+        return None
+
+
+def validate_items(items: Any, model: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """
+    Validate each element of a decoded list on its own
+
+    Args:
+        items: Decoded JSON value expected to be a list
+        model: Expected model of one element
+
+    Returns:
+        JSON-compatible dicts of the valid elements; invalid ones are dropped
+    """
+    if not isinstance(items, list):
+        return []
+    validated = (validate_output(item, model) for item in items)
+    return [item for item in validated if item is not None]
+
+
+def parse_output(text: str, model: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+    """
+    Decode and validate an LLM response in one step
+
+    Args:
+        text: Raw LLM response text
+        model: Expected output model
+
+    Returns:
+        JSON-compatible dict of the validated output, or None if the
+        response is not valid JSON or does not match the schema
+    """
+    try:
+        data = extract_json(text)
+    except json.JSONDecodeError:
+        return None
+    return validate_output(data, model)
+
+
+def _field_value_start(text: str, path: List[str]) -> int:
+    """
+    Find where a nested field's value starts in a (possibly partial) JSON response
+
+    Walks the text tracking strings and nesting, so the key only matches at
+    exactly this object path: never inside a string value or another object.
+
+    Args:
+        text: Response text received so far
+        path: Keys from the top-level object down to the field
+
+    Returns:
+        Index of the value's first character, or -1 if not streamed yet
+    """
+    i = text.find("{")
+    if i < 0:
+        return -1
+
+    n = len(text)
+    # Key that opened each enclosing container (None for the root / array items)
+    keys: List[Optional[str]] = []
+    kinds: List[str] = []
+    pending_key: Optional[str] = None
+
+    while i < n:
+        ch = text[i]
+        if ch == '"':
+            end = i + 1
+            while end < n and text[end] != '"':
+                end += 2 if text[end] == "\\" else 1
+            if end >= n:
+                return -1
+
+            colon = end + 1
+            while colon < n and text[colon].isspace():
+                colon += 1
+            if colon < n and text[colon] == ":" and kinds and kinds[-1] == "{":
+                key = text[i + 1:end]
+                value_start = colon + 1
+                if (
+                    key == path[-1]
+                    and keys[1:] == path[:-1]
+                    and all(kind == "{" for kind in kinds)
+                ):
+                    while value_start < n and text[value_start].isspace():
+                        value_start += 1
+                    return value_start if value_start < n else -1
+                pending_key = key
+                i = value_start
+                continue
+            i = end + 1
+            continue
+
+        if ch in "{[":
+            keys.append(pending_key)
+            kinds.append(ch)
+            pending_key = None
+        elif ch in "}]":
+            if len(keys) <= 1:
+                # Top-level value closed without the field
+                return -1
+            keys.pop()
+            kinds.pop()
+            pending_key = None
+        elif ch == ",":
+            pending_key = None
+        i += 1
+
+    return -1
+
+
+def _decode_field(text: str, field: str) -> Any:
+    """
+    Decode the value of a JSON field from a (possibly partial) response
+
+    Args:
+        text: Response text received so far
+        field: Dot-separated path of the field from the top-level object
+            (e.g. "liquidation.liquidation_zones")
+
+    Returns:
+        Decoded value, or _MISSING if the value is not complete yet
+    """
+    start = _field_value_start(text, field.split("."))
+    if start < 0:
+        return _MISSING
+    try:
+        value, _ = _DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return _MISSING
+    return value
+
+
+async def collect_stream(
+    llm,
+    messages: List[Any],
+    on_field: Optional[Dict[str, Callable[[Any], None]]] = None
+) -> str:
+    """
+    Stream an LLM completion and return the full response text
+
+    Works for both plain content and emit_analysis tool-call arguments.
+    Chunks are accumulated in a list and joined once. When on_field is
+    given, each callback fires as soon as its field's value has fully
+    streamed in, letting callers act before generation completes.
+
+    Args:
+        llm: LangChain chat model
+        messages: Prompt messages
+        on_field: Optional mapping of dot-separated field path (from the
+            top-level object) to callback receiving the decoded value
+
+    Returns:
+        Concatenated response text (or tool-call arguments JSON)
+    """
+    chunks: List[str] = []
+    pending = dict(on_field or {})
+
+    def fire_completed(text: str):
+        for key in list(pending):
+            value = _decode_field(text, key)
+            if value is not _MISSING:
+                pending.pop(key)(value)
+
+    async for chunk in llm.astream(messages):
+        # Tool-call arguments stream as JSON fragments instead of content
+        piece = chunk.content or "".join(
+            tool_chunk.get('args') or '' for tool_chunk in chunk.tool_call_chunks
+        )
+        chunks.append(piece)
+
+        # Only try to decode when the stream could have just closed a value
+        if pending and piece.rstrip()[-1:] in ("}", "]"):
+            fire_completed("".join(chunks))
+
+    text = "".join(chunks)
+    if pending:
+        fire_completed(text)
+    return text
@@ -0,0 +1,35 @@
+"""
+Non-blocking logging setup
+"""
+from logging.handlers import QueueHandler, QueueListener
+import logging
+import queue
+
+
+def setup_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Route root-logger records through a queue drained by a background thread
+
+    Handlers attached to the root logger only enqueue records, so logging
+    from a coroutine never blocks the event loop on stream I/O.
+
+    Args:
+        level: Root logger level
+
+    Returns:
+        Started QueueListener; call stop() on shutdown to flush it
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
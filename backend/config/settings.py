@@ -1,8 +1,11 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, frozen=True)
+
     # Cerebras API
     cerebras_api_key: str
 
@@ -25,9 +28,18 @@ class Settings(BaseSettings):
     frontend_url: str = "http://localhost:3000"
     backend_port: int = 8000
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    # LLM Limits
+    cerebras_rpm: int = 30  # Requests per minute, per model
+    max_concurrent_analyses: int = 32
+    # Synthesis model: "llama3.1-70b", or "llama3.1-8b" for the fast path
+    # (falls back to 70B when its output fails validation twice)
+    orchestrator_model: str = "llama3.1-70b"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process"""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -1,32 +1,35 @@
 """
 Chat Controller - Handles user queries about stocks via AI agents
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from agents.orchestrator import OrchestratorAgent
-from agents.liquidation_agent import LiquidationAgent
-from agents.indicator_agent import IndicatorAgent
 from services.market_data_service import MarketDataService
-from repositories.ohlc_repository import OHLCRepository
-from decimal import Decimal
+from services.cache_service import cache_service
+from controllers.dependencies import get_orchestrator
+from controllers.routing import ORJSONRoute
+from utils.http_cache import make_etag, is_not_modified, cache_headers
+from functools import lru_cache
+import asyncio
+import hashlib
+import logging
+import numpy as np
+import orjson
 import re
 
 
-def to_float(value):
-    """Convert Decimal to float safely"""
-    if isinstance(value, Decimal):
-        return float(value)
-    return value
-
-
-router = APIRouter(prefix="/api/chat", tags=["Chat"])
+router = APIRouter(prefix="/api/chat", tags=["Chat"], route_class=ORJSONRoute)
+logger = logging.getLogger(__name__)
 
 
 class ChatRequest(BaseModel):
     message: str
     symbol: Optional[str] = None
     timeframe: Optional[str] = "1h"
+    # Machine intent from UI actions; skips keyword detection when set
+    intent: Optional[str] = None
 
 
 class ChatResponse(BaseModel):
@@ -36,66 +39,176 @@ class ChatResponse(BaseModel):
     chart_update: Optional[bool] = False
 
 
-# Initialize agents
-liquidation_agent = LiquidationAgent()
-indicator_agent = IndicatorAgent()
-orchestrator = OrchestratorAgent()
+def _chat_response(
+    response: str,
+    symbol: Optional[str] = None,
+    data: Optional[Dict[str, Any]] = None,
+    chart_update: bool = False
+) -> ORJSONResponse:
+    """
+    Serialize a chat reply straight to JSON
+
+    Builds the ChatResponse shape as a plain dict so FastAPI skips
+    response-model validation and jsonable_encoder on the hot path.
 
+    Args:
+        response: Markdown reply text
+        symbol: Resolved trading pair
+        data: Structured payload for the frontend
+        chart_update: Whether the chart should refresh
 
-def extract_symbol_from_message(message: str) -> Optional[str]:
+    Returns:
+        ORJSONResponse with the ChatResponse fields
+    """
+    return ORJSONResponse({
+        'response': response,
+        'symbol': symbol,
+        'data': data,
+        'chart_update': chart_update
+    })
+
+
+# Message token -> symbol, covering full pairs and short/common names
+_SYMBOL_MAP = {
+    "BTCUSDT": "BTCUSDT", "ETHUSDT": "ETHUSDT", "BNBUSDT": "BNBUSDT",
+    "SOLUSDT": "SOLUSDT", "XRPUSDT": "XRPUSDT", "ADAUSDT": "ADAUSDT",
+    "DOGEUSDT": "DOGEUSDT", "DOTUSDT": "DOTUSDT", "AVAXUSDT": "AVAXUSDT",
+    "BTC": "BTCUSDT", "BITCOIN": "BTCUSDT",
+    "ETH": "ETHUSDT", "ETHEREUM": "ETHUSDT",
+    "BNB": "BNBUSDT", "BINANCE": "BNBUSDT",
+    "SOL": "SOLUSDT", "SOLANA": "SOLUSDT",
+    "XRP": "XRPUSDT", "RIPPLE": "XRPUSDT",
+    "ADA": "ADAUSDT", "CARDANO": "ADAUSDT",
+    "DOGE": "DOGEUSDT", "DOGECOIN": "DOGEUSDT",
+    "DOT": "DOTUSDT", "POLKADOT": "DOTUSDT",
+    "AVAX": "AVAXUSDT", "AVALANCHE": "AVAXUSDT"
+}
+
+# One alternation, longest tokens first so full pairs win over short forms
+_SYMBOL_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, sorted(_SYMBOL_MAP, key=len, reverse=True))) + r")\b"
+)
+
+# Intent keywords, in priority order
+_INTENT_KEYWORDS = [
+    ('liquidity_levels', ['support', 'resistance', 'liquidity', 'level']),
+    ('technical_indicators', ['indicator', 'rsi', 'macd', 'ema']),
+    ('trading_strategy', ['strategy', 'trade', 'buy', 'sell', 'entry', 'exit']),
+    ('current_price', ['price', 'current', 'value']),
+]
+_KW2INTENT = {kw: intent for intent, kws in _INTENT_KEYWORDS for kw in kws}
+_INTENT_PRIORITY = {intent: rank for rank, (intent, _) in enumerate(_INTENT_KEYWORDS)}
+_INTENT_RE = re.compile("|".join(_KW2INTENT))
+_KNOWN_INTENTS = frozenset(_INTENT_PRIORITY) | {'general'}
+
+# Rendered replies are reused briefly; daily candles change far less often
+_CHAT_CACHE_TTL = 60
+_CHAT_CACHE_TTL_DAILY = 86400
+
+
+class _Msg:
+    """User message with its case-folded forms computed once"""
+    __slots__ = ("raw", "lower", "upper")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.lower = raw.lower()
+        self.upper = raw.upper()
+
+    def __hash__(self) -> int:
+        return hash(self.raw)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _Msg) and other.raw == self.raw
+
+
+@lru_cache(maxsize=4096)
+def _prepare_message(raw: str) -> _Msg:
+    """Build (or reuse, for repeat prompts) the preprocessed message"""
+    return _Msg(raw)
+
+
+@lru_cache(maxsize=4096)
+def extract_symbol_from_message(msg: _Msg) -> Optional[str]:
     """Extract crypto symbol from user message"""
-    message_upper = message.upper()
-
-    # List of crypto pairs we have
-    crypto_pairs = [
-        "BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT",
-        "ADAUSDT", "DOGEUSDT", "DOTUSDT", "AVAXUSDT"
-    ]
-
-    # Mapping short forms to full symbols
-    crypto_map = {
-        "BTC": "BTCUSDT", "BITCOIN": "BTCUSDT",
-        "ETH": "ETHUSDT", "ETHEREUM": "ETHUSDT",
-        "BNB": "BNBUSDT", "BINANCE": "BNBUSDT",
-        "SOL": "SOLUSDT", "SOLANA": "SOLUSDT",
-        "XRP": "XRPUSDT", "RIPPLE": "XRPUSDT",
-        "ADA": "ADAUSDT", "CARDANO": "ADAUSDT",
-        "DOGE": "DOGEUSDT", "DOGECOIN": "DOGEUSDT",
-        "DOT": "DOTUSDT", "POLKADOT": "DOTUSDT",
-        "AVAX": "AVAXUSDT", "AVALANCHE": "AVAXUSDT"
-    }
-
-    # Check for full symbol
-    for crypto in crypto_pairs:
-        if crypto in message_upper:
-            return crypto
-
-    # Check for short form
-    for short_form, full_symbol in crypto_map.items():
-        if short_form in message_upper:
-            return full_symbol
-
-    return None
-
-
-def detect_query_intent(message: str) -> str:
+    match = _SYMBOL_RE.search(msg.upper)
+    return _SYMBOL_MAP[match.group(1)] if match else None
+
+
+@lru_cache(maxsize=4096)
+def detect_query_intent(msg: _Msg) -> str:
     """Detect what the user is asking about"""
-    message_lower = message.lower()
+    best_intent = 'general'
+    best_rank = len(_INTENT_KEYWORDS)
+
+    # One scan over the message; the highest-priority keyword wins
+    for match in _INTENT_RE.finditer(msg.lower):
+        intent = _KW2INTENT[match.group(0)]
+        rank = _INTENT_PRIORITY[intent]
+        if rank < best_rank:
+            best_intent, best_rank = intent, rank
+            if rank == 0:
+                break
+
+    return best_intent
+
+
+_LEVEL_LINE = "{}. ${:,.2f} ({}) - {:+.2f}% from current\n"
+
+
+def _format_levels(
+    levels: List[Dict[str, Any]],
+    prices: np.ndarray,
+    distances: np.ndarray,
+    count: int = 3
+) -> str:
+    """
+    Render the top price levels as numbered lines in one pass
+
+    Args:
+        levels: Level dicts (for strength)
+        prices: Level prices as float64
+        distances: Percent distance from current price
+        count: Number of levels to show
 
-    if any(word in message_lower for word in ['support', 'resistance', 'liquidity', 'level']):
-        return 'liquidity_levels'
-    elif any(word in message_lower for word in ['indicator', 'rsi', 'macd', 'ema']):
-        return 'technical_indicators'
-    elif any(word in message_lower for word in ['strategy', 'trade', 'buy', 'sell', 'entry', 'exit']):
-        return 'trading_strategy'
-    elif any(word in message_lower for word in ['price', 'current', 'value']):
-        return 'current_price'
-    else:
-        return 'general'
+    Returns:
+        Newline-terminated lines joined into one string
+    """
+    return "".join(
+        _LEVEL_LINE.format(i, price, level['strength'], distance)
+        for i, (level, price, distance) in enumerate(zip(
+            levels[:count], prices[:count].tolist(), distances[:count].tolist()
+        ), 1)
+    )
+
+
+def _chat_cache_key(
+    message: str,
+    symbol: str,
+    timeframe: str,
+    intent: Optional[str] = None
+) -> str:
+    """
+    Build the Redis key for a rendered chat reply
+
+    Args:
+        message: User message
+        symbol: Resolved trading pair
+        timeframe: Candle timeframe
+        intent: Intent supplied by the client, if any
+
+    Returns:
+        Cache key string
+    """
+    digest = hashlib.sha1(message.encode()).hexdigest()
+    return f"chat:{digest}:{symbol}:{timeframe}:{intent or 'auto'}"
 
 
 @router.post("/ask", response_model=ChatResponse)
-async def ask_question(request: ChatRequest):
+async def ask_question(
+    request: ChatRequest,
+    orchestrator: OrchestratorAgent = Depends(get_orchestrator)
+):
     """
     Handle user questions about cryptocurrencies
 
@@ -104,115 +217,172 @@ async def ask_question(request: ChatRequest):
     - "Show me support and resistance for ETH"
     - "Give me a trading strategy for BTC"
     """
+    msg = _prepare_message(request.message)
+
+    # Extract symbol from message or use provided symbol
+    symbol = request.symbol or extract_symbol_from_message(msg)
+    if not symbol:
+        return await _answer_question(request, msg, symbol, orchestrator)
+
+    # Repeated questions are served from the serialized reply
+    cache_key = _chat_cache_key(request.message, symbol, request.timeframe, request.intent)
+    cached = await cache_service.get_raw(cache_key)
+    if cached:
+        return Response(cached, media_type="application/json")
+
+    response = await _answer_question(request, msg, symbol, orchestrator)
+
+    ttl = _CHAT_CACHE_TTL_DAILY if request.timeframe == "1d" else _CHAT_CACHE_TTL
+    await cache_service.set(cache_key, response.body.decode(), expiration=ttl)
+
+    return response
+
+
+async def _answer_question(
+    request: ChatRequest,
+    msg: _Msg,
+    symbol: Optional[str],
+    orchestrator: OrchestratorAgent
+) -> ORJSONResponse:
+    """
+    Build the chat reply for a question
+
+    Args:
+        request: Chat request
+        msg: Preprocessed request message
+        symbol: Resolved trading pair, or None if none was found
+        orchestrator: Shared orchestrator for strategy questions
+
+    Returns:
+        Serialized ChatResponse
+    """
     try:
         message = request.message
 
-        # Extract symbol from message or use provided symbol
-        symbol = request.symbol or extract_symbol_from_message(message)
-
         if not symbol:
-            return ChatResponse(
+            return _chat_response(
                 response="Please specify a cryptocurrency. Available: Bitcoin (BTC), Ethereum (ETH), Binance Coin (BNB), Solana (SOL), Ripple (XRP), Cardano (ADA), Dogecoin (DOGE), Polkadot (DOT), Avalanche (AVAX)",
                 symbol=None,
                 chart_update=False
             )
 
-        # Detect query intent
-        intent = detect_query_intent(message)
+        # UI actions send their intent; only free-form chat needs detection
+        if request.intent in _KNOWN_INTENTS:
+            intent = request.intent
+        else:
+            intent = detect_query_intent(msg)
+
+        # Intent-specific market data is independent of the candle fetch,
+        # so load both concurrently
+        intent_coro = None
+        if intent == 'liquidity_levels':
+            intent_coro = MarketDataService.detect_liquidation_levels(
+                symbol=symbol,
+                timeframe=request.timeframe,
+                lookback_periods=100
+            )
+        elif intent == 'technical_indicators':
+            intent_coro = MarketDataService.calculate_indicators(
+                symbol=symbol,
+                timeframe=request.timeframe,
+                limit=50
+            )
+
+        # Get current price; the last few candles also serve the price-change view
+        ohlc_coro = MarketDataService.get_ohlc_data(symbol, request.timeframe, limit=5)
+        if intent_coro:
+            ohlc_data, intent_data = await asyncio.gather(ohlc_coro, intent_coro)
+        else:
+            ohlc_data, intent_data = await ohlc_coro, None
 
-        # Get current price
-        ohlc_data = await OHLCRepository.get_ohlc_data(symbol, request.timeframe, limit=1)
         if not ohlc_data:
             raise HTTPException(status_code=404, detail=f"No data found for {symbol}")
 
-        current_price = float(ohlc_data[0]['close'])
+        # Candles are in chronological order, so the latest is last
+        current_price = float(ohlc_data[-1]['close'])
 
         # Handle different query types
         if intent == 'liquidity_levels':
-            # Get liquidity levels (support/resistance)
-            levels = await MarketDataService.detect_liquidation_levels(
-                symbol=symbol,
-                timeframe=request.timeframe,
-                lookback_periods=100
-            )
+            # Liquidity levels (support/resistance)
+            levels = intent_data
+
+            support_levels = levels.get('support_levels', [])[:5]
+            resistance_levels = levels.get('resistance_levels', [])[:5]
 
-            support_levels = levels.get('support_levels', [])
-            resistance_levels = levels.get('resistance_levels', [])
+            # Convert each side's prices once and compute distances as a vector op
+            support_prices = np.fromiter(
+                (float(l['price']) for l in support_levels),
+                dtype=np.float64, count=len(support_levels)
+            )
+            resistance_prices = np.fromiter(
+                (float(l['price']) for l in resistance_levels),
+                dtype=np.float64, count=len(resistance_levels)
+            )
+            support_distances = (current_price - support_prices) / current_price * 100.0
+            resistance_distances = (resistance_prices - current_price) / current_price * 100.0
 
             # Format response
-            response_text = f"**{symbol} Liquidity Levels Analysis**\n\n"
-            response_text += f"Current Price: ${current_price:,.2f}\n\n"
+            parts = [f"**{symbol} Liquidity Levels Analysis**\n\n"]
+            parts.append(f"Current Price: ${current_price:,.2f}\n\n")
 
             if support_levels:
-                response_text += "🟢 **Support Levels** (Buy zones):\n"
-                for i, level in enumerate(support_levels[:3], 1):
-                    level_price = to_float(level['price'])
-                    distance = ((current_price - level_price) / current_price) * 100
-                    response_text += f"{i}. ${level_price:,.2f} ({level['strength']}) - {distance:+.2f}% from current\n"
-                response_text += "\n"
+                parts.append("🟢 **Support Levels** (Buy zones):\n")
+                parts.append(_format_levels(support_levels, support_prices, support_distances))
+                parts.append("\n")
 
             if resistance_levels:
-                response_text += "🔴 **Resistance Levels** (Sell zones):\n"
-                for i, level in enumerate(resistance_levels[:3], 1):
-                    level_price = to_float(level['price'])
-                    distance = ((level_price - current_price) / current_price) * 100
-                    response_text += f"{i}. ${level_price:,.2f} ({level['strength']}) - {distance:+.2f}% from current\n"
-
-            # Convert all Decimals to floats for JSON serialization
-            def convert_level(level):
-                return {
-                    'price': to_float(level.get('price')),
-                    'strength': level.get('strength'),
-                    'test_count': level.get('test_count', 0)
-                }
-
-            return ChatResponse(
-                response=response_text,
+                parts.append("🔴 **Resistance Levels** (Sell zones):\n")
+                parts.append(_format_levels(resistance_levels, resistance_prices, resistance_distances))
+
+            return _chat_response(
+                response="".join(parts),
                 symbol=symbol,
                 data={
                     'current_price': current_price,
-                    'support_levels': [convert_level(l) for l in support_levels[:5]],
-                    'resistance_levels': [convert_level(l) for l in resistance_levels[:5]]
+                    'support_levels': [
+                        {'price': price, 'strength': l.get('strength'), 'test_count': l.get('test_count', 0)}
+                        for l, price in zip(support_levels, support_prices.tolist())
+                    ],
+                    'resistance_levels': [
+                        {'price': price, 'strength': l.get('strength'), 'test_count': l.get('test_count', 0)}
+                        for l, price in zip(resistance_levels, resistance_prices.tolist())
+                    ]
                 },
                 chart_update=True
             )
 
         elif intent == 'technical_indicators':
-            # Get technical indicators
-            indicators = await MarketDataService.calculate_indicators(
-                symbol=symbol,
-                timeframe=request.timeframe,
-                limit=50
-            )
+            # Technical indicators
+            indicators = intent_data
 
-            response_text = f"**{symbol} Technical Indicators**\n\n"
-            response_text += f"Current Price: ${current_price:,.2f}\n\n"
+            parts = [f"**{symbol} Technical Indicators**\n\n"]
+            parts.append(f"Current Price: ${current_price:,.2f}\n\n")
 
             if indicators.get('rsi'):
                 rsi = indicators['rsi']
                 rsi_signal = indicators.get('rsi_signal', 'neutral')
-                response_text += f"📈 **RSI**: {rsi:.2f} - {rsi_signal.upper()}\n"
+                parts.append(f"📈 **RSI**: {rsi:.2f} - {rsi_signal.upper()}\n")
                 if rsi > 70:
-                    response_text += "   ⚠️ Overbought - Potential reversal down\n"
+                    parts.append("   ⚠️ Overbought - Potential reversal down\n")
                 elif rsi < 30:
-                    response_text += "   ✅ Oversold - Potential reversal up\n"
-                response_text += "\n"
+                    parts.append("   ✅ Oversold - Potential reversal up\n")
+                parts.append("\n")
 
             if indicators.get('macd'):
                 macd = indicators['macd']
-                response_text += f"📉 **MACD**:\n"
-                response_text += f"   MACD Line: {macd.get('macd_line', 0):.2f}\n"
-                response_text += f"   Signal Line: {macd.get('signal_line', 0):.2f}\n"
-                response_text += f"   Signal: {indicators.get('macd_signal', 'neutral').upper()}\n\n"
+                parts.append(f"📉 **MACD**:\n")
+                parts.append(f"   MACD Line: {macd.get('macd_line', 0):.2f}\n")
+                parts.append(f"   Signal Line: {macd.get('signal_line', 0):.2f}\n")
+                parts.append(f"   Signal: {indicators.get('macd_signal', 'neutral').upper()}\n\n")
 
             if indicators.get('ema'):
                 ema = indicators['ema']
-                response_text += f"📊 **EMA**:\n"
-                response_text += f"   EMA 20: ${ema.get('ema_20', 0):,.2f}\n"
-                response_text += f"   EMA 50: ${ema.get('ema_50', 0):,.2f}\n"
+                parts.append(f"📊 **EMA**:\n")
+                parts.append(f"   EMA 20: ${ema.get('ema_20', 0):,.2f}\n")
+                parts.append(f"   EMA 50: ${ema.get('ema_50', 0):,.2f}\n")
 
-            return ChatResponse(
-                response=response_text,
+            return _chat_response(
+                response="".join(parts),
                 symbol=symbol,
                 data=indicators,
                 chart_update=True
@@ -220,58 +390,57 @@ async def ask_question(request: ChatRequest):
 
         elif intent == 'trading_strategy':
             # Use AI Orchestrator to build strategy
-            print(f"[AI] Building strategy for {symbol}...")
+            logger.info("Building strategy for %s", symbol)
             strategy = await orchestrator.build_strategy(
                 symbol=symbol,
                 timeframe=request.timeframe,
                 user_prompt=message
             )
 
-            response_text = f"**{symbol} Trading Strategy**\n\n"
-            response_text += f"Current Price: ${current_price:,.2f}\n"
-            response_text += f"📈 Strategy Type: {strategy.get('strategy_type', 'N/A')}\n"
-            response_text += f"🎯 Market Bias: {strategy.get('market_bias', 'N/A')}\n"
-            response_text += f"💪 Confidence: {strategy.get('confidence', 0):.1f}%\n\n"
+            parts = [f"**{symbol} Trading Strategy**\n\n"]
+            parts.append(f"Current Price: ${current_price:,.2f}\n")
+            parts.append(f"📈 Strategy Type: {strategy.get('strategy_type', 'N/A')}\n")
+            parts.append(f"🎯 Market Bias: {strategy.get('market_bias', 'N/A')}\n")
+            parts.append(f"💪 Confidence: {strategy.get('confidence', 0):.1f}%\n\n")
 
             entry_conditions = strategy.get('entry_conditions', [])
             if entry_conditions:
-                response_text += "✅ **Entry Conditions:**\n"
+                parts.append("✅ **Entry Conditions:**\n")
                 for condition in entry_conditions[:3]:
-                    response_text += f"• {condition}\n"
-                response_text += "\n"
+                    parts.append(f"• {condition}\n")
+                parts.append("\n")
 
             risk = strategy.get('risk_management', {})
             if risk:
-                response_text += "🛡️ **Risk Management:**\n"
-                response_text += f"• Stop Loss: ${risk.get('stop_loss', 0):,.2f}\n"
-                response_text += f"• Take Profit: ${risk.get('take_profit', 0):,.2f}\n"
-                response_text += f"• Risk/Reward: {risk.get('risk_reward_ratio', 0):.2f}\n"
+                parts.append("🛡️ **Risk Management:**\n")
+                parts.append(f"• Stop Loss: ${risk.get('stop_loss', 0):,.2f}\n")
+                parts.append(f"• Take Profit: ${risk.get('take_profit', 0):,.2f}\n")
+                parts.append(f"• Risk/Reward: {risk.get('risk_reward_ratio', 0):.2f}\n")
 
-            return ChatResponse(
-                response=response_text,
+            return _chat_response(
+                response="".join(parts),
                 symbol=symbol,
                 data=strategy,
                 chart_update=True
             )
 
         elif intent == 'current_price':
-            response_text = f"**{symbol} Current Price**\n\n"
-            response_text += f"💰 ${current_price:,.2f}\n\n"
+            parts = [f"**{symbol} Current Price**\n\n"]
+            parts.append(f"💰 ${current_price:,.2f}\n\n")
 
             # Add recent price action
-            recent_data = await OHLCRepository.get_ohlc_data(symbol, request.timeframe, limit=5)
-            if len(recent_data) > 1:
-                prev_close = float(recent_data[1]['close'])
+            if len(ohlc_data) > 1:
+                prev_close = float(ohlc_data[-2]['close'])
                 change = current_price - prev_close
                 change_pct = (change / prev_close) * 100
 
                 if change > 0:
-                    response_text += f"📈 +${change:.2f} (+{change_pct:.2f}%)\n"
+                    parts.append(f"📈 +${change:.2f} (+{change_pct:.2f}%)\n")
                 else:
-                    response_text += f"📉 ${change:.2f} ({change_pct:.2f}%)\n"
+                    parts.append(f"📉 ${change:.2f} ({change_pct:.2f}%)\n")
 
-            return ChatResponse(
-                response=response_text,
+            return _chat_response(
+                response="".join(parts),
                 symbol=symbol,
                 data={'current_price': current_price},
                 chart_update=True
@@ -279,38 +448,44 @@ async def ask_question(request: ChatRequest):
 
         else:
             # General query - use AI
-            response_text = f"I can help you analyze **{symbol}**. You can ask me about:\n\n"
-            response_text += "• Liquidity levels (support & resistance)\n"
-            response_text += "• Technical indicators (RSI, MACD, EMA)\n"
-            response_text += "• Trading strategies\n"
-            response_text += "• Current price\n\n"
-            response_text += "What would you like to know?"
-
-            return ChatResponse(
-                response=response_text,
+            parts = [f"I can help you analyze **{symbol}**. You can ask me about:\n\n"]
+            parts.append("• Liquidity levels (support & resistance)\n")
+            parts.append("• Technical indicators (RSI, MACD, EMA)\n")
+            parts.append("• Trading strategies\n")
+            parts.append("• Current price\n\n")
+            parts.append("What would you like to know?")
+
+            return _chat_response(
+                response="".join(parts),
                 symbol=symbol,
                 chart_update=True
             )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Chat request failed for %s", symbol)
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
 
+# The symbol list never changes, so encode it once at import time
+_SYMBOLS_JSON = orjson.dumps({"symbols": [
+    {"symbol": "BTCUSDT", "name": "Bitcoin", "exchange": "BINANCE"},
+    {"symbol": "ETHUSDT", "name": "Ethereum", "exchange": "BINANCE"},
+    {"symbol": "BNBUSDT", "name": "Binance Coin", "exchange": "BINANCE"},
+    {"symbol": "SOLUSDT", "name": "Solana", "exchange": "BINANCE"},
+    {"symbol": "XRPUSDT", "name": "Ripple", "exchange": "BINANCE"},
+    {"symbol": "ADAUSDT", "name": "Cardano", "exchange": "BINANCE"},
+    {"symbol": "DOGEUSDT", "name": "Dogecoin", "exchange": "BINANCE"},
+    {"symbol": "DOTUSDT", "name": "Polkadot", "exchange": "BINANCE"},
+    {"symbol": "AVAXUSDT", "name": "Avalanche", "exchange": "BINANCE"},
+]})
+_SYMBOLS_HEADERS = cache_headers(make_etag(_SYMBOLS_JSON), max_age=86400)
+
+
 @router.get("/symbols")
-async def get_available_symbols():
+async def get_available_symbols(request: Request):
     """Get list of available cryptocurrency symbols"""
-    symbols = [
-        {"symbol": "BTCUSDT", "name": "Bitcoin", "exchange": "BINANCE"},
-        {"symbol": "ETHUSDT", "name": "Ethereum", "exchange": "BINANCE"},
-        {"symbol": "BNBUSDT", "name": "Binance Coin", "exchange": "BINANCE"},
-        {"symbol": "SOLUSDT", "name": "Solana", "exchange": "BINANCE"},
-        {"symbol": "XRPUSDT", "name": "Ripple", "exchange": "BINANCE"},
-        {"symbol": "ADAUSDT", "name": "Cardano", "exchange": "BINANCE"},
-        {"symbol": "DOGEUSDT", "name": "Dogecoin", "exchange": "BINANCE"},
-        {"symbol": "DOTUSDT", "name": "Polkadot", "exchange": "BINANCE"},
-        {"symbol": "AVAXUSDT", "name": "Avalanche", "exchange": "BINANCE"},
-    ]
-
-    return {"symbols": symbols}
+    if is_not_modified(request, _SYMBOLS_HEADERS["ETag"]):
+        return Response(status_code=304, headers=_SYMBOLS_HEADERS)
+    return Response(_SYMBOLS_JSON, media_type="application/json", headers=_SYMBOLS_HEADERS)
@@ -0,0 +1,44 @@
+"""
+Shared FastAPI dependencies for controllers
+"""
+from fastapi import Request
+import httpx
+from agents.orchestrator import OrchestratorAgent
+from utils.http_client import create_http_client
+
+
+def get_orchestrator(request: Request) -> OrchestratorAgent:
+    """
+    Get the application-wide OrchestratorAgent
+
+    The lifespan handler creates it at startup; it is built lazily here
+    if the app was started without lifespan events.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Shared OrchestratorAgent stored on app.state
+    """
+    orchestrator = getattr(request.app.state, "orchestrator", None)
+    if orchestrator is None:
+        orchestrator = request.app.state.orchestrator = OrchestratorAgent()
+    return orchestrator
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    Get the application-wide outbound HTTP client
+
+    Built lazily, like the orchestrator, when lifespan events did not run.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Shared AsyncClient stored on app.state
+    """
+    client = getattr(request.app.state, "http_client", None)
+    if client is None or client.is_closed:
+        client = request.app.state.http_client = create_http_client()
+    return client
@@ -1,18 +1,60 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Dict, Any, AsyncGenerator, AsyncIterator
 from datetime import datetime
-from models.schemas import OHLCData, ChartAnnotation
+import orjson
+from models.schemas import ChartAnnotation
 from services.market_data_service import MarketDataService
 from repositories.annotation_repository import AnnotationRepository
+from repositories.ohlc_repository import OHLCRepository
+from utils.batch_loader import BatchLoader
+from utils.helpers import seconds_to_next_candle
+from utils.http_cache import cached_json_response
 
 router = APIRouter(prefix="/api", tags=["Market Data"])
 
+# Coalesces concurrent candle/price requests (e.g., a page opening several
+# charts at once) into one bulk query per (timeframe, limit)
+ohlc_loader = BatchLoader(MarketDataService.get_ohlc_data_bulk)
 
-@router.get("/ohlc/{symbol}", response_model=List[OHLCData])
+# Above this many candles, stream rows from a DB cursor instead of
+# building the whole list (and its JSON) in memory first
+_STREAM_MIN_LIMIT = 500
+
+
+async def _stream_json_array(
+    first: Dict[str, Any],
+    rows: AsyncGenerator[Dict[str, Any], None]
+) -> AsyncIterator[bytes]:
+    """
+    Encode rows as a JSON array, one chunk per row
+
+    The row generator is always closed, so a client disconnect or failed
+    send returns its pooled connection right away instead of on GC.
+
+    Args:
+        first: First row, already pulled to detect empty results
+        rows: Remaining rows
+
+    Yields:
+        JSON array fragments
+    """
+    try:
+        yield b"[" + orjson.dumps(first)
+        async for row in rows:
+            yield b"," + orjson.dumps(row)
+        yield b"]"
+    finally:
+        await rows.aclose()
+
+
+@router.get("/ohlc/{symbol}", response_class=ORJSONResponse)
 async def get_ohlc_data(
+    request: Request,
     symbol: str,
     timeframe: str = Query("1h", description="Candle timeframe"),
-    limit: int = Query(240, ge=1, le=1000, description="Number of candles")
+    limit: int = Query(240, ge=1, le=1000, description="Number of candles"),
+    fmt: str = Query("rows", description="rows (list of candles) or soa (column arrays)")
 ):
     """
     Fetch OHLC (candlestick) data for a trading pair
@@ -21,17 +63,41 @@ async def get_ohlc_data(
         symbol: Trading pair (e.g., BTC/USD)
         timeframe: Candle timeframe (1m, 5m, 15m, 30m, 1h, 4h, 1d)
         limit: Number of candles to fetch (1-1000)
+        fmt: Response layout; "soa" returns {t, o, h, l, c, v} arrays
 
     Returns:
-        List of OHLC candles in chronological order
+        List of OHLC candles in chronological order, or column arrays for fmt=soa.
+        Responses above 500 candles are streamed: they carry Cache-Control
+        but no ETag, so they are never answered with 304
     """
     try:
-        data = await MarketDataService.get_ohlc_data(
-            symbol=symbol,
-            timeframe=timeframe,
-            limit=limit,
-            use_cache=True
-        )
+        if fmt == "soa":
+            columns = await OHLCRepository.get_ohlc_columnar(symbol, timeframe, limit)
+            if not columns["t"]:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No OHLC data found for {symbol}"
+                )
+            return cached_json_response(request, columns, seconds_to_next_candle(timeframe))
+
+        if limit > _STREAM_MIN_LIMIT:
+            rows = OHLCRepository.stream_ohlc(symbol, timeframe, limit)
+            first = await anext(rows, None)
+            if first is None:
+                await rows.aclose()
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No OHLC data found for {symbol}"
+                )
+            # The body is not known up front, so there is no ETag to
+            # revalidate against; clients may still reuse it until the candle closes
+            return StreamingResponse(
+                _stream_json_array(first, rows),
+                media_type="application/json",
+                headers={"Cache-Control": f"max-age={seconds_to_next_candle(timeframe)}"}
+            )
+
+        data = await ohlc_loader.load(symbol, timeframe, limit, True)
 
         if not data:
             raise HTTPException(
@@ -39,7 +105,9 @@ async def get_ohlc_data(
                 detail=f"No OHLC data found for {symbol}"
             )
 
-        return data
+        # Candles are already plain floats/datetimes, so skip response-model
+        # validation and serialize straight from the list
+        return cached_json_response(request, data, seconds_to_next_candle(timeframe))
 
     except HTTPException:
         raise
@@ -66,7 +134,9 @@ async def get_latest_price(
         Latest close price
     """
     try:
-        price = await MarketDataService.get_latest_price(symbol, timeframe)
+        # Uncached: a one-candle window must always reflect the latest close
+        candles = await ohlc_loader.load(symbol, timeframe, 1, False)
+        price = candles[-1]['close'] if candles else None
 
         if price is None:
             raise HTTPException(
@@ -92,6 +162,7 @@ async def get_latest_price(
 
 @router.get("/indicators/{symbol}")
 async def get_technical_indicators(
+    request: Request,
     symbol: str,
     timeframe: str = Query("1h", description="Candle timeframe"),
     limit: int = Query(240, description="Number of candles for calculation")
@@ -114,12 +185,12 @@ async def get_technical_indicators(
             limit=limit
         )
 
-        return {
+        return cached_json_response(request, {
             "symbol": symbol,
             "timeframe": timeframe,
             "indicators": indicators,
             "timestamp": datetime.utcnow()
-        }
+        }, seconds_to_next_candle(timeframe), etag_source=indicators)
 
     except Exception as e:
         raise HTTPException(
@@ -130,6 +201,7 @@ async def get_technical_indicators(
 
 @router.get("/liquidation-levels/{symbol}")
 async def get_liquidation_levels(
+    request: Request,
     symbol: str,
     timeframe: str = Query("1h", description="Candle timeframe"),
     lookback_periods: int = Query(240, description="Periods to analyze")
@@ -152,12 +224,12 @@ async def get_liquidation_levels(
             lookback_periods=lookback_periods
         )
 
-        return {
+        return cached_json_response(request, {
             "symbol": symbol,
             "timeframe": timeframe,
             **levels,
             "timestamp": datetime.utcnow()
-        }
+        }, seconds_to_next_candle(timeframe), etag_source=levels)
 
     except Exception as e:
         raise HTTPException(
@@ -248,11 +320,14 @@ async def delete_annotations(symbol: str):
         )
 
 
+# Only the timestamp varies, so the rest of the payload is prebuilt
+_HEALTH_PREFIX = b'{"status":"healthy","service":"market_data","timestamp":'
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "market_data",
-        "timestamp": datetime.utcnow()
-    }
+    return Response(
+        _HEALTH_PREFIX + orjson.dumps(datetime.utcnow()) + b"}",
+        media_type="application/json"
+    )
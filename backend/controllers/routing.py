@@ -0,0 +1,30 @@
+"""
+Custom route class that parses JSON request bodies with orjson
+"""
+from typing import Any, Callable, Coroutine
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+import orjson
+
+
+class ORJSONRequest(Request):
+    """Request whose json() uses orjson instead of the stdlib parser"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so
+            # FastAPI still turns malformed bodies into a 422
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """APIRoute that hands handlers an ORJSONRequest"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
 from datetime import datetime
+import orjson
 from models.schemas import (
     StrategyBuildRequest,
     StrategyBuildResponse,
@@ -11,15 +13,17 @@ from models.schemas import (
 )
 from agents.orchestrator import OrchestratorAgent
 from services.strategy_service import StrategyService
+from controllers.dependencies import get_orchestrator
+from controllers.routing import ORJSONRoute
 
-router = APIRouter(prefix="/api/strategy", tags=["Strategy"])
-
-# Initialize orchestrator
-orchestrator = OrchestratorAgent()
+router = APIRouter(prefix="/api/strategy", tags=["Strategy"], route_class=ORJSONRoute)
 
 
 @router.post("/build", response_model=StrategyBuildResponse)
-async def build_strategy(request: StrategyBuildRequest):
+async def build_strategy(
+    request: StrategyBuildRequest,
+    orchestrator: OrchestratorAgent = Depends(get_orchestrator)
+):
     """
     Build a trading strategy from user prompt
 
@@ -39,7 +43,7 @@ async def build_strategy(request: StrategyBuildRequest):
         )
 
         if cached_strategy:
-            return StrategyBuildResponse(**cached_strategy)
+            return ORJSONResponse(cached_strategy)
 
         # Build strategy using orchestrator
         result = await orchestrator.build_strategy(
@@ -87,14 +91,16 @@ async def build_strategy(request: StrategyBuildRequest):
             timestamp=datetime.utcnow()
         )
 
+        response_data = response.model_dump()
+
         # Cache the response
         await StrategyService.cache_strategy(
             request.prompt,
             request.symbol,
-            response.model_dump()
+            response_data
         )
 
-        return response
+        return ORJSONResponse(response_data)
 
     except Exception as e:
         raise HTTPException(
@@ -106,7 +112,8 @@ async def build_strategy(request: StrategyBuildRequest):
 @router.get("/analyze/{symbol}")
 async def quick_analysis(
     symbol: str,
-    timeframe: str = "1h"
+    timeframe: str = "1h",
+    orchestrator: OrchestratorAgent = Depends(get_orchestrator)
 ):
     """
     Quick market analysis without full strategy building
@@ -127,11 +134,14 @@ async def quick_analysis(
         )
 
 
+# Only the timestamp varies, so the rest of the payload is prebuilt
+_HEALTH_PREFIX = b'{"status":"healthy","service":"strategy","timestamp":'
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "strategy",
-        "timestamp": datetime.utcnow()
-    }
+    return Response(
+        _HEALTH_PREFIX + orjson.dumps(datetime.utcnow()) + b"}",
+        media_type="application/json"
+    )
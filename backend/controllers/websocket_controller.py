@@ -1,51 +1,157 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict, List
+from starlette.websockets import WebSocketState
+from typing import Dict, Set
+from collections import defaultdict
 import asyncio
-import json
+import logging
+import orjson
 from datetime import datetime
 from services.market_data_service import MarketDataService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["WebSocket"])
 
+_ENCODE_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+# Send failures that mean the client is gone; anything else is a bug and is
+# left to surface rather than silently dropping the subscriber
+_SEND_ERRORS = (WebSocketDisconnect, RuntimeError, ConnectionError)
+
+# Seconds between periodic market summaries (matches the 1h candle update)
+PERIODIC_UPDATE_INTERVAL = 3600.0
+
+
+def _encode(message: dict) -> str:
+    """
+    Serialize a WebSocket message with orjson
+
+    Args:
+        message: Message payload (datetimes and numpy values are handled natively)
+
+    Returns:
+        JSON text for a text frame
+    """
+    return orjson.dumps(message, default=str, option=_ENCODE_OPTIONS).decode()
+
+
+async def _receive_message(websocket: WebSocket) -> dict:
+    """
+    Receive one client frame and parse it with orjson
+
+    Text and binary frames are both accepted; orjson parses the frame's
+    str/bytes payload directly, with no intermediate decode.
+
+    Args:
+        websocket: Client connection
+
+    Returns:
+        Parsed message
+
+    Raises:
+        WebSocketDisconnect: Client closed the connection
+        orjson.JSONDecodeError: Frame is not valid JSON
+    """
+    frame = await websocket.receive()
+    if frame["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", 1000))
+
+    payload = frame.get("bytes")
+    return orjson.loads(payload if payload is not None else frame.get("text") or "")
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates"""
 
     def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.active_connections: Dict[str, Set[WebSocket]] = defaultdict(set)
+        # One periodic publisher per subscribed symbol
+        self._publishers: Dict[str, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, symbol: str):
         """Accept and register a new WebSocket connection"""
         await websocket.accept()
-        if symbol not in self.active_connections:
-            self.active_connections[symbol] = []
-        self.active_connections[symbol].append(websocket)
+        self.active_connections[symbol].add(websocket)
+
+        # First subscriber starts the symbol's publisher
+        if symbol not in self._publishers:
+            self._publishers[symbol] = asyncio.create_task(self._symbol_publisher(symbol))
 
     def disconnect(self, websocket: WebSocket, symbol: str):
         """Remove a WebSocket connection"""
-        if symbol in self.active_connections:
-            if websocket in self.active_connections[symbol]:
-                self.active_connections[symbol].remove(websocket)
-            if len(self.active_connections[symbol]) == 0:
-                del self.active_connections[symbol]
+        connections = self.active_connections.get(symbol)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                self._drop_symbol(symbol)
+
+    def _drop_symbol(self, symbol: str):
+        """Forget a symbol with no subscribers left and stop its publisher"""
+        self.active_connections.pop(symbol, None)
+        publisher = self._publishers.pop(symbol, None)
+        if publisher is not None and publisher is not asyncio.current_task():
+            publisher.cancel()
+
+    async def _symbol_publisher(self, symbol: str):
+        """
+        Compute the market summary once per interval and fan it out
+
+        Args:
+            symbol: Trading pair whose subscribers receive the updates
+        """
+        while True:
+            await asyncio.sleep(PERIODIC_UPDATE_INTERVAL)
+            # Retired (or replaced after the symbol emptied and refilled)
+            if self._publishers.get(symbol) is not asyncio.current_task():
+                return
+
+            try:
+                market_summary = await MarketDataService.get_cached_market_summary(symbol, "1h")
+                message = {
+                    "type": "periodic_update",
+                    "data": market_summary,
+                    "timestamp": datetime.utcnow()
+                }
+            except Exception as e:
+                message = {
+                    "type": "error",
+                    "message": f"Update failed: {str(e)}",
+                    "timestamp": datetime.utcnow()
+                }
+
+            await self.broadcast_to_symbol(message, symbol)
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """Send message to specific WebSocket"""
-        await websocket.send_json(message)
+        await websocket.send_text(_encode(message))
 
     async def broadcast_to_symbol(self, message: dict, symbol: str):
         """Broadcast message to all connections for a symbol"""
-        if symbol in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[symbol]:
-                try:
-                    await connection.send_json(message)
-                except:
-                    disconnected.append(connection)
-
-            # Clean up disconnected clients
-            for connection in disconnected:
-                self.disconnect(connection, symbol)
+        connections = list(self.active_connections.get(symbol, ()))
+        if not connections:
+            return
+
+        # Serialize once, then send to every subscriber concurrently so a
+        # slow or dead client does not hold up the rest
+        payload = _encode(message)
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True
+        )
+
+        # Clean up disconnected clients in one pass
+        dead = set()
+        for connection, result in zip(connections, results):
+            if isinstance(result, _SEND_ERRORS):
+                dead.add(connection)
+            elif isinstance(result, BaseException):
+                logger.error("Broadcast to %s failed: %r", symbol, result)
+        if dead:
+            remaining = self.active_connections.get(symbol)
+            if remaining is not None:
+                remaining.difference_update(dead)
+                if not remaining:
+                    self._drop_symbol(symbol)
 
 
 # Global connection manager
@@ -72,83 +178,72 @@ async def websocket_endpoint(websocket: WebSocket, symbol: str):
         await manager.send_personal_message({
             "type": "connection",
             "message": f"Connected to {symbol} stream",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }, websocket)
 
         # Send initial market data
         try:
-            market_summary = await MarketDataService.get_market_summary(symbol, "1h")
+            market_summary = await MarketDataService.get_cached_market_summary(symbol, "1h")
             await manager.send_personal_message({
                 "type": "market_summary",
                 "data": market_summary,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow()
             }, websocket)
         except Exception as e:
             await manager.send_personal_message({
                 "type": "error",
                 "message": f"Failed to fetch initial data: {str(e)}",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow()
             }, websocket)
 
-        # Listen for messages and send periodic updates
+        # Listen for client messages; periodic updates come from the
+        # symbol's shared publisher
         while True:
             try:
-                # Wait for client messages or timeout for updates
-                data = await asyncio.wait_for(
-                    websocket.receive_text(),
-                    timeout=3600.0  # 1 hour timeout (matches 1h candle update)
-                )
-
                 # Handle client messages
-                message = json.loads(data)
+                message = await _receive_message(websocket)
                 message_type = message.get("type")
 
                 if message_type == "ping":
                     await manager.send_personal_message({
                         "type": "pong",
-                        "timestamp": datetime.utcnow().isoformat()
+                        "timestamp": datetime.utcnow()
                     }, websocket)
 
                 elif message_type == "request_update":
                     # Send current market data
-                    market_summary = await MarketDataService.get_market_summary(
+                    market_summary = await MarketDataService.get_cached_market_summary(
                         symbol, message.get("timeframe", "1h")
                     )
                     await manager.send_personal_message({
                         "type": "market_update",
                         "data": market_summary,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }, websocket)
-
-            except asyncio.TimeoutError:
-                # Send periodic update (every hour)
-                try:
-                    market_summary = await MarketDataService.get_market_summary(symbol, "1h")
-                    await manager.send_personal_message({
-                        "type": "periodic_update",
-                        "data": market_summary,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }, websocket)
-                except Exception as e:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "message": f"Update failed: {str(e)}",
-                        "timestamp": datetime.utcnow().isoformat()
+                        "timestamp": datetime.utcnow()
                     }, websocket)
 
             except WebSocketDisconnect:
                 manager.disconnect(websocket, symbol)
                 break
 
+            except orjson.JSONDecodeError:
+                await manager.send_personal_message({
+                    "type": "error",
+                    "message": "Invalid JSON message",
+                    "timestamp": datetime.utcnow()
+                }, websocket)
+
             except Exception as e:
+                # Don't try to report errors on a socket that is already gone
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    break
                 await manager.send_personal_message({
                     "type": "error",
                     "message": str(e),
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.utcnow()
                 }, websocket)
 
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
     finally:
         manager.disconnect(websocket, symbol)
 
@@ -169,38 +264,46 @@ async def strategy_websocket(websocket: WebSocket, symbol: str):
     await websocket.accept()
 
     try:
-        await websocket.send_json({
+        await manager.send_personal_message({
             "type": "connection",
             "message": f"Connected to strategy stream for {symbol}",
-            "timestamp": datetime.utcnow().isoformat()
-        })
+            "timestamp": datetime.utcnow()
+        }, websocket)
 
         while True:
             try:
-                data = await websocket.receive_text()
-                message = json.loads(data)
+                message = await _receive_message(websocket)
 
                 if message.get("type") == "ping":
-                    await websocket.send_json({
+                    await manager.send_personal_message({
                         "type": "pong",
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
+                        "timestamp": datetime.utcnow()
+                    }, websocket)
 
                 # Add strategy-specific logic here
 
             except WebSocketDisconnect:
                 break
+            except orjson.JSONDecodeError:
+                await manager.send_personal_message({
+                    "type": "error",
+                    "message": "Invalid JSON message",
+                    "timestamp": datetime.utcnow()
+                }, websocket)
             except Exception as e:
-                await websocket.send_json({
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    break
+                await manager.send_personal_message({
                     "type": "error",
                     "message": str(e),
-                    "timestamp": datetime.utcnow().isoformat()
-                })
+                    "timestamp": datetime.utcnow()
+                }, websocket)
 
     except Exception as e:
-        print(f"Strategy WebSocket error: {e}")
+        logger.error("Strategy WebSocket error: %s", e)
     finally:
-        await websocket.close()
+        if websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.close()
 
 
 async def broadcast_price_update(symbol: str, price_data: dict):
@@ -214,7 +317,7 @@ async def broadcast_price_update(symbol: str, price_data: dict):
     await manager.broadcast_to_symbol({
         "type": "price_update",
         "data": price_data,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }, symbol)
 
 
@@ -229,5 +332,5 @@ async def broadcast_strategy_signal(symbol: str, signal_data: dict):
     await manager.broadcast_to_symbol({
         "type": "strategy_signal",
         "data": signal_data,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }, symbol)
@@ -4,93 +4,127 @@ Fetches OHLC data from Binance public API (no API key needed)
 """
 import httpx
 import asyncio
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import logging
+import orjson
+import numpy as np
+from typing import List, Dict, Optional
 from repositories.ohlc_repository import OHLCRepository
 
+logger = logging.getLogger(__name__)
+
+# One candle per row; time is the Binance open time in epoch milliseconds
+OHLC_DTYPE = np.dtype([
+    ("time", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+])
+
 
 class BinanceFetcher:
     """Fetch cryptocurrency data from Binance"""
 
     BASE_URL = "https://api.binance.com/api/v3"
 
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+    # Max concurrent klines requests, to stay clear of Binance 429s
+    MAX_CONCURRENT_REQUESTS = 16
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            client: Shared HTTP client to use; one is built lazily if omitted
+        """
+        self._client: Optional[httpx.AsyncClient] = client
+        # Only close clients we created; a shared one belongs to the app
+        self._owns_client = client is None
+        self._sem = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Keep-alive HTTP/2 client, created on first use"""
+        # One client for every request in the process, so symbols share a
+        # multiplexed connection instead of each paying a TLS handshake
+        if self._client is None or self._client.is_closed:
+            self._owns_client = True
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._client
+
+    async def use_client(self, client: httpx.AsyncClient):
+        """
+        Switch to a shared HTTP client, closing any client built here
+
+        Args:
+            client: Application-wide client (closed by its owner)
+        """
+        await self.close()
+        self._client = client
+        self._owns_client = False
 
     async def fetch_ohlc(
         self,
         symbol: str,
         interval: str = "1h",
         limit: int = 100
-    ) -> List[Dict[str, Any]]:
+    ) -> np.ndarray:
         """
         Fetch OHLC data from Binance
 
         Args:
             symbol: Trading pair (e.g., BTCUSDT, ETHUSDT)
-            interval: Candle interval (1m, 5m, 15m, 1h, 4h, 1d)
+            interval: Candle interval (1m, 5m, 15m, 30m, 1h, 4h, 1d); our
+                interval names match Binance's
             limit: Number of candles (max 1000)
 
         Returns:
-            List of OHLC dictionaries
+            OHLC_DTYPE structured array, oldest first (empty on failure)
         """
         try:
-            # Map our intervals to Binance format
-            interval_map = {
-                "1m": "1m",
-                "5m": "5m",
-                "15m": "15m",
-                "30m": "30m",
-                "1h": "1h",
-                "4h": "4h",
-                "1d": "1d"
-            }
-
-            binance_interval = interval_map.get(interval, "1h")
-
             # Fetch klines (candlestick data)
             url = f"{self.BASE_URL}/klines"
             params = {
                 "symbol": symbol,
-                "interval": binance_interval,
+                "interval": interval,
                 "limit": min(limit, 1000)
             }
 
             response = await self.client.get(url, params=params)
             response.raise_for_status()
 
-            data = response.json()
-
             # Parse Binance klines format
             # [Open time, Open, High, Low, Close, Volume, Close time, ...]
-            ohlc_data = []
-            for candle in data:
-                ohlc_data.append({
-                    "time": datetime.fromtimestamp(candle[0] / 1000),
-                    "open": float(candle[1]),
-                    "high": float(candle[2]),
-                    "low": float(candle[3]),
-                    "close": float(candle[4]),
-                    "volume": float(candle[5])
-                })
-
-            return ohlc_data
+            return np.array([
+                (
+                    candle[0],
+                    float(candle[1]),
+                    float(candle[2]),
+                    float(candle[3]),
+                    float(candle[4]),
+                    float(candle[5])
+                )
+                for candle in orjson.loads(response.content)
+            ], dtype=OHLC_DTYPE)
 
         except httpx.HTTPError as e:
-            print(f"[ERROR] Binance API error for {symbol}: {e}")
-            return []
+            logger.error("Binance API error for %s: %s", symbol, e)
+            return np.empty(0, dtype=OHLC_DTYPE)
         except Exception as e:
-            print(f"[ERROR] Error fetching {symbol}: {e}")
-            return []
+            logger.error("Error fetching %s: %s", symbol, e)
+            return np.empty(0, dtype=OHLC_DTYPE)
 
     async def store_to_database(
         self,
         symbol: str,
         timeframe: str,
-        ohlc_data: List[Dict[str, Any]]
+        ohlc_data: np.ndarray
     ):
         """Store OHLC data to database"""
-        if not ohlc_data:
+        if len(ohlc_data) == 0:
             return
 
         await OHLCRepository.insert_ohlc_data(
@@ -99,7 +133,7 @@ class BinanceFetcher:
             data=ohlc_data
         )
 
-        print(f"[OK] Stored {len(ohlc_data)} candles for {symbol} ({timeframe})")
+        logger.debug("Stored %d candles for %s (%s)", len(ohlc_data), symbol, timeframe)
 
     async def fetch_and_store_multiple(
         self,
@@ -126,27 +160,36 @@ class BinanceFetcher:
         success_count = sum(1 for r in results if not isinstance(r, Exception))
         failure_count = len(results) - success_count
 
-        print(f"\n[INGESTION] Complete:")
-        print(f"   [OK] Success: {success_count}/{len(symbols)}")
-        print(f"   [ERROR] Failed: {failure_count}/{len(symbols)}")
+        logger.info(
+            "Ingestion complete: %d/%d succeeded, %d failed",
+            success_count, len(symbols), failure_count
+        )
 
     async def _fetch_and_store_single(
         self,
         symbol: str,
         interval: str,
         limit: int
-    ):
-        """Helper method to fetch and store single symbol"""
+    ) -> int:
+        """
+        Helper method to fetch and store single symbol
+
+        Returns:
+            Number of candles stored (0 if Binance returned none)
+        """
         try:
-            ohlc_data = await self.fetch_ohlc(symbol, interval, limit)
+            async with self._sem:
+                ohlc_data = await self.fetch_ohlc(symbol, interval, limit)
 
-            if ohlc_data:
+            if len(ohlc_data):
                 await self.store_to_database(symbol, interval, ohlc_data)
             else:
-                print(f"[WARNING] No data found for {symbol}")
+                logger.warning("No data found for %s", symbol)
+
+            return len(ohlc_data)
 
         except Exception as e:
-            print(f"[ERROR] Error fetching {symbol}: {str(e)}")
+            logger.error("Error fetching %s: %s", symbol, e)
             raise
 
     async def get_live_price(self, symbol: str) -> Optional[float]:
@@ -170,24 +213,57 @@ class BinanceFetcher:
             return float(data["price"])
 
         except Exception as e:
-            print(f"[ERROR] Error fetching live price for {symbol}: {e}")
+            logger.error("Error fetching live price for %s: %s", symbol, e)
             return None
 
+    async def fetch_multi_ticker(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get current prices for several symbols in one request
+
+        Args:
+            symbols: Trading pairs (e.g., ["BTCUSDT", "ETHUSDT"])
+
+        Returns:
+            Dictionary of symbol -> price (empty on failure)
+        """
+        try:
+            url = f"{self.BASE_URL}/ticker/price"
+            # Binance expects a compact JSON array, e.g. ["BTCUSDT","ETHUSDT"]
+            params = {"symbols": orjson.dumps(symbols).decode()}
+
+            response = await self.client.get(url, params=params)
+            response.raise_for_status()
+
+            return {
+                ticker["symbol"]: float(ticker["price"])
+                for ticker in orjson.loads(response.content)
+            }
+
+        except Exception as e:
+            logger.error("Error fetching multi-symbol ticker: %s", e)
+            return {}
+
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Close HTTP client if owned, and drop it (safe to call more than once)"""
+        client, self._client = self._client, None
+        if client is not None and self._owns_client:
+            await client.aclose()
+
+
+# Global instance shared by the schedulers and scripts
+binance_fetcher = BinanceFetcher()
 
 
 # Test function
 async def main():
     """Test Binance data fetching"""
-    fetcher = BinanceFetcher()
+    fetcher = binance_fetcher
 
     # Test single crypto
     print("[TEST] Fetching BTCUSDT data...")
     btc_data = await fetcher.fetch_ohlc("BTCUSDT", interval="1h", limit=10)
     print(f"[OK] Fetched {len(btc_data)} candles for Bitcoin")
-    print(f"Latest: ${btc_data[0]['close']:,.2f}")
+    print(f"Latest: ${btc_data['close'][-1]:,.2f}")
 
     # Test live price
     live_price = await fetcher.get_live_price("BTCUSDT")
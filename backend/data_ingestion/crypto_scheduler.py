@@ -4,13 +4,16 @@ Crypto markets are 24/7, so we fetch more frequently than stock markets
 """
 
 import asyncio
+import logging
+import time
 from datetime import datetime, timedelta
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
-from data_ingestion.binance_fetcher import BinanceFetcher
+from typing import List
+from data_ingestion.binance_fetcher import binance_fetcher
+from data_ingestion.periodic import run_every, run_daily_at
 from repositories.ohlc_repository import OHLCRepository
 
+logger = logging.getLogger(__name__)
+
 
 class CryptoScheduler:
     """
@@ -18,8 +21,8 @@ class CryptoScheduler:
     """
 
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
-        self.binance_fetcher = BinanceFetcher()
+        self._tasks: List[asyncio.Task] = []
+        self.binance_fetcher = binance_fetcher
         self.is_running = False
 
         # Crypto pairs to track
@@ -31,146 +34,104 @@ class CryptoScheduler:
     async def start(self):
         """Start the crypto scheduler"""
         if self.is_running:
-            print("[WARNING] Crypto scheduler already running")
+            logger.warning("Crypto scheduler already running")
             return
 
-        # Fetch live data every 5 minutes (crypto is 24/7)
-        self.scheduler.add_job(
-            self.fetch_live_data,
-            trigger=IntervalTrigger(minutes=5),
-            id='live_crypto_update',
-            name='Fetch live crypto data every 5 minutes',
-            replace_existing=True
-        )
-
-        # Cleanup old data daily at 00:00 UTC (keep last 30 days)
-        self.scheduler.add_job(
-            self.cleanup_old_data,
-            trigger=CronTrigger(hour=0, minute=0),
-            id='daily_cleanup',
-            name='Cleanup data older than 30 days',
-            replace_existing=True
-        )
-
-        # Initial data fetch on startup
-        self.scheduler.add_job(
-            self.initial_data_fetch,
-            trigger='date',  # Run once
-            id='initial_crypto_fetch',
-            name='Initial crypto data fetch'
-        )
+        self._tasks = [
+            # Fetch live data every 5 minutes (crypto is 24/7)
+            asyncio.create_task(run_every(300, self.fetch_live_data)),
+            # Cleanup old data daily at 00:00 (keep last 30 days)
+            asyncio.create_task(run_daily_at([0], 0, self.cleanup_old_data)),
+            # Initial data fetch on startup
+            asyncio.create_task(self.initial_data_fetch()),
+        ]
 
-        self.scheduler.start()
         self.is_running = True
-        print("[OK] Crypto scheduler started")
-        print("   - Live updates: Every 5 minutes (24/7)")
-        print("   - Data retention: Last 30 days")
-        print("   - Daily cleanup: 00:00 UTC")
+        logger.info(
+            "Crypto scheduler started: live updates every 5 minutes (24/7), "
+            "data retention 30 days, daily cleanup at 00:00"
+        )
 
     async def stop(self):
         """Stop the scheduler"""
-        if self.scheduler.running:
-            self.scheduler.shutdown()
+        if self.is_running:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
             self.is_running = False
-            print("[OK] Crypto scheduler stopped")
+            logger.info("Crypto scheduler stopped")
 
     async def initial_data_fetch(self):
         """Fetch initial historical data on startup"""
-        print("\n[STARTUP] Fetching initial crypto data from Binance...")
+        logger.info("Fetching initial crypto data from Binance")
 
         try:
-            success_count = 0
-            fail_count = 0
-
-            for symbol in self.crypto_pairs:
-                try:
-                    # Fetch last 500 hourly candles (~21 days)
-                    candles = await self.binance_fetcher.fetch_ohlc(
-                        symbol=symbol,
-                        interval="1h",
-                        limit=500
-                    )
-
-                    # Store in database using bulk insert
-                    if candles:
-                        await OHLCRepository.insert_ohlc_data(
-                            symbol=symbol,
-                            timeframe="1h",
-                            data=candles
-                        )
-                        print(f"[OK] Stored {len(candles)} candles for {symbol}")
-                        success_count += 1
-
-                except Exception as e:
-                    print(f"[ERROR] Failed to fetch {symbol}: {e}")
-                    fail_count += 1
-
-            print(f"\n[INGESTION] Complete:")
-            print(f"   [OK] Success: {success_count}/{len(self.crypto_pairs)}")
-            print(f"   [ERROR] Failed: {fail_count}/{len(self.crypto_pairs)}")
+            # Fetch last 500 hourly candles (~21 days) for every pair concurrently;
+            # the fetcher's semaphore bounds in-flight requests
+            results = await asyncio.gather(*(
+                self.binance_fetcher._fetch_and_store_single(symbol, "1h", 500)
+                for symbol in self.crypto_pairs
+            ), return_exceptions=True)
+
+            success_count = sum(1 for r in results if not isinstance(r, Exception) and r)
+            fail_count = len(results) - success_count
+
+            logger.info(
+                "Initial ingestion complete: %d/%d succeeded, %d failed",
+                success_count, len(self.crypto_pairs), fail_count
+            )
 
         except Exception as e:
-            print(f"[ERROR] Initial crypto fetch failed: {e}")
+            logger.error("Initial crypto fetch failed: %s", e)
 
     async def fetch_live_data(self):
         """Fetch latest crypto data (runs every 5 minutes)"""
-        print(f"\n[LIVE UPDATE] {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
-
         try:
-            success_count = 0
-            fail_count = 0
-
-            for symbol in self.crypto_pairs:
-                try:
-                    # Fetch last 10 candles to ensure we have latest
-                    candles = await self.binance_fetcher.fetch_ohlc(
-                        symbol=symbol,
-                        interval="1h",
-                        limit=10
-                    )
-
-                    # Store all recent candles (upsert will handle duplicates)
-                    if candles:
-                        await OHLCRepository.insert_ohlc_data(
-                            symbol=symbol,
-                            timeframe="1h",
-                            data=candles
-                        )
-                        success_count += 1
-
-                except Exception as e:
-                    print(f"[ERROR] Live update failed for {symbol}: {e}")
-                    fail_count += 1
-
-            print(f"[LIVE] Updated {success_count} cryptos (Failed: {fail_count})")
+            # First run after the hour: sync klines so the completed candle
+            # (with its real volume) is persisted
+            if datetime.utcnow().minute < 5:
+                # Fetch last 10 candles to ensure we have latest; upsert handles duplicates
+                results = await asyncio.gather(*(
+                    self.binance_fetcher._fetch_and_store_single(symbol, "1h", 10)
+                    for symbol in self.crypto_pairs
+                ), return_exceptions=True)
+
+                success_count = sum(1 for r in results if not isinstance(r, Exception) and r)
+                fail_count = len(results) - success_count
+            else:
+                # Within the hour only the open candle moves: one ticker request
+                # for every pair, folded into the current 1h candle
+                prices = await self.binance_fetcher.fetch_multi_ticker(self.crypto_pairs)
+                if prices:
+                    # Same naive local-time convention as BinanceFetcher.fetch_ohlc
+                    candle_time = datetime.fromtimestamp(int(time.time()) // 3600 * 3600)
+                    await OHLCRepository.update_live_candles("1h", candle_time, prices)
+
+                success_count = len(prices)
+                fail_count = len(self.crypto_pairs) - success_count
+
+            logger.info("Live update: %d cryptos updated, %d failed", success_count, fail_count)
 
         except Exception as e:
-            print(f"[ERROR] Live update failed: {e}")
+            logger.error("Live update failed: %s", e)
 
     async def cleanup_old_data(self):
         """Remove data older than 30 days"""
-        print(f"\n[CLEANUP] Starting data cleanup at {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
-
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=30)
 
-            for symbol in self.crypto_pairs:
-                try:
-                    deleted_count = await OHLCRepository.delete_old_data(
-                        symbol=symbol,
-                        before_date=cutoff_date
-                    )
-
-                    if deleted_count > 0:
-                        print(f"[CLEANUP] Deleted {deleted_count} old candles for {symbol}")
-
-                except Exception as e:
-                    print(f"[ERROR] Cleanup failed for {symbol}: {e}")
+            # One statement for every pair; the time bound lets Postgres
+            # prune to the old partitions
+            deleted_total = await OHLCRepository.delete_old_data_bulk(
+                symbols=self.crypto_pairs,
+                before_date=cutoff_date
+            )
 
-            print("[CLEANUP] Data cleanup complete")
+            logger.info("Data cleanup complete: %d old candles deleted", deleted_total)
 
         except Exception as e:
-            print(f"[ERROR] Cleanup failed: {e}")
+            logger.error("Cleanup failed: %s", e)
 
 
 # Global instance
@@ -4,10 +4,16 @@ Runs as a background task in FastAPI
 """
 
 import asyncio
-from datetime import datetime, time as dt_time
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+import logging
+import httpx
+from typing import List, Optional
 from data_ingestion.nse_fetcher import NSEFetcher
+from data_ingestion.periodic import run_daily_at
+
+logger = logging.getLogger(__name__)
+
+# Monday-Friday (datetime.weekday() numbering)
+TRADING_DAYS = range(5)
 
 
 class DataScheduler:
@@ -15,67 +21,54 @@ class DataScheduler:
     Schedules periodic data fetching tasks
     """
 
-    def __init__(self):
-        self.scheduler = AsyncIOScheduler()
-        self.nse_fetcher = NSEFetcher()
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            client: Shared HTTP client passed on to the NSE fetcher
+        """
+        self._tasks: List[asyncio.Task] = []
+        self.nse_fetcher = NSEFetcher(client)
         self.is_running = False
 
     async def start(self):
         """Start the scheduler"""
         if self.is_running:
-            print("[WARNING] Scheduler already running")
+            logger.warning("Scheduler already running")
             return
 
-        # Schedule hourly updates during market hours (9:15 AM - 3:30 PM IST)
-        self.scheduler.add_job(
-            self.fetch_hourly_data,
-            trigger=CronTrigger(
-                day_of_week='mon-fri',  # Only on trading days
-                hour='9-15',            # Market hours (IST)
-                minute='0'              # Every hour
-            ),
-            id='hourly_update',
-            name='Fetch hourly OHLC data',
-            replace_existing=True
-        )
-
-        # Schedule daily data update at market close (3:45 PM IST)
-        self.scheduler.add_job(
-            self.fetch_daily_data,
-            trigger=CronTrigger(
-                day_of_week='mon-fri',
-                hour=15,
-                minute=45
-            ),
-            id='daily_update',
-            name='Fetch daily OHLC data',
-            replace_existing=True
-        )
-
-        # Initial data fetch on startup
-        self.scheduler.add_job(
-            self.initial_data_fetch,
-            trigger='date',  # Run once
-            id='initial_fetch',
-            name='Initial data fetch on startup'
-        )
+        self._tasks = [
+            # Hourly updates during market hours (9:15 AM - 3:30 PM IST), trading days only
+            asyncio.create_task(run_daily_at(
+                range(9, 16), 0, self.fetch_hourly_data, weekdays=TRADING_DAYS
+            )),
+            # Daily data update at market close (3:45 PM IST)
+            asyncio.create_task(run_daily_at(
+                [15], 45, self.fetch_daily_data, weekdays=TRADING_DAYS
+            )),
+            # Initial data fetch on startup
+            asyncio.create_task(self.initial_data_fetch()),
+        ]
 
-        self.scheduler.start()
         self.is_running = True
-        print("[OK] Data scheduler started")
-        print("   - Hourly updates: Mon-Fri 9:00-15:00 IST")
-        print("   - Daily updates: Mon-Fri 15:45 IST")
+        logger.info(
+            "Data scheduler started: hourly updates Mon-Fri 9:00-15:00 IST, "
+            "daily updates Mon-Fri 15:45 IST"
+        )
 
     async def stop(self):
         """Stop the scheduler"""
-        if self.scheduler.running:
-            self.scheduler.shutdown()
+        if self.is_running:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            await self.nse_fetcher.close()
             self.is_running = False
-            print("[OK] Data scheduler stopped")
+            logger.info("Data scheduler stopped")
 
     async def initial_data_fetch(self):
         """Fetch initial data on startup"""
-        print("\n[STARTUP] Starting initial data fetch...")
+        logger.info("Starting initial data fetch")
 
         try:
             # Get Nifty 50 stocks
@@ -84,21 +77,21 @@ class DataScheduler:
             # Fetch last 10 days of hourly data for top 10 stocks
             top_stocks = symbols[:10]  # Start with top 10
 
-            print(f"[INFO] Fetching data for {len(top_stocks)} stocks...")
+            logger.info("Fetching data for %d stocks", len(top_stocks))
             await self.nse_fetcher.fetch_and_store_multiple(
                 symbols=top_stocks,
                 interval="1h",
                 period="10d"
             )
 
-            print("[OK] Initial data fetch complete!")
+            logger.info("Initial data fetch complete")
 
         except Exception as e:
-            print(f"[ERROR] Initial data fetch failed: {e}")
+            logger.error("Initial data fetch failed: %s", e)
 
     async def fetch_hourly_data(self):
         """Fetch hourly data during market hours"""
-        print(f"\n[CRON] [{datetime.now()}] Fetching hourly updates...")
+        logger.info("Fetching hourly updates")
 
         try:
             # Get current trading stocks (Nifty 50)
@@ -111,14 +104,14 @@ class DataScheduler:
                 period="1d"  # Just today's data
             )
 
-            print("[OK] Hourly update complete")
+            logger.info("Hourly update complete")
 
         except Exception as e:
-            print(f"[ERROR] Hourly update failed: {e}")
+            logger.error("Hourly update failed: %s", e)
 
     async def fetch_daily_data(self):
         """Fetch daily data at market close"""
-        print(f"\n[CRON] [{datetime.now()}] Fetching daily data...")
+        logger.info("Fetching daily data")
 
         try:
             symbols = await self.nse_fetcher.fetch_nse_top_stocks()
@@ -130,10 +123,10 @@ class DataScheduler:
                 period="30d"  # Last month
             )
 
-            print("[OK] Daily update complete")
+            logger.info("Daily update complete")
 
         except Exception as e:
-            print(f"[ERROR] Daily update failed: {e}")
+            logger.error("Daily update failed: %s", e)
 
     async def fetch_on_demand(
         self,
@@ -149,7 +142,7 @@ class DataScheduler:
             interval: Candle interval
             period: Time period
         """
-        print(f"[ON-DEMAND] Fetch: {symbol} ({interval})")
+        logger.info("On-demand fetch: %s (%s)", symbol, interval)
 
         try:
             ohlc_data = await self.nse_fetcher.fetch_ohlc(
@@ -164,14 +157,14 @@ class DataScheduler:
                     timeframe=interval,
                     ohlc_data=ohlc_data
                 )
-                print(f"[OK] Fetched {len(ohlc_data)} candles for {symbol}")
+                logger.info("Fetched %d candles for %s", len(ohlc_data), symbol)
                 return True
             else:
-                print(f"[WARNING] No data found for {symbol}")
+                logger.warning("No data found for %s", symbol)
                 return False
 
         except Exception as e:
-            print(f"[ERROR] On-demand fetch failed for {symbol}: {e}")
+            logger.error("On-demand fetch failed for %s: %s", symbol, e)
             return False
 
 
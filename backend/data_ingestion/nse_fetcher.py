@@ -3,13 +3,93 @@ NSE (National Stock Exchange India) Data Fetcher
 Fetches live and historical stock data from Indian stock market
 """
 
+import os
+import logging
 import httpx
+import orjson
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable, Awaitable, Hashable
+from pathlib import Path
 import asyncio
+from dateutil.tz import tzlocal
+from cachetools import Cache, TTLCache, TLRUCache
 from repositories.ohlc_repository import OHLCRepository
 
+logger = logging.getLogger(__name__)
+
+# Upstream response lifetimes: live prices go stale fast, intraday candles
+# once a minute, daily+ candles rarely
+LIVE_PRICE_TTL = 5
+INTRADAY_OHLC_TTL = 60
+DAILY_OHLC_TTL = 300
+
+# Built-in Nifty 50 components, used when the universe file is missing or invalid
+NIFTY50_SYMBOLS: Tuple[str, ...] = (
+    "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK",
+    "HINDUNILVR", "BHARTIARTL", "ITC", "SBIN", "KOTAKBANK",
+    "LT", "AXISBANK", "ASIANPAINT", "MARUTI", "BAJFINANCE",
+    "HCLTECH", "SUNPHARMA", "TITAN", "ULTRACEMCO", "NESTLEIND",
+    "WIPRO", "ADANIPORTS", "ONGC", "NTPC", "POWERGRID",
+    "TATASTEEL", "BAJAJFINSV", "M&M", "TECHM", "INDUSINDBK",
+    "JSWSTEEL", "HINDALCO", "DIVISLAB", "DRREDDY", "CIPLA",
+    "EICHERMOT", "BPCL", "COALINDIA", "GRASIM", "HEROMOTOCO",
+    "BRITANNIA", "SHREECEM", "UPL", "APOLLOHOSP", "TATAMOTORS",
+    "SBILIFE", "BAJAJ-AUTO", "HDFCLIFE", "TATACONSUM", "ADANIENT"
+)
+
+# JSON list of symbols to ingest; edit it (or point NSE_UNIVERSE elsewhere)
+# to change the universe without a redeploy
+_UNIVERSE_PATH = Path(os.getenv(
+    "NSE_UNIVERSE",
+    Path(__file__).resolve().parent.parent / "config" / "nifty50.json"
+))
+_universe_mtime: Optional[float] = None
+
+
+def _universe_file_mtime() -> Optional[float]:
+    """Modification time of the universe file, or None if it is absent"""
+    try:
+        return os.path.getmtime(_UNIVERSE_PATH)
+    except OSError:
+        return None
+
+
+def _load_universe() -> Tuple[str, ...]:
+    """
+    Read the universe file into Yahoo tickers
+
+    Returns:
+        Symbols with a .NS suffix (kept as-is if already suffixed), or the
+        built-in Nifty 50 if the file cannot be used
+    """
+    global _universe_mtime
+    _universe_mtime = _universe_file_mtime()
+
+    symbols: Tuple[str, ...] = NIFTY50_SYMBOLS
+    if _universe_mtime is not None:
+        try:
+            loaded = orjson.loads(_UNIVERSE_PATH.read_bytes())
+            if loaded and all(isinstance(s, str) for s in loaded):
+                symbols = tuple(loaded)
+            else:
+                logger.warning("%s is not a list of symbols, using built-in Nifty 50", _UNIVERSE_PATH)
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("Could not read %s: %s, using built-in Nifty 50", _UNIVERSE_PATH, e)
+
+    return tuple(s if s.endswith(('.NS', '.BO')) else f"{s}.NS" for s in symbols)
+
+
+# Yahoo tickers to ingest; refreshed by fetch_nse_top_stocks when the file changes
+NIFTY50_NS: Tuple[str, ...] = _load_universe()
+
+
+def _ohlc_ttu(key, value, now: float) -> float:
+    """Expiry for a (symbol, interval, period) OHLC cache entry"""
+    interval = key[1]
+    ttl = INTRADAY_OHLC_TTL if interval.endswith(('m', 'h')) else DAILY_OHLC_TTL
+    return now + ttl
+
 
 class NSEFetcher:
     """
@@ -17,11 +97,78 @@ class NSEFetcher:
     (Free alternative to paid NSE API)
     """
 
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            client: Shared HTTP client to use; one is built lazily if omitted
+        """
         self.base_url = "https://query1.finance.yahoo.com/v8/finance/chart/"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self._client: Optional[httpx.AsyncClient] = client
+        # Only close clients we created; a shared one belongs to the app
+        self._owns_client = client is None
+
+        # Short-lived caches of Yahoo responses, plus the requests in flight
+        # so concurrent misses for the same key share one upstream call
+        self._price_cache: TTLCache = TTLCache(maxsize=256, ttl=LIVE_PRICE_TTL)
+        self._ohlc_cache: TLRUCache = TLRUCache(maxsize=256, ttu=_ohlc_ttu)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def _cached(
+        self,
+        cache: Cache,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve from cache, or run one shared fetch for concurrent misses
+
+        Args:
+            cache: Cache holding results for this kind of request
+            key: Cache key
+            fetch: Coroutine function producing the value on a miss
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        inflight_key = (id(cache), key)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[inflight_key] = task
+
+            def _done(t: asyncio.Task):
+                self._inflight.pop(inflight_key, None)
+                if not t.cancelled() and t.exception() is None and t.result() is not None:
+                    cache[key] = t.result()
+
+            task.add_done_callback(_done)
+
+        return await asyncio.shield(task)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Keep-alive HTTP/2 client, created on first use"""
+        # Reused across symbols so a Nifty 50 fan-out shares pooled
+        # connections instead of opening one TLS session per request
+        if self._client is None or self._client.is_closed:
+            self._owns_client = True
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(10.0),
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=100,
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._client
 
     async def fetch_ohlc(
         self,
@@ -40,10 +187,43 @@ class NSEFetcher:
         Returns:
             List of OHLC dictionaries
         """
+        frame = await self.fetch_ohlc_df(symbol, interval, period)
+        return frame.to_dict('records')
+
+    async def fetch_ohlc_df(
+        self,
+        symbol: str,
+        interval: str = "1h",
+        period: str = "10d"
+    ) -> pd.DataFrame:
+        """
+        Fetch OHLC data from Yahoo Finance as a DataFrame
+
+        Args:
+            symbol: NSE symbol (e.g., "RELIANCE.NS", "TCS.NS", "INFY.NS")
+            interval: Candle interval (1m, 5m, 15m, 30m, 1h, 1d)
+            period: Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+
+        Returns:
+            DataFrame with time (datetime64[ns]) and float64 open/high/low/close/volume
+        """
         # Add .NS suffix for NSE stocks if not present
         if not symbol.endswith('.NS') and not symbol.endswith('.BO'):
             symbol = f"{symbol}.NS"
 
+        return await self._cached(
+            self._ohlc_cache,
+            (symbol, interval, period),
+            lambda: self._download_ohlc_df(symbol, interval, period)
+        )
+
+    async def _download_ohlc_df(
+        self,
+        symbol: str,
+        interval: str,
+        period: str
+    ) -> pd.DataFrame:
+        """Request and parse one Yahoo chart (uncached; see fetch_ohlc_df)"""
         url = f"{self.base_url}{symbol}"
         params = {
             'interval': interval,
@@ -51,63 +231,85 @@ class NSEFetcher:
             'includePrePost': 'false'
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await self.client.get(url, params=params, headers=self.headers)
+        response.raise_for_status()
 
-        # Parse Yahoo Finance response
-        chart_data = data['chart']['result'][0]
-        timestamps = chart_data['timestamp']
-        quotes = chart_data['indicators']['quote'][0]
+        # Only the NumPy columns outlive the parse; the raw body is released
+        # right after, so a large pull never holds body, dict tree and frame
+        # at the same time
+        timestamps, opens, highs, lows, closes, volumes = self._parse_chart(response.content)
+        del response
+
+        mask = ~(np.isnan(opens) | np.isnan(highs) | np.isnan(lows) | np.isnan(closes))
+
+        # One vectorized conversion to naive local time, matching the other
+        # ingestion paths (datetime.fromtimestamp semantics)
+        times = (
+            pd.to_datetime(timestamps[mask], unit='s', utc=True)
+            .tz_convert(tzlocal())
+            .tz_localize(None)
+        )
+
+        return pd.DataFrame({
+            'time': times,
+            'open': opens[mask],
+            'high': highs[mask],
+            'low': lows[mask],
+            'close': closes[mask],
+            'volume': volumes[mask]
+        })
+
+    @staticmethod
+    def _parse_chart(content: bytes) -> Tuple[np.ndarray, ...]:
+        """
+        Decode a Yahoo chart payload straight into NumPy columns
 
-        ohlc_data = []
-        for i in range(len(timestamps)):
-            # Skip if any value is None
-            if (quotes['open'][i] is None or
-                quotes['high'][i] is None or
-                quotes['low'][i] is None or
-                quotes['close'][i] is None):
-                continue
+        Args:
+            content: Raw response body
 
-            ohlc_data.append({
-                'time': datetime.fromtimestamp(timestamps[i]),
-                'open': float(quotes['open'][i]),
-                'high': float(quotes['high'][i]),
-                'low': float(quotes['low'][i]),
-                'close': float(quotes['close'][i]),
-                'volume': float(quotes['volume'][i] or 0)
-            })
+        Returns:
+            (timestamps, open, high, low, close, volume) arrays; missing
+            prices are NaN, missing volume is 0
+        """
+        chart_data = orjson.loads(content)['chart']['result'][0]
+        quotes = chart_data['indicators']['quote'][0]
 
-        return ohlc_data
+        # None becomes NaN, so incomplete candles can be dropped with one
+        # vectorized mask instead of per-row checks
+        return (
+            np.asarray(chart_data['timestamp'], dtype=np.int64),
+            np.asarray(quotes['open'], dtype=np.float64),
+            np.asarray(quotes['high'], dtype=np.float64),
+            np.asarray(quotes['low'], dtype=np.float64),
+            np.asarray(quotes['close'], dtype=np.float64),
+            np.nan_to_num(np.asarray(quotes['volume'], dtype=np.float64))
+        )
 
-    async def fetch_nse_top_stocks(self) -> List[str]:
+    async def fetch_nse_top_stocks(self) -> Tuple[str, ...]:
         """
-        Get list of popular NSE stocks (Nifty 50 components)
+        Get the NSE stocks to ingest (Nifty 50 components by default)
+
+        The universe file is re-read only when its mtime changes.
 
         Returns:
-            List of stock symbols with .NS suffix
-        """
-        nifty50_stocks = [
-            "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK",
-            "HINDUNILVR", "BHARTIARTL", "ITC", "SBIN", "KOTAKBANK",
-            "LT", "AXISBANK", "ASIANPAINT", "MARUTI", "BAJFINANCE",
-            "HCLTECH", "SUNPHARMA", "TITAN", "ULTRACEMCO", "NESTLEIND",
-            "WIPRO", "ADANIPORTS", "ONGC", "NTPC", "POWERGRID",
-            "TATASTEEL", "BAJAJFINSV", "M&M", "TECHM", "INDUSINDBK",
-            "JSWSTEEL", "HINDALCO", "DIVISLAB", "DRREDDY", "CIPLA",
-            "EICHERMOT", "BPCL", "COALINDIA", "GRASIM", "HEROMOTOCO",
-            "BRITANNIA", "SHREECEM", "UPL", "APOLLOHOSP", "TATAMOTORS",
-            "SBILIFE", "BAJAJ-AUTO", "HDFCLIFE", "TATACONSUM", "ADANIENT"
-        ]
-
-        return [f"{stock}.NS" for stock in nifty50_stocks]
+            Stock symbols with .NS suffix
+        """
+        global NIFTY50_NS
+        if _universe_file_mtime() != _universe_mtime:
+            NIFTY50_NS = _load_universe()
+            logger.info("NSE universe reloaded: %d symbols", len(NIFTY50_NS))
+        return NIFTY50_NS
+
+    @staticmethod
+    def _storage_symbol(symbol: str) -> str:
+        """Remove .NS/.BO suffix for storage (cleaner symbol names)"""
+        return symbol.replace('.NS', '').replace('.BO', '')
 
     async def store_to_database(
         self,
         symbol: str,
         timeframe: str,
-        ohlc_data: List[Dict[str, Any]]
+        ohlc_data: Union[pd.DataFrame, List[Dict[str, Any]]]
     ):
         """
         Store fetched OHLC data to TimescaleDB
@@ -115,10 +317,9 @@ class NSEFetcher:
         Args:
             symbol: Stock symbol (with .NS suffix)
             timeframe: Timeframe (1h, 1d, etc.)
-            ohlc_data: List of OHLC dictionaries
+            ohlc_data: OHLC DataFrame or list of OHLC dictionaries
         """
-        # Remove .NS/.BO suffix for storage (cleaner symbol names)
-        clean_symbol = symbol.replace('.NS', '').replace('.BO', '')
+        clean_symbol = self._storage_symbol(symbol)
 
         await OHLCRepository.insert_ohlc_data(
             symbol=clean_symbol,
@@ -126,13 +327,14 @@ class NSEFetcher:
             data=ohlc_data
         )
 
-        print(f"[OK] Stored {len(ohlc_data)} candles for {clean_symbol} ({timeframe})")
+        logger.info("Stored %d candles for %s (%s)", len(ohlc_data), clean_symbol, timeframe)
 
     async def fetch_and_store_multiple(
         self,
         symbols: List[str],
         interval: str = "1h",
-        period: str = "10d"
+        period: str = "10d",
+        concurrency: int = 8
     ):
         """
         Fetch and store data for multiple symbols in parallel
@@ -141,39 +343,58 @@ class NSEFetcher:
             symbols: List of stock symbols
             interval: Candle interval
             period: Time period
+            concurrency: Max Yahoo requests in flight, to stay under its rate limit
         """
+        sem = asyncio.Semaphore(concurrency)
+
         tasks = []
         for symbol in symbols:
-            task = self._fetch_and_store_single(symbol, interval, period)
+            task = self._fetch_single(symbol, interval, period, sem)
             tasks.append(task)
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
+        # Write every fetched symbol with one COPY in one transaction
+        frames = {
+            clean_symbol: frame
+            for clean_symbol, frame in (r for r in results if not isinstance(r, Exception))
+            if len(frame)
+        }
+        stored = await OHLCRepository.bulk_insert_many(interval, frames)
+
         # Count successes and failures
         success_count = sum(1 for r in results if not isinstance(r, Exception))
         failure_count = len(results) - success_count
 
-        print(f"\n[INGESTION] Complete:")
-        print(f"   [OK] Success: {success_count}/{len(symbols)}")
-        print(f"   [ERROR] Failed: {failure_count}/{len(symbols)}")
+        logger.info(
+            "Ingestion complete: %d/%d succeeded, %d failed, %d candles stored (%s)",
+            success_count, len(symbols), failure_count, stored, interval
+        )
 
-    async def _fetch_and_store_single(
+    async def _fetch_single(
         self,
         symbol: str,
         interval: str,
-        period: str
-    ):
-        """Helper method to fetch and store single symbol"""
+        period: str,
+        sem: asyncio.Semaphore
+    ) -> Tuple[str, pd.DataFrame]:
+        """
+        Helper method to fetch a single symbol for batch storage
+
+        Returns:
+            (storage symbol, OHLC DataFrame)
+        """
         try:
-            ohlc_data = await self.fetch_ohlc(symbol, interval, period)
+            async with sem:
+                ohlc_data = await self.fetch_ohlc_df(symbol, interval, period)
 
-            if ohlc_data:
-                await self.store_to_database(symbol, interval, ohlc_data)
-            else:
-                print(f"[WARNING] No data found for {symbol}")
+            if not len(ohlc_data):
+                logger.warning("No data found for %s", symbol)
+
+            return self._storage_symbol(symbol), ohlc_data
 
         except Exception as e:
-            print(f"[ERROR] Error fetching {symbol}: {str(e)}")
+            logger.error("Error fetching %s: %s", symbol, e)
             raise
 
     async def get_live_price(self, symbol: str) -> Optional[float]:
@@ -186,21 +407,28 @@ class NSEFetcher:
         Returns:
             Current price or None
         """
-        try:
-            # Add .NS if not present
-            if not symbol.endswith('.NS') and not symbol.endswith('.BO'):
-                symbol = f"{symbol}.NS"
+        # Add .NS if not present
+        if not symbol.endswith('.NS') and not symbol.endswith('.BO'):
+            symbol = f"{symbol}.NS"
+
+        return await self._cached(
+            self._price_cache,
+            symbol,
+            lambda: self._download_live_price(symbol)
+        )
 
+    async def _download_live_price(self, symbol: str) -> Optional[float]:
+        """Request the latest 1m close (uncached; see get_live_price)"""
+        try:
             url = f"{self.base_url}{symbol}"
             params = {
                 'interval': '1m',
                 'range': '1d'
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(url, params=params, headers=self.headers)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
 
             # Get latest price
             quotes = data['chart']['result'][0]['indicators']['quote'][0]
@@ -209,9 +437,15 @@ class NSEFetcher:
             return float(latest_close) if latest_close else None
 
         except Exception as e:
-            print(f"Error fetching live price for {symbol}: {e}")
+            logger.error("Error fetching live price for %s: %s", symbol, e)
             return None
 
+    async def close(self):
+        """Close HTTP client if owned, and drop it (safe to call more than once)"""
+        client, self._client = self._client, None
+        if client is not None and self._owns_client:
+            await client.aclose()
+
 
 # Example usage for testing
 async def main():
@@ -227,6 +461,8 @@ async def main():
     live_price = await fetcher.get_live_price("RELIANCE")
     print(f"[PRICE] RELIANCE live price: Rs.{live_price}")
 
+    await fetcher.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Minimal asyncio job loops for the data schedulers
+Each job runs as a plain task on the app's event loop (no scheduler thread)
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+async def _run_job(job: Job):
+    """Run a job, logging instead of propagating errors so its loop survives"""
+    try:
+        await job()
+    except Exception as e:
+        logger.error("Scheduled job %s failed: %s", job.__name__, e)
+
+
+async def run_every(interval_seconds: float, job: Job):
+    """
+    Run a job every interval, first run one interval from now
+
+    Runs are anchored to the loop clock, so time spent inside the job does
+    not push later runs back.
+
+    Args:
+        interval_seconds: Seconds between runs
+        job: Coroutine function to call
+    """
+    loop = asyncio.get_running_loop()
+    next_run = loop.time() + interval_seconds
+
+    while True:
+        await asyncio.sleep(max(0.0, next_run - loop.time()))
+        await _run_job(job)
+
+        # Skip runs missed while the job overran instead of firing them back to back
+        now = loop.time()
+        next_run += interval_seconds
+        if next_run <= now:
+            next_run += ((now - next_run) // interval_seconds + 1) * interval_seconds
+
+
+def next_run_time(
+    now: datetime,
+    hours: Iterable[int],
+    minute: int,
+    weekdays: Optional[Iterable[int]] = None
+) -> datetime:
+    """
+    Next wall-clock time matching a cron-style hour/minute/weekday rule
+
+    Args:
+        now: Current local time
+        hours: Hours of the day to fire at
+        minute: Minute of the hour to fire at
+        weekdays: Allowed days (0=Monday); None allows every day
+
+    Returns:
+        Earliest matching time strictly after now
+    """
+    hours = sorted(set(hours))
+    days = set(weekdays) if weekdays is not None else None
+
+    for day_offset in range(8):
+        day = (now + timedelta(days=day_offset)).date()
+        if days is not None and day.weekday() not in days:
+            continue
+        for hour in hours:
+            candidate = datetime(day.year, day.month, day.day, hour, minute)
+            if candidate > now:
+                return candidate
+
+    raise ValueError("Schedule never matches")
+
+
+async def run_daily_at(
+    hours: Iterable[int],
+    minute: int,
+    job: Job,
+    weekdays: Optional[Iterable[int]] = None
+):
+    """
+    Run a job at fixed local times of day
+
+    Args:
+        hours: Hours of the day to fire at
+        minute: Minute of the hour to fire at
+        job: Coroutine function to call
+        weekdays: Allowed days (0=Monday); None allows every day
+    """
+    hours = list(hours)
+    weekdays = list(weekdays) if weekdays is not None else None
+    last_run = datetime.min
+
+    while True:
+        # Timers may wake a hair early; never schedule the same slot twice
+        now = max(datetime.now(), last_run)
+        last_run = next_run_time(now, hours, minute, weekdays)
+        await asyncio.sleep((last_run - datetime.now()).total_seconds())
+        await _run_job(job)
@@ -1,6 +1,8 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import sys
 import uvicorn
 
 # Import controllers
@@ -10,9 +12,14 @@ from controllers.chat_controller import router as chat_router
 # Import services and database
 from models.database import db
 from services.cache_service import cache_service
+from services.market_data_service import warm_up_indicator_kernels
 from mcp_server.client import mcp_client
 from config.settings import settings
+from config.logging_config import setup_logging
 from data_ingestion.crypto_scheduler import crypto_scheduler
+from data_ingestion.binance_fetcher import binance_fetcher
+from agents.orchestrator import OrchestratorAgent
+from utils.http_client import create_http_client
 
 
 @asynccontextmanager
@@ -22,6 +29,7 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("Starting TradeSmart.AI Backend...")
+    log_listener = setup_logging()
 
     # Connect to database
     try:
@@ -44,6 +52,21 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"[WARNING] MCP connection failed: {e} (Will fix MCP server API later)")
 
+    # One outbound HTTP pool shared by every fetcher
+    app.state.http_client = create_http_client()
+    await binance_fetcher.use_client(app.state.http_client)
+
+    # One orchestrator (and its agents) shared by every controller
+    app.state.orchestrator = OrchestratorAgent()
+    print("[OK] AI agents initialized")
+
+    # Compile the numba indicator kernels before the first request needs them
+    try:
+        warm_up_indicator_kernels()
+        print("[OK] Indicator kernels ready")
+    except Exception as e:
+        print(f"[WARNING] Indicator kernel warm-up failed: {e}")
+
     print(f"[OK] Backend running on port {settings.backend_port}")
     print(f"[OK] CORS enabled for: {settings.frontend_url}")
 
@@ -66,6 +89,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"[ERROR] Crypto scheduler stop failed: {e}")
 
+    try:
+        await binance_fetcher.close()
+        await app.state.http_client.aclose()
+        print("[OK] HTTP client closed")
+    except Exception as e:
+        print(f"[ERROR] HTTP client close failed: {e}")
+
     # Disconnect from services
     try:
         await db.disconnect()
@@ -86,6 +116,7 @@ async def lifespan(app: FastAPI):
         print(f"[ERROR] MCP disconnect failed: {e}")
 
     print("[OK] Shutdown complete")
+    log_listener.stop()
 
 
 # Create FastAPI app
@@ -93,13 +124,15 @@ app = FastAPI(
     title="TradeSmart.AI API",
     description="AI-powered trading strategy builder using Cerebras LLMs and MCP",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[settings.frontend_url, "http://localhost:3000", "*"],  # Update in production
+    # Explicit origins only: a "*" entry is invalid alongside credentials
+    allow_origins=list(dict.fromkeys([settings.frontend_url, "http://localhost:3000"])),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -140,7 +173,7 @@ async def health_check():
             "api": "operational",
             "database": "connected" if db.pool else "disconnected",
             "cache": "connected" if cache_service.redis_client else "disconnected",
-            "mcp": "connected" if mcp_client.session else "disconnected"
+            "mcp": "connected" if await mcp_client.ping() else "disconnected"
         }
     }
 
@@ -165,5 +198,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=settings.backend_port,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # uvloop is not available on Windows; fall back to asyncio there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools"
     )
@@ -1,7 +1,32 @@
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from typing import Any, Dict, Optional, List
-import json
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Optional, List, Tuple
+from cachetools import TLRUCache
+from services.cache_service import cache_service
+from utils.helpers import timeframe_to_seconds
+import anyio
+import asyncio
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def _result_ttu(key: str, value: Tuple[int, Any], now: float) -> float:
+    """Expiry for a cached tool result stored as (ttl, result)"""
+    return now + value[0]
+
+
+# Transport failures meaning the stdio server is gone and a fresh session is needed
+_TRANSPORT_ERRORS = (
+    BrokenPipeError,
+    ConnectionError,
+    EOFError,
+    anyio.BrokenResourceError,
+    anyio.ClosedResourceError,
+    anyio.EndOfStream,
+)
 
 
 class MCPClient:
@@ -11,36 +36,119 @@ class MCPClient:
         self.session: Optional[ClientSession] = None
         self.read = None
         self.write = None
-        self.context = None
+        # Owns the stdio transport and session so they close together
+        self._exit_stack: Optional[AsyncExitStack] = None
+        # Serializes (re)connects so concurrent callers spawn one server
+        self._connect_lock = asyncio.Lock()
+
+        # Process-local cache for read-only tools: key -> (ttl, result), each
+        # entry expiring after its own ttl; bounded so old keys are evicted
+        self._cache: TLRUCache = TLRUCache(maxsize=1024, ttu=_result_ttu)
+        # Calls in flight per cache key, so concurrent misses share one
+        self._inflight: Dict[str, asyncio.Task] = {}
 
     async def connect(self):
-        """Connect to MCP server"""
+        """
+        Connect to MCP server
+
+        All tool calls share this one session; concurrent requests are
+        multiplexed over the same stdio stream by request id. Calling
+        connect() again while connected reuses the existing session
+        instead of spawning another server process.
+        """
+        if self.session:
+            return
+
         server_params = StdioServerParameters(
             command="python",
             args=["mcp_server/server_simple.py"],
             env=None
         )
 
-        self.context = stdio_client(server_params)
-        self.read, self.write = await self.context.__aenter__()
+        exit_stack = AsyncExitStack()
+        try:
+            self.read, self.write = await exit_stack.enter_async_context(
+                stdio_client(server_params)
+            )
+            session = await exit_stack.enter_async_context(
+                ClientSession(self.read, self.write)
+            )
 
-        session_context = ClientSession(self.read, self.write)
-        self.session = await session_context.__aenter__()
+            # Initialize the session
+            await session.initialize()
+        except Exception:
+            await exit_stack.aclose()
+            raise
 
-        # Initialize the session
-        await self.session.initialize()
+        self._exit_stack = exit_stack
+        self.session = session
 
     async def disconnect(self):
         """Disconnect from MCP server"""
-        if self.session:
-            await self.session.__aexit__(None, None, None)
-        if self.context:
-            await self.context.__aexit__(None, None, None)
+        exit_stack, self._exit_stack = self._exit_stack, None
+        self.session = None
+        if exit_stack:
+            await exit_stack.aclose()
+
+    async def _ensure_session(self) -> ClientSession:
+        """
+        Return the live session, connecting first if there is none
+
+        Lets the client recover on its own when the startup connect failed
+        or the server process died.
+
+        Returns:
+            Connected session
+        """
+        session = self.session
+        if session is not None:
+            return session
+
+        async with self._connect_lock:
+            if self.session is None:
+                await self.connect()
+            return self.session
+
+    async def _drop_session(self, session: ClientSession):
+        """Tear down a broken session, unless another caller already replaced it"""
+        async with self._connect_lock:
+            if self.session is session:
+                try:
+                    await self.disconnect()
+                except Exception as e:
+                    logger.warning("MCP disconnect after transport error failed: %s", e)
+
+    async def ping(self, timeout: float = 2.0) -> bool:
+        """
+        Check that the current session answers
+
+        A dead session is dropped so the next tool call reconnects. This
+        never spawns a server itself.
+
+        Args:
+            timeout: Seconds to wait for the pong
+
+        Returns:
+            True if the server responded
+        """
+        session = self.session
+        if session is None:
+            return False
+
+        try:
+            await asyncio.wait_for(session.send_ping(), timeout)
+            return True
+        except (asyncio.TimeoutError, *_TRANSPORT_ERRORS):
+            await self._drop_session(session)
+            return False
 
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """
         Call an MCP tool
 
+        Connects on demand, and reconnects and retries once if the stdio
+        transport turns out to be broken.
+
         Args:
             tool_name: Name of the tool to call
             arguments: Tool arguments
@@ -48,59 +156,142 @@ class MCPClient:
         Returns:
             Tool result (parsed from JSON if possible)
         """
-        if not self.session:
-            raise RuntimeError("MCP client not connected. Call connect() first.")
-
-        result = await self.session.call_tool(tool_name, arguments)
+        session = await self._ensure_session()
+        try:
+            result = await session.call_tool(tool_name, arguments)
+        except _TRANSPORT_ERRORS as e:
+            logger.warning("MCP transport error (%r), reconnecting", e)
+            await self._drop_session(session)
+            session = await self._ensure_session()
+            result = await session.call_tool(tool_name, arguments)
 
         # Extract text content from result
         if result.content and len(result.content) > 0:
             text_content = result.content[0].text
             try:
-                return json.loads(text_content)
-            except json.JSONDecodeError:
+                return orjson.loads(text_content)
+            except orjson.JSONDecodeError:
                 return text_content
 
         return None
 
+    async def _cached_call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        ttl: int,
+        force_refresh: bool = False
+    ) -> Any:
+        """
+        Call a read-only MCP tool through a TTL cache
+
+        Results are kept in process memory and mirrored to Redis so other
+        workers can reuse them. Concurrent callers for the same key wait on
+        a single in-flight tool call instead of each issuing their own.
+
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Tool arguments (also used to build the cache key)
+            ttl: Cache lifetime in seconds
+            force_refresh: Skip cached results and refetch
+
+        Returns:
+            Tool result
+        """
+        key = f"mcp:{tool_name}:" + ":".join(str(v) for v in arguments.values())
+
+        if not force_refresh:
+            entry = self._cache.get(key)
+            if entry is not None:
+                return entry[1]
+
+        # A forced refresh never joins a call that may be served from Redis
+        task = None if force_refresh else self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._fill_cache(key, tool_name, arguments, ttl, force_refresh)
+            )
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Task):
+                if self._inflight.get(key) is t:
+                    del self._inflight[key]
+
+            task.add_done_callback(_done)
+
+        return await asyncio.shield(task)
+
+    async def _fill_cache(
+        self,
+        key: str,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        ttl: int,
+        force_refresh: bool
+    ) -> Any:
+        """Resolve one cache miss from Redis or the tool, filling both tiers"""
+        if not force_refresh:
+            cached = await cache_service.get(key)
+            if cached is not None:
+                self._cache[key] = (ttl, cached)
+                return cached
+
+        # Ask the server to skip its per-candle result cache too; the flag is
+        # kept out of the arguments so it never changes the cache key
+        result = await self.call_tool(
+            tool_name, {**arguments, "refresh": True} if force_refresh else arguments
+        )
+
+        # Only cache successful tool responses
+        if isinstance(result, dict) and result.get("success"):
+            self._cache[key] = (ttl, result)
+            await cache_service.set(key, result, expiration=ttl)
+
+        return result
+
     async def get_ohlc_data(
         self,
         symbol: str,
         timeframe: str = "1h",
-        limit: int = 240
+        limit: int = 240,
+        force_refresh: bool = False,
+        format: str = "records"
     ) -> Dict[str, Any]:
-        """Fetch OHLC data via MCP"""
-        return await self.call_tool("get_ohlc_data", {
+        """Fetch OHLC data via MCP (cached for one candle); see get_ohlc_data_tool for formats"""
+        return await self._cached_call_tool("get_ohlc_data", {
             "symbol": symbol,
             "timeframe": timeframe,
-            "limit": limit
-        })
+            "limit": limit,
+            "format": format
+        }, ttl=timeframe_to_seconds(timeframe), force_refresh=force_refresh)
 
     async def calculate_indicators(
         self,
         symbol: str,
         timeframe: str = "1h",
-        limit: int = 240
+        limit: int = 240,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
-        """Calculate technical indicators via MCP"""
-        return await self.call_tool("calculate_indicators", {
+        """Calculate technical indicators via MCP (cached for one candle)"""
+        return await self._cached_call_tool("calculate_indicators", {
             "symbol": symbol,
             "timeframe": timeframe,
             "limit": limit
-        })
+        }, ttl=timeframe_to_seconds(timeframe), force_refresh=force_refresh)
 
     async def detect_liquidation_levels(
         self,
         symbol: str,
         timeframe: str = "1h",
-        lookback_periods: int = 240
+        lookback_periods: int = 240,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
-        """Detect liquidation levels via MCP"""
-        return await self.call_tool("detect_liquidation_levels", {
+        """Detect liquidation levels via MCP (cached for one candle)"""
+        return await self._cached_call_tool("detect_liquidation_levels", {
             "symbol": symbol,
             "timeframe": timeframe,
             "lookback_periods": lookback_periods
-        })
+        }, ttl=timeframe_to_seconds(timeframe), force_refresh=force_refresh)
 
     async def create_chart_annotation(
         self,
@@ -159,10 +350,8 @@ class MCPClient:
 
     async def list_tools(self) -> List[Dict[str, Any]]:
         """List all available MCP tools"""
-        if not self.session:
-            raise RuntimeError("MCP client not connected. Call connect() first.")
-
-        tools = await self.session.list_tools()
+        session = await self._ensure_session()
+        tools = await session.list_tools()
         return [{"name": tool.name, "description": tool.description} for tool in tools.tools]
 
 
@@ -9,9 +9,21 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import all MCP tools
-from mcp_server.tools.ohlc_tool import get_ohlc_data_tool, TOOL_METADATA as OHLC_METADATA
-from mcp_server.tools.indicator_tool import calculate_indicators_tool, TOOL_METADATA as INDICATOR_METADATA
-from mcp_server.tools.liquidation_tool import detect_liquidation_levels_tool, TOOL_METADATA as LIQUIDATION_METADATA
+from mcp_server.tools.ohlc_tool import (
+    get_ohlc_data_tool,
+    get_ohlc_data_batch_tool,
+    TOOL_METADATA as OHLC_METADATA
+)
+from mcp_server.tools.indicator_tool import (
+    calculate_indicators_tool,
+    calculate_indicators_batch_tool,
+    TOOL_METADATA as INDICATOR_METADATA
+)
+from mcp_server.tools.liquidation_tool import (
+    detect_liquidation_levels_tool,
+    detect_liquidation_levels_batch_tool,
+    TOOL_METADATA as LIQUIDATION_METADATA
+)
 from mcp_server.tools.annotation_tool import (
     create_chart_annotation_tool,
     create_liquidation_zone_tool,
@@ -35,30 +47,34 @@ def create_mcp_server() -> Server:
     async def get_ohlc_data(
         symbol: str,
         timeframe: str = "1h",
-        limit: int = 240
+        limit: int = 240,
+        format: str = "records",
+        refresh: bool = False
     ) -> str:
         """Fetch OHLC data from TimescaleDB"""
-        return await get_ohlc_data_tool(symbol, timeframe, limit)
+        return await get_ohlc_data_tool(symbol, timeframe, limit, format, refresh)
 
     # Register Tool 2: Calculate Indicators
     @app.tool()
     async def calculate_indicators(
         symbol: str,
         timeframe: str = "1h",
-        limit: int = 240
+        limit: int = 240,
+        refresh: bool = False
     ) -> str:
         """Calculate technical indicators (RSI, MACD, EMA)"""
-        return await calculate_indicators_tool(symbol, timeframe, limit)
+        return await calculate_indicators_tool(symbol, timeframe, limit, refresh)
 
     # Register Tool 3: Detect Liquidation Levels
     @app.tool()
     async def detect_liquidation_levels(
         symbol: str,
         timeframe: str = "1h",
-        lookback_periods: int = 240
+        lookback_periods: int = 240,
+        refresh: bool = False
     ) -> str:
         """Detect liquidation levels and support/resistance zones"""
-        return await detect_liquidation_levels_tool(symbol, timeframe, lookback_periods)
+        return await detect_liquidation_levels_tool(symbol, timeframe, lookback_periods, refresh)
 
     # Register Tool 4: Create Chart Annotation
     @app.tool()
@@ -104,6 +120,35 @@ def create_mcp_server() -> Server:
             prompt, symbol, timeframe, liquidation_analysis, indicator_analysis
         )
 
+    # Register batch variants: one call fans out over several symbols
+    @app.tool()
+    async def get_ohlc_data_batch(
+        symbols: list,
+        timeframe: str = "1h",
+        limit: int = 240,
+        format: str = "records"
+    ) -> str:
+        """Fetch OHLC data for several symbols"""
+        return await get_ohlc_data_batch_tool(symbols, timeframe, limit, format)
+
+    @app.tool()
+    async def calculate_indicators_batch(
+        symbols: list,
+        timeframe: str = "1h",
+        limit: int = 240
+    ) -> str:
+        """Calculate technical indicators for several symbols"""
+        return await calculate_indicators_batch_tool(symbols, timeframe, limit)
+
+    @app.tool()
+    async def detect_liquidation_levels_batch(
+        symbols: list,
+        timeframe: str = "1h",
+        lookback_periods: int = 240
+    ) -> str:
+        """Detect liquidation levels for several symbols"""
+        return await detect_liquidation_levels_batch_tool(symbols, timeframe, lookback_periods)
+
     return app
 
 
@@ -4,16 +4,30 @@ Compatible with mcp library 1.12.4+
 """
 from mcp.server import Server
 from mcp import types
-import json
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from jsonschema import Draft202012Validator
+import orjson
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from mcp_server.tools.ohlc_tool import get_ohlc_data_tool
-from mcp_server.tools.indicator_tool import calculate_indicators_tool
-from mcp_server.tools.liquidation_tool import detect_liquidation_levels_tool
+from mcp_server.tools.ohlc_tool import (
+    get_ohlc_data_tool,
+    get_ohlc_data_batch_tool,
+    BATCH_TOOL_METADATA as OHLC_BATCH_METADATA
+)
+from mcp_server.tools.indicator_tool import (
+    calculate_indicators_tool,
+    calculate_indicators_batch_tool,
+    BATCH_TOOL_METADATA as INDICATOR_BATCH_METADATA
+)
+from mcp_server.tools.liquidation_tool import (
+    detect_liquidation_levels_tool,
+    detect_liquidation_levels_batch_tool,
+    BATCH_TOOL_METADATA as LIQUIDATION_BATCH_METADATA
+)
 from mcp_server.tools.annotation_tool import create_chart_annotation_tool, create_liquidation_zone_tool
 from mcp_server.tools.strategy_tool import generate_strategy_tool
 
@@ -22,158 +36,196 @@ from mcp_server.tools.strategy_tool import generate_strategy_tool
 server = Server("tradesmart-mcp")
 
 
+# Tool definitions, built once at import and served by list_tools
+TOOLS: List[types.Tool] = [
+    types.Tool(
+        name="get_ohlc_data",
+        description="Fetch OHLC (Open, High, Low, Close) data from database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string", "description": "Stock symbol (e.g., RELIANCE, TCS)"},
+                "timeframe": {"type": "string", "description": "Timeframe (1m, 5m, 15m, 1h, 4h, 1d)", "default": "1h"},
+                "limit": {"type": "integer", "description": "Number of candles to fetch", "default": 240},
+                "format": {"type": "string", "enum": ["records", "columns"], "description": "records (one object per candle) or columns (one array per field)", "default": "records"},
+                "refresh": {"type": "boolean", "description": "Bypass the per-candle result cache", "default": False}
+            },
+            "required": ["symbol"]
+        }
+    ),
+    types.Tool(
+        name="calculate_indicators",
+        description="Calculate technical indicators (RSI, MACD, EMA)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string"},
+                "timeframe": {"type": "string", "default": "1h"},
+                "limit": {"type": "integer", "default": 240},
+                "refresh": {"type": "boolean", "description": "Bypass the per-candle result cache", "default": False}
+            },
+            "required": ["symbol"]
+        }
+    ),
+    types.Tool(
+        name="detect_liquidation_levels",
+        description="Detect support/resistance and liquidation zones",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string"},
+                "timeframe": {"type": "string", "default": "1h"},
+                "lookback_periods": {"type": "integer", "default": 240},
+                "refresh": {"type": "boolean", "description": "Bypass the per-candle result cache", "default": False}
+            },
+            "required": ["symbol"]
+        }
+    ),
+    types.Tool(
+        name="create_chart_annotation",
+        description="Create chart annotation (rectangle, line, arrow, text)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string"},
+                "annotation_type": {"type": "string"},
+                "coordinates": {"type": "object"},
+                "style": {"type": "object"},
+                "label": {"type": "string"}
+            },
+            "required": ["symbol", "annotation_type", "coordinates", "style", "label"]
+        }
+    ),
+    types.Tool(
+        name="create_liquidation_zone",
+        description="Create liquidation zone rectangle annotation",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string"},
+                "start_price": {"type": "number"},
+                "end_price": {"type": "number"},
+                "start_time": {"type": "integer"},
+                "end_time": {"type": "integer"},
+                "label": {"type": "string", "default": "Liquidation Zone"},
+                "strength": {"type": "string", "default": "medium"}
+            },
+            "required": ["symbol", "start_price", "end_price", "start_time", "end_time"]
+        }
+    ),
+    types.Tool(
+        name="generate_strategy",
+        description="Generate trading strategy from analyses",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "prompt": {"type": "string"},
+                "symbol": {"type": "string"},
+                "timeframe": {"type": "string"},
+                "liquidation_analysis": {"type": "object"},
+                "indicator_analysis": {"type": "object"}
+            },
+            "required": ["prompt", "symbol", "timeframe", "liquidation_analysis", "indicator_analysis"]
+        }
+    ),
+    *(
+        types.Tool(**metadata)
+        for metadata in (OHLC_BATCH_METADATA, INDICATOR_BATCH_METADATA, LIQUIDATION_BATCH_METADATA)
+    )
+]
+
+# One validator per tool, compiled once. The SDK's built-in check would run
+# jsonschema.validate, which re-checks the schema itself, on every call.
+VALIDATORS: Dict[str, Draft202012Validator] = {
+    tool.name: Draft202012Validator(tool.inputSchema) for tool in TOOLS
+}
+
+
 # Register list_tools handler
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List all available tools"""
-    return [
-        types.Tool(
-            name="get_ohlc_data",
-            description="Fetch OHLC (Open, High, Low, Close) data from database",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string", "description": "Stock symbol (e.g., RELIANCE, TCS)"},
-                    "timeframe": {"type": "string", "description": "Timeframe (1m, 5m, 15m, 1h, 4h, 1d)", "default": "1h"},
-                    "limit": {"type": "integer", "description": "Number of candles to fetch", "default": 240}
-                },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="calculate_indicators",
-            description="Calculate technical indicators (RSI, MACD, EMA)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "timeframe": {"type": "string", "default": "1h"},
-                    "limit": {"type": "integer", "default": 240}
-                },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="detect_liquidation_levels",
-            description="Detect support/resistance and liquidation zones",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "timeframe": {"type": "string", "default": "1h"},
-                    "lookback_periods": {"type": "integer", "default": 240}
-                },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="create_chart_annotation",
-            description="Create chart annotation (rectangle, line, arrow, text)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "annotation_type": {"type": "string"},
-                    "coordinates": {"type": "object"},
-                    "style": {"type": "object"},
-                    "label": {"type": "string"}
-                },
-                "required": ["symbol", "annotation_type", "coordinates", "style", "label"]
-            }
-        ),
-        types.Tool(
-            name="create_liquidation_zone",
-            description="Create liquidation zone rectangle annotation",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "start_price": {"type": "number"},
-                    "end_price": {"type": "number"},
-                    "start_time": {"type": "integer"},
-                    "end_time": {"type": "integer"},
-                    "label": {"type": "string", "default": "Liquidation Zone"},
-                    "strength": {"type": "string", "default": "medium"}
-                },
-                "required": ["symbol", "start_price", "end_price", "start_time", "end_time"]
-            }
-        ),
-        types.Tool(
-            name="generate_strategy",
-            description="Generate trading strategy from analyses",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "prompt": {"type": "string"},
-                    "symbol": {"type": "string"},
-                    "timeframe": {"type": "string"},
-                    "liquidation_analysis": {"type": "object"},
-                    "indicator_analysis": {"type": "object"}
-                },
-                "required": ["prompt", "symbol", "timeframe", "liquidation_analysis", "indicator_analysis"]
-            }
-        )
-    ]
+    return TOOLS
+
+
+# Tool name -> (handler, {argument: default}); built once at import so a
+# call is one dict lookup instead of a chain of name comparisons
+DISPATCH: Dict[str, Tuple[Callable[..., Awaitable[Any]], Dict[str, Any]]] = {
+    "get_ohlc_data": (
+        get_ohlc_data_tool,
+        {"symbol": None, "timeframe": "1h", "limit": 240, "format": "records", "refresh": False}
+    ),
+    "get_ohlc_data_batch": (
+        get_ohlc_data_batch_tool,
+        {"symbols": None, "timeframe": "1h", "limit": 240, "format": "records"}
+    ),
+    "calculate_indicators": (
+        calculate_indicators_tool,
+        {"symbol": None, "timeframe": "1h", "limit": 240, "refresh": False}
+    ),
+    "calculate_indicators_batch": (
+        calculate_indicators_batch_tool,
+        {"symbols": None, "timeframe": "1h", "limit": 240}
+    ),
+    "detect_liquidation_levels": (
+        detect_liquidation_levels_tool,
+        {"symbol": None, "timeframe": "1h", "lookback_periods": 240, "refresh": False}
+    ),
+    "detect_liquidation_levels_batch": (
+        detect_liquidation_levels_batch_tool,
+        {"symbols": None, "timeframe": "1h", "lookback_periods": 240}
+    ),
+    "create_chart_annotation": (
+        create_chart_annotation_tool,
+        {"symbol": None, "annotation_type": None, "coordinates": None, "style": None, "label": None}
+    ),
+    "create_liquidation_zone": (
+        create_liquidation_zone_tool,
+        {
+            "symbol": None,
+            "start_price": None,
+            "end_price": None,
+            "start_time": None,
+            "end_time": None,
+            "label": "Liquidation Zone",
+            "strength": "medium"
+        }
+    ),
+    "generate_strategy": (
+        generate_strategy_tool,
+        {
+            "prompt": None,
+            "symbol": None,
+            "timeframe": None,
+            "liquidation_analysis": None,
+            "indicator_analysis": None
+        }
+    ),
+}
 
 
 # Register call_tool handler
-@server.call_tool()
+@server.call_tool(validate_input=False)
 async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Handle tool calls"""
 
-    result = None
-
-    if name == "get_ohlc_data":
-        result = await get_ohlc_data_tool(
-            symbol=arguments.get("symbol"),
-            timeframe=arguments.get("timeframe", "1h"),
-            limit=arguments.get("limit", 240)
-        )
-    elif name == "calculate_indicators":
-        result = await calculate_indicators_tool(
-            symbol=arguments.get("symbol"),
-            timeframe=arguments.get("timeframe", "1h"),
-            limit=arguments.get("limit", 240)
-        )
-    elif name == "detect_liquidation_levels":
-        result = await detect_liquidation_levels_tool(
-            symbol=arguments.get("symbol"),
-            timeframe=arguments.get("timeframe", "1h"),
-            lookback_periods=arguments.get("lookback_periods", 240)
-        )
-    elif name == "create_chart_annotation":
-        result = await create_chart_annotation_tool(
-            symbol=arguments.get("symbol"),
-            annotation_type=arguments.get("annotation_type"),
-            coordinates=arguments.get("coordinates"),
-            style=arguments.get("style"),
-            label=arguments.get("label")
-        )
-    elif name == "create_liquidation_zone":
-        result = await create_liquidation_zone_tool(
-            symbol=arguments.get("symbol"),
-            start_price=arguments.get("start_price"),
-            end_price=arguments.get("end_price"),
-            start_time=arguments.get("start_time"),
-            end_time=arguments.get("end_time"),
-            label=arguments.get("label", "Liquidation Zone"),
-            strength=arguments.get("strength", "medium")
-        )
-    elif name == "generate_strategy":
-        result = await generate_strategy_tool(
-            prompt=arguments.get("prompt"),
-            symbol=arguments.get("symbol"),
-            timeframe=arguments.get("timeframe"),
-            liquidation_analysis=arguments.get("liquidation_analysis"),
-            indicator_analysis=arguments.get("indicator_analysis")
-        )
-    else:
+    entry = DISPATCH.get(name)
+    if entry is None:
         raise ValueError(f"Unknown tool: {name}")
 
+    error = next(VALIDATORS[name].iter_errors(arguments or {}), None)
+    if error is not None:
+        raise ValueError(f"Invalid arguments for {name}: {error.message}")
+
+    handler, defaults = entry
+    result = await handler(**{
+        key: arguments.get(key, default) for key, default in defaults.items()
+    })
+
     # Return result as TextContent
     return [types.TextContent(
         type="text",
-        text=json.dumps(result) if isinstance(result, dict) else str(result)
+        text=orjson.dumps(result, default=str).decode() if isinstance(result, dict) else str(result)
     )]
 
 
@@ -1,13 +1,16 @@
-from .ohlc_tool import get_ohlc_data_tool
-from .indicator_tool import calculate_indicators_tool
-from .liquidation_tool import detect_liquidation_levels_tool
+from .ohlc_tool import get_ohlc_data_tool, get_ohlc_data_batch_tool
+from .indicator_tool import calculate_indicators_tool, calculate_indicators_batch_tool
+from .liquidation_tool import detect_liquidation_levels_tool, detect_liquidation_levels_batch_tool
 from .annotation_tool import create_chart_annotation_tool
 from .strategy_tool import generate_strategy_tool
 
 __all__ = [
     "get_ohlc_data_tool",
+    "get_ohlc_data_batch_tool",
     "calculate_indicators_tool",
+    "calculate_indicators_batch_tool",
     "detect_liquidation_levels_tool",
+    "detect_liquidation_levels_batch_tool",
     "create_chart_annotation_tool",
     "generate_strategy_tool"
 ]
@@ -1,6 +1,6 @@
-import json
 from typing import Dict, Any
 from repositories.annotation_repository import AnnotationRepository
+from mcp_server.tools.serialization import dumps
 
 
 async def create_chart_annotation_tool(
@@ -40,7 +40,7 @@ async def create_chart_annotation_tool(
             "label": label
         }
 
-        return json.dumps(result)
+        return dumps(result)
 
     except Exception as e:
         error_result = {
@@ -48,7 +48,7 @@ async def create_chart_annotation_tool(
             "error": str(e),
             "symbol": symbol
         }
-        return json.dumps(error_result)
+        return dumps(error_result)
 
 
 async def create_liquidation_zone_tool(
@@ -94,7 +94,7 @@ async def create_liquidation_zone_tool(
             "strength": strength
         }
 
-        return json.dumps(result)
+        return dumps(result)
 
     except Exception as e:
         error_result = {
@@ -102,7 +102,7 @@ async def create_liquidation_zone_tool(
             "error": str(e),
             "symbol": symbol
         }
-        return json.dumps(error_result)
+        return dumps(error_result)
 
 
 # Tool metadata for MCP server registration
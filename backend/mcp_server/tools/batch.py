@@ -0,0 +1,36 @@
+"""
+Concurrent fan-out for multi-symbol MCP tools
+"""
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+
+# Symbols processed at once, so one large batch cannot drain the DB pool
+BATCH_CONCURRENCY = 8
+
+
+async def run_batch(
+    symbols: List[str],
+    fn: Callable[..., Awaitable[Dict[str, Any]]],
+    **kwargs: Any
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run a single-symbol tool body for many symbols concurrently
+
+    Args:
+        symbols: Trading pairs (duplicates are processed once)
+        fn: Coroutine function taking the symbol first and returning its
+            result dict (errors reported in the dict, not raised)
+        **kwargs: Arguments shared by every call
+
+    Returns:
+        Dictionary of symbol -> result dict
+    """
+    symbols = list(dict.fromkeys(symbols))
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(symbol: str) -> Dict[str, Any]:
+        async with sem:
+            return await fn(symbol, **kwargs)
+
+    results = await asyncio.gather(*(run(symbol) for symbol in symbols))
+    return dict(zip(symbols, results))
@@ -1,45 +1,82 @@
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from services.market_data_service import MarketDataService
+from mcp_server.tools.batch import run_batch
+from mcp_server.tools.result_cache import cached_dumps
+from mcp_server.tools.serialization import dumps
+
+
+async def _indicators_result(
+    symbol: str,
+    timeframe: str,
+    limit: int
+) -> Dict[str, Any]:
+    """Build the calculate_indicators result for one symbol (errors included)"""
+    try:
+        indicators = await MarketDataService.calculate_technical_indicators(
+            symbol, timeframe, limit
+        )
+
+        return {
+            "success": True,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "indicators": indicators
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "symbol": symbol
+        }
 
 
 async def calculate_indicators_tool(
     symbol: str,
     timeframe: str = "1h",
-    limit: int = 240
+    limit: int = 240,
+    refresh: bool = False
 ) -> str:
     """
     MCP Tool: Calculate technical indicators (RSI, MACD, EMA)
 
+    Successful results are reused until the current candle closes.
+
     Args:
         symbol: Trading pair
         timeframe: Candle timeframe
         limit: Number of candles for calculation
+        refresh: Rebuild the result instead of serving the cached one
 
     Returns:
         JSON string with calculated indicators
     """
-    try:
-        indicators = await MarketDataService.calculate_technical_indicators(
-            symbol, timeframe, limit
-        )
+    return await cached_dumps(
+        ("calculate_indicators", symbol, timeframe, limit),
+        timeframe,
+        lambda: _indicators_result(symbol, timeframe, limit),
+        refresh
+    )
 
-        result = {
-            "success": True,
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "indicators": indicators
-        }
 
-        return json.dumps(result)
+async def calculate_indicators_batch_tool(
+    symbols: List[str],
+    timeframe: str = "1h",
+    limit: int = 240
+) -> str:
+    """
+    MCP Tool: Calculate technical indicators for several symbols concurrently
 
-    except Exception as e:
-        error_result = {
-            "success": False,
-            "error": str(e),
-            "symbol": symbol
-        }
-        return json.dumps(error_result)
+    Args:
+        symbols: Trading pairs
+        timeframe: Candle timeframe
+        limit: Number of candles for calculation
+
+    Returns:
+        JSON string with each symbol's calculate_indicators result under "results"
+    """
+    results = await run_batch(symbols, _indicators_result, timeframe=timeframe, limit=limit)
+    return dumps({"success": True, "timeframe": timeframe, "results": results})
 
 
 # Tool metadata for MCP server registration
@@ -63,8 +100,31 @@ TOOL_METADATA = {
                 "type": "integer",
                 "description": "Number of candles for calculation",
                 "default": 240
+            },
+            "refresh": {
+                "type": "boolean",
+                "description": "Bypass the per-candle result cache",
+                "default": False
             }
         },
         "required": ["symbol"]
     }
 }
+
+BATCH_TOOL_METADATA = {
+    "name": "calculate_indicators_batch",
+    "description": "Calculate RSI, MACD and EMA indicators for several symbols in one call",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "symbols": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Trading pair symbols"
+            },
+            "timeframe": TOOL_METADATA["inputSchema"]["properties"]["timeframe"],
+            "limit": TOOL_METADATA["inputSchema"]["properties"]["limit"]
+        },
+        "required": ["symbols"]
+    }
+}
@@ -1,30 +1,22 @@
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from services.market_data_service import MarketDataService
+from mcp_server.tools.batch import run_batch
+from mcp_server.tools.result_cache import cached_dumps
+from mcp_server.tools.serialization import dumps
 
 
-async def detect_liquidation_levels_tool(
+async def _liquidation_result(
     symbol: str,
-    timeframe: str = "1h",
-    lookback_periods: int = 240
-) -> str:
-    """
-    MCP Tool: Detect liquidation levels (support/resistance zones)
-
-    Args:
-        symbol: Trading pair
-        timeframe: Candle timeframe
-        lookback_periods: Number of periods to analyze
-
-    Returns:
-        JSON string with detected liquidation levels
-    """
+    timeframe: str,
+    lookback_periods: int
+) -> Dict[str, Any]:
+    """Build the detect_liquidation_levels result for one symbol (errors included)"""
     try:
         liquidation_data = await MarketDataService.detect_liquidation_levels(
             symbol, timeframe, lookback_periods
         )
 
-        result = {
+        return {
             "success": True,
             "symbol": symbol,
             "timeframe": timeframe,
@@ -33,15 +25,62 @@ async def detect_liquidation_levels_tool(
             "resistance_levels": liquidation_data.get('resistance_levels', [])
         }
 
-        return json.dumps(result)
-
     except Exception as e:
-        error_result = {
+        return {
             "success": False,
             "error": str(e),
             "symbol": symbol
         }
-        return json.dumps(error_result)
+
+
+async def detect_liquidation_levels_tool(
+    symbol: str,
+    timeframe: str = "1h",
+    lookback_periods: int = 240,
+    refresh: bool = False
+) -> str:
+    """
+    MCP Tool: Detect liquidation levels (support/resistance zones)
+
+    Successful results are reused until the current candle closes.
+
+    Args:
+        symbol: Trading pair
+        timeframe: Candle timeframe
+        lookback_periods: Number of periods to analyze
+        refresh: Rebuild the result instead of serving the cached one
+
+    Returns:
+        JSON string with detected liquidation levels
+    """
+    return await cached_dumps(
+        ("detect_liquidation_levels", symbol, timeframe, lookback_periods),
+        timeframe,
+        lambda: _liquidation_result(symbol, timeframe, lookback_periods),
+        refresh
+    )
+
+
+async def detect_liquidation_levels_batch_tool(
+    symbols: List[str],
+    timeframe: str = "1h",
+    lookback_periods: int = 240
+) -> str:
+    """
+    MCP Tool: Detect liquidation levels for several symbols concurrently
+
+    Args:
+        symbols: Trading pairs
+        timeframe: Candle timeframe
+        lookback_periods: Number of periods to analyze
+
+    Returns:
+        JSON string with each symbol's detect_liquidation_levels result under "results"
+    """
+    results = await run_batch(
+        symbols, _liquidation_result, timeframe=timeframe, lookback_periods=lookback_periods
+    )
+    return dumps({"success": True, "timeframe": timeframe, "results": results})
 
 
 # Tool metadata for MCP server registration
@@ -65,8 +104,31 @@ TOOL_METADATA = {
                 "type": "integer",
                 "description": "Number of periods to analyze for levels",
                 "default": 240
+            },
+            "refresh": {
+                "type": "boolean",
+                "description": "Bypass the per-candle result cache",
+                "default": False
             }
         },
         "required": ["symbol"]
     }
 }
+
+BATCH_TOOL_METADATA = {
+    "name": "detect_liquidation_levels_batch",
+    "description": "Detect liquidation levels and support/resistance zones for several symbols in one call",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "symbols": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Trading pair symbols"
+            },
+            "timeframe": TOOL_METADATA["inputSchema"]["properties"]["timeframe"],
+            "lookback_periods": TOOL_METADATA["inputSchema"]["properties"]["lookback_periods"]
+        },
+        "required": ["symbols"]
+    }
+}
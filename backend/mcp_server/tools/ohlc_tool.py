@@ -1,45 +1,97 @@
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from services.market_data_service import MarketDataService
+from mcp_server.tools.batch import run_batch
+from mcp_server.tools.result_cache import cached_dumps
+from mcp_server.tools.serialization import dumps
+
+
+async def _ohlc_result(
+    symbol: str,
+    timeframe: str,
+    limit: int,
+    format: str
+) -> Dict[str, Any]:
+    """Build the get_ohlc_data result for one symbol (errors included)"""
+    try:
+        if format == "columns":
+            data = await MarketDataService.get_ohlc_columns(symbol, timeframe, limit)
+            count = len(data["t"]) if data else 0
+        else:
+            data = await MarketDataService.get_ohlc_data(symbol, timeframe, limit)
+            count = len(data)
+
+        return {
+            "success": True,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "format": format,
+            "count": count,
+            "data": data
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "symbol": symbol,
+            "timeframe": timeframe
+        }
 
 
 async def get_ohlc_data_tool(
     symbol: str,
     timeframe: str = "1h",
-    limit: int = 240
+    limit: int = 240,
+    format: str = "records",
+    refresh: bool = False
 ) -> str:
     """
     MCP Tool: Fetch OHLC data from TimescaleDB
 
+    Successful results are reused until the current candle closes.
+
     Args:
         symbol: Trading pair (e.g., "BTC/USD")
         timeframe: Candle timeframe (default: "1h")
         limit: Number of candles to fetch (default: 240 for 10 days)
+        format: "records" for one object per candle, or "columns" for
+            parallel 't' (epoch seconds), 'o', 'h', 'l', 'c', 'v' arrays,
+            which skips repeating every key on every candle
+        refresh: Rebuild the result instead of serving the cached one
 
     Returns:
         JSON string with OHLC data
     """
-    try:
-        data = await MarketDataService.get_ohlc_data(symbol, timeframe, limit)
+    return await cached_dumps(
+        ("get_ohlc_data", symbol, timeframe, limit, format),
+        timeframe,
+        lambda: _ohlc_result(symbol, timeframe, limit, format),
+        refresh
+    )
 
-        result = {
-            "success": True,
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "count": len(data),
-            "data": data
-        }
 
-        return json.dumps(result)
+async def get_ohlc_data_batch_tool(
+    symbols: List[str],
+    timeframe: str = "1h",
+    limit: int = 240,
+    format: str = "records"
+) -> str:
+    """
+    MCP Tool: Fetch OHLC data for several symbols concurrently
 
-    except Exception as e:
-        error_result = {
-            "success": False,
-            "error": str(e),
-            "symbol": symbol,
-            "timeframe": timeframe
-        }
-        return json.dumps(error_result)
+    Args:
+        symbols: Trading pairs
+        timeframe: Candle timeframe (default: "1h")
+        limit: Number of candles per symbol (default: 240)
+        format: "records" or "columns", as for get_ohlc_data_tool
+
+    Returns:
+        JSON string with each symbol's get_ohlc_data result under "results"
+    """
+    results = await run_batch(
+        symbols, _ohlc_result, timeframe=timeframe, limit=limit, format=format
+    )
+    return dumps({"success": True, "timeframe": timeframe, "results": results})
 
 
 # Tool metadata for MCP server registration
@@ -65,8 +117,38 @@ TOOL_METADATA = {
                 "default": 240,
                 "minimum": 1,
                 "maximum": 1000
+            },
+            "format": {
+                "type": "string",
+                "description": "records (one object per candle) or columns (one array per field)",
+                "enum": ["records", "columns"],
+                "default": "records"
+            },
+            "refresh": {
+                "type": "boolean",
+                "description": "Bypass the per-candle result cache",
+                "default": False
             }
         },
         "required": ["symbol"]
     }
 }
+
+BATCH_TOOL_METADATA = {
+    "name": "get_ohlc_data_batch",
+    "description": "Fetch OHLC candlestick data for several symbols in one call",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "symbols": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Trading pair symbols"
+            },
+            "timeframe": TOOL_METADATA["inputSchema"]["properties"]["timeframe"],
+            "limit": TOOL_METADATA["inputSchema"]["properties"]["limit"],
+            "format": TOOL_METADATA["inputSchema"]["properties"]["format"]
+        },
+        "required": ["symbols"]
+    }
+}
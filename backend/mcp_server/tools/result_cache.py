@@ -0,0 +1,42 @@
+"""
+Per-candle cache of serialized MCP tool results
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import time
+from cachetools import LRUCache
+from mcp_server.tools.serialization import dumps
+from utils.helpers import timeframe_to_seconds
+
+# (tool key..., candle bucket) -> JSON text; entries from past buckets are
+# never hit again and age out of the LRU
+_results: LRUCache = LRUCache(maxsize=1024)
+
+
+async def cached_dumps(
+    key: Tuple[Hashable, ...],
+    timeframe: str,
+    build: Callable[[], Awaitable[Dict[str, Any]]],
+    refresh: bool = False
+) -> str:
+    """
+    Serve a tool's JSON result from cache for the rest of the current candle
+
+    Args:
+        key: Tool name and arguments identifying the result
+        timeframe: Candle timeframe; the cache bucket is one candle long
+        build: Coroutine function producing the result dict on a miss
+        refresh: Rebuild the result and overwrite any cached entry
+
+    Returns:
+        JSON text (cached only when the result reports success)
+    """
+    bucket = int(time.time()) // timeframe_to_seconds(timeframe)
+    cache_key = (*key, bucket)
+
+    text = None if refresh else _results.get(cache_key)
+    if text is None:
+        result = await build()
+        text = dumps(result)
+        if result.get("success"):
+            _results[cache_key] = text
+    return text
@@ -0,0 +1,21 @@
+"""
+JSON encoding for MCP tool results
+"""
+from typing import Any
+import orjson
+
+_DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(payload: Any) -> str:
+    """
+    Serialize a tool result with orjson
+
+    Args:
+        payload: Tool result (datetimes and numpy values are handled natively;
+            anything else unknown, e.g. Decimal, falls back to str)
+
+    Returns:
+        JSON text for an MCP TextContent
+    """
+    return orjson.dumps(payload, default=str, option=_DUMPS_OPTIONS).decode()
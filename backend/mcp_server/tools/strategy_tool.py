@@ -1,6 +1,6 @@
-import json
 from typing import Dict, Any
 from services.strategy_service import StrategyService
+from mcp_server.tools.serialization import dumps
 
 
 async def generate_strategy_tool(
@@ -34,12 +34,12 @@ async def generate_strategy_tool(
 
         result = {
             "success": True,
-            "strategy": strategy.model_dump(),
+            "strategy": strategy.model_dump(mode="json"),
             "symbol": symbol,
             "timeframe": timeframe
         }
 
-        return json.dumps(result, default=str)
+        return dumps(result)
 
     except Exception as e:
         error_result = {
@@ -47,7 +47,7 @@ async def generate_strategy_tool(
             "error": str(e),
             "symbol": symbol
         }
-        return json.dumps(error_result)
+        return dumps(error_result)
 
 
 # Tool metadata for MCP server registration
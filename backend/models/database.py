@@ -1,9 +1,42 @@
 import asyncpg
+import orjson
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 from config import settings
 
 
+def _encode_jsonb(value: Any) -> bytes:
+    """Binary JSONB wire format: version byte 1, then the JSON text"""
+    return b'\x01' + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Inverse of _encode_jsonb"""
+    return orjson.loads(data[1:])
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """
+    Register per-connection type codecs
+
+    NUMERIC decodes as float so no Decimal escapes the repositories, and
+    JSONB maps to Python objects through orjson.
+    """
+    await conn.set_type_codec(
+        'numeric',
+        encoder=str,
+        decoder=float,
+        schema='pg_catalog',
+        format='text'
+    )
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema='pg_catalog',
+        format='binary'
+    )
+
+
 class Database:
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
@@ -17,7 +50,8 @@ class Database:
             user=settings.timescale_user,
             password=settings.timescale_password,
             min_size=5,
-            max_size=20
+            max_size=20,
+            init=_init_connection
         )
 
     async def disconnect(self):
@@ -36,6 +70,16 @@ class Database:
             rows = await conn.fetch(query, *args)
             return [dict(row) for row in rows]
 
+    async def fetch_records(self, query: str, *args) -> List[asyncpg.Record]:
+        """
+        Fetch multiple rows as asyncpg Records, without copying them into dicts
+
+        Records support row['column'] access, so callers that only read rows
+        to build their own result can skip the per-row dict allocation.
+        """
+        async with self.pool.acquire() as conn:
+            return await conn.fetch(query, *args)
+
     async def fetchrow(self, query: str, *args) -> Optional[Dict[str, Any]]:
         """Fetch a single row"""
         async with self.pool.acquire() as conn:
@@ -48,23 +92,11 @@ class Database:
         timeframe: str = "1h",
         limit: int = 240
     ) -> List[Dict[str, Any]]:
-        """Fetch OHLC data from TimescaleDB"""
-        query = """
-            SELECT
-                time,
-                open,
-                high,
-                low,
-                close,
-                volume
-            FROM ohlc_data
-            WHERE symbol = $1 AND timeframe = $2
-            ORDER BY time DESC
-            LIMIT $3
-        """
-        data = await self.fetch(query, symbol, timeframe, limit)
-        # Reverse to get chronological order
-        return list(reversed(data))
+        """Fetch OHLC data from TimescaleDB (delegates to OHLCRepository)"""
+        # Imported here: the repository module imports this one
+        from repositories.ohlc_repository import OHLCRepository
+
+        return await OHLCRepository.get_ohlc_data(symbol, timeframe, limit)
 
     async def insert_ohlc_data(
         self,
@@ -72,49 +104,29 @@ class Database:
         timeframe: str,
         data: List[Dict[str, Any]]
     ):
-        """Insert OHLC data into TimescaleDB"""
-        query = """
-            INSERT INTO ohlc_data (time, symbol, timeframe, open, high, low, close, volume)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            ON CONFLICT (time, symbol, timeframe) DO UPDATE
-            SET open = EXCLUDED.open,
-                high = EXCLUDED.high,
-                low = EXCLUDED.low,
-                close = EXCLUDED.close,
-                volume = EXCLUDED.volume
         """
-        async with self.pool.acquire() as conn:
-            await conn.executemany(query, [
-                (
-                    row['time'],
-                    symbol,
-                    timeframe,
-                    row['open'],
-                    row['high'],
-                    row['low'],
-                    row['close'],
-                    row['volume']
-                )
-                for row in data
-            ])
+        Insert OHLC data into TimescaleDB
+
+        Delegates to OHLCRepository, which stages large batches with COPY and
+        upserts them in one statement instead of one INSERT per candle.
+        """
+        # Imported here: the repository module imports this one
+        from repositories.ohlc_repository import OHLCRepository
+
+        await OHLCRepository.insert_ohlc_data(symbol, timeframe, data)
 
     async def store_annotation(
         self,
         symbol: str,
         annotation: Dict[str, Any]
     ):
-        """Store chart annotation"""
+        """Store chart annotation (created_at comes from the column default)"""
         query = """
-            INSERT INTO annotations (symbol, annotation_data, created_at)
-            VALUES ($1, $2, $3)
+            INSERT INTO annotations (symbol, annotation_data)
+            VALUES ($1, $2)
             RETURNING id
         """
-        result = await self.fetchrow(
-            query,
-            symbol,
-            annotation,
-            datetime.utcnow()
-        )
+        result = await self.fetchrow(query, symbol, annotation)
         return result['id']
 
     async def get_annotations(self, symbol: str) -> List[Dict[str, Any]]:
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -39,15 +39,14 @@ class StrategyBuildRequest(BaseModel):
     timeframe: TimeframeEnum = Field(default=TimeframeEnum.ONE_HOUR)
     risk_tolerance: Optional[str] = Field(default="medium", description="low, medium, high")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "prompt": "Build a swing trading strategy for Bitcoin using RSI and liquidation zones",
-                "symbol": "BTC/USD",
-                "timeframe": "1h",
-                "risk_tolerance": "medium"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "prompt": "Build a swing trading strategy for Bitcoin using RSI and liquidation zones",
+            "symbol": "BTC/USD",
+            "timeframe": "1h",
+            "risk_tolerance": "medium"
         }
+    })
 
 
 class OHLCRequest(BaseModel):
@@ -60,6 +59,9 @@ class OHLCRequest(BaseModel):
 # Response Models
 class OHLCData(BaseModel):
     """OHLC candle data"""
+    # Candles are never edited after they are built
+    model_config = ConfigDict(frozen=True)
+
     time: datetime
     open: float
     high: float
@@ -93,6 +95,7 @@ class IndicatorAnalysis(BaseModel):
     ema_20: Optional[float] = None
     ema_50: Optional[float] = None
     trend: Optional[str] = None  # uptrend, downtrend, sideways
+    volume_ratio: Optional[float] = None
 
 
 class LiquidationAnalysisResponse(BaseModel):
@@ -163,6 +166,57 @@ class ChartAnnotation(BaseModel):
     created_at: Optional[datetime] = None
 
 
+# LLM Output Models (validated agent responses, also sent as tool schemas)
+class PriceLevel(BaseModel):
+    """Support or resistance level emitted by the Liquidation Agent"""
+    price: float
+    strength: str = Field(..., description="weak, medium or strong")
+    reasoning: Optional[str] = Field(default=None, description="Brief explanation")
+
+
+class LiquidationAgentOutput(BaseModel):
+    """Structured output of the Liquidation Agent LLM call"""
+    support_levels: List[PriceLevel]
+    resistance_levels: List[PriceLevel]
+    liquidation_zones: List[LiquidationZone] = Field(
+        ..., description="Price ranges with strength (weak, medium, strong) and a descriptive label"
+    )
+    analysis_summary: str = Field(..., description="Brief summary of key findings")
+
+
+class IndicatorAgentOutput(BaseModel):
+    """Structured output of the Indicator Agent LLM call"""
+    market_bias: MarketBias
+    indicators: IndicatorAnalysis = Field(
+        ..., description="Indicator values; rsi_signal is oversold/neutral/overbought, "
+                         "macd has macd_line/signal_line/histogram, "
+                         "trend is uptrend/downtrend/sideways"
+    )
+    key_signals: List[str] = Field(..., description="Actionable trading signals")
+    confidence: str = Field(..., description="high, medium or low")
+    analysis_summary: str = Field(
+        ..., description="Brief summary of market condition and recommended action"
+    )
+
+
+class IndicatorLiquidationAgentOutput(BaseModel):
+    """Structured output of the fused indicator + liquidation LLM call"""
+    indicators: IndicatorAgentOutput
+    liquidation: LiquidationAgentOutput
+
+
+class StrategySynthesisOutput(BaseModel):
+    """Structured output of the Orchestrator synthesis LLM call"""
+    strategy_type: StrategyType
+    entry_conditions: List[StrategyCondition]
+    exit_conditions: List[StrategyCondition]
+    risk_management: RiskManagement = Field(
+        ..., description="Stop-loss price, take-profit prices, position size % and risk/reward ratio"
+    )
+    reasoning: str = Field(..., description="Detailed explanation of why this strategy works")
+    confidence_score: float = Field(..., ge=0, le=1)
+
+
 class WebSocketMessage(BaseModel):
     """WebSocket message format"""
     type: str  # price_update, strategy_signal, annotation, status
@@ -1,6 +1,5 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import json
 from models.database import db
 
 
@@ -35,17 +34,17 @@ class AnnotationRepository:
             "label": label
         }
 
+        # created_at comes from the column's DEFAULT NOW()
         query = """
-            INSERT INTO annotations (symbol, annotation_data, created_at)
-            VALUES ($1, $2, $3)
+            INSERT INTO annotations (symbol, annotation_data)
+            VALUES ($1, $2)
             RETURNING id
         """
 
         result = await db.fetchrow(
             query,
             symbol,
-            json.dumps(annotation_data),
-            datetime.utcnow()
+            annotation_data
         )
 
         return str(result['id'])
@@ -73,11 +72,11 @@ class AnnotationRepository:
             LIMIT $2
         """
 
-        rows = await db.fetch(query, symbol, limit)
+        rows = await db.fetch_records(query, symbol, limit)
 
         annotations = []
         for row in rows:
-            annotation = json.loads(row['annotation_data'])
+            annotation = row['annotation_data']
             annotation['id'] = str(row['id'])
             annotation['created_at'] = row['created_at'].isoformat()
             annotation['symbol'] = symbol
@@ -107,7 +106,7 @@ class AnnotationRepository:
         if not row:
             return None
 
-        annotation = json.loads(row['annotation_data'])
+        annotation = row['annotation_data']
         annotation['id'] = str(row['id'])
         annotation['symbol'] = row['symbol']
         annotation['created_at'] = row['created_at'].isoformat()
@@ -285,11 +284,11 @@ class AnnotationRepository:
             LIMIT $3
         """
 
-        rows = await db.fetch(query, symbol, since, limit)
+        rows = await db.fetch_records(query, symbol, since, limit)
 
         annotations = []
         for row in rows:
-            annotation = json.loads(row['annotation_data'])
+            annotation = row['annotation_data']
             annotation['id'] = str(row['id'])
             annotation['created_at'] = row['created_at'].isoformat()
             annotation['symbol'] = symbol
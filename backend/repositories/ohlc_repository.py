@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Iterable, Sequence, Union
 from datetime import datetime
 import asyncpg
 from models.database import db
@@ -7,6 +7,16 @@ from models.database import db
 class OHLCRepository:
     """Repository for OHLC data operations"""
 
+    # Candle fields, in the order of the normalized record tuples
+    _CANDLE_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+
+    # Column order of the records fed to COPY in bulk_insert_many
+    _STAGING_COLUMNS = ['time', 'symbol', 'open', 'high', 'low', 'close', 'volume']
+
+    # Smaller batches (e.g. the 10-candle live sync) skip the COPY staging
+    # round trips and upsert row by row through one prepared statement
+    _COPY_MIN_ROWS = 100
+
     @staticmethod
     async def get_ohlc_data(
         symbol: str,
@@ -22,24 +32,172 @@ class OHLCRepository:
             limit: Number of candles to fetch
 
         Returns:
-            List of OHLC data in chronological order
+            List of OHLC data in chronological order, prices as floats
+        """
+        # Newest N via the (symbol, time DESC) index, re-sorted oldest first
+        # on the server so no Python-side reversal is needed
+        query = """
+            SELECT time, open, high, low, close, volume
+            FROM (
+                SELECT
+                    time,
+                    open,
+                    high,
+                    low,
+                    close,
+                    volume
+                FROM ohlc_data
+                WHERE symbol = $1 AND timeframe = $2
+                ORDER BY time DESC
+                LIMIT $3
+            ) AS latest
+            ORDER BY time ASC
+        """
+        return await db.fetch(query, symbol, timeframe, limit)
+
+    @staticmethod
+    async def get_ohlc_columnar(
+        symbol: str,
+        timeframe: str = "1h",
+        limit: int = 240
+    ) -> Dict[str, List[float]]:
+        """
+        Fetch OHLC data as parallel columns instead of one dict per candle
+
+        Args:
+            symbol: Trading pair (e.g., BTC/USD)
+            timeframe: Candle timeframe
+            limit: Number of candles to fetch
+
+        Returns:
+            Dictionary with 't' (epoch seconds), 'o', 'h', 'l', 'c', 'v'
+            lists in chronological order
+        """
+        query = """
+            SELECT t, open, high, low, close, volume
+            FROM (
+                SELECT
+                    EXTRACT(EPOCH FROM time)::bigint AS t,
+                    open,
+                    high,
+                    low,
+                    close,
+                    volume
+                FROM ohlc_data
+                WHERE symbol = $1 AND timeframe = $2
+                ORDER BY time DESC
+                LIMIT $3
+            ) AS latest
+            ORDER BY t ASC
+        """
+        rows = await db.fetch_records(query, symbol, timeframe, limit)
+
+        t, o, h, l, c, v = [], [], [], [], [], []
+        for row in rows:
+            t.append(row['t'])
+            o.append(row['open'])
+            h.append(row['high'])
+            l.append(row['low'])
+            c.append(row['close'])
+            v.append(row['volume'])
+
+        return {"t": t, "o": o, "h": h, "l": l, "c": c, "v": v}
+
+    @staticmethod
+    async def stream_ohlc(
+        symbol: str,
+        timeframe: str = "1h",
+        limit: int = 240,
+        prefetch: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream OHLC data from TimescaleDB through a server-side cursor
+
+        Args:
+            symbol: Trading pair (e.g., BTC/USD)
+            timeframe: Candle timeframe
+            limit: Number of candles to fetch
+            prefetch: Rows fetched per cursor round-trip
+
+        Yields:
+            OHLC candles in chronological order
+        """
+        query = """
+            SELECT time, open, high, low, close, volume
+            FROM (
+                SELECT
+                    time,
+                    open,
+                    high,
+                    low,
+                    close,
+                    volume
+                FROM ohlc_data
+                WHERE symbol = $1 AND timeframe = $2
+                ORDER BY time DESC
+                LIMIT $3
+            ) AS latest
+            ORDER BY time ASC
+        """
+        async with db.pool.acquire() as conn:
+            # Cursors only live inside a transaction
+            async with conn.transaction():
+                async for row in conn.cursor(query, symbol, timeframe, limit, prefetch=prefetch):
+                    yield dict(row)
+
+    @staticmethod
+    async def get_ohlc_data_bulk(
+        symbols: List[str],
+        timeframe: str = "1h",
+        limit: int = 240
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch the latest OHLC candles for several symbols in one query
+
+        Args:
+            symbols: Trading pairs
+            timeframe: Candle timeframe
+            limit: Number of candles to fetch per symbol
+
+        Returns:
+            Dictionary of symbol -> candles in chronological order, prices as floats
         """
+        # LATERAL keeps the per-symbol index scan + LIMIT of get_ohlc_data
         query = """
             SELECT
-                time,
-                open,
-                high,
-                low,
-                close,
-                volume
-            FROM ohlc_data
-            WHERE symbol = $1 AND timeframe = $2
-            ORDER BY time DESC
-            LIMIT $3
+                s.symbol,
+                c.time,
+                c.open,
+                c.high,
+                c.low,
+                c.close,
+                c.volume
+            FROM unnest($1::text[]) AS s(symbol)
+            CROSS JOIN LATERAL (
+                SELECT
+                    time,
+                    open,
+                    high,
+                    low,
+                    close,
+                    volume
+                FROM ohlc_data
+                WHERE symbol = s.symbol AND timeframe = $2
+                ORDER BY time DESC
+                LIMIT $3
+            ) AS c
         """
-        data = await db.fetch(query, symbol, timeframe, limit)
+        rows = await db.fetch(query, symbols, timeframe, limit)
+
+        grouped: Dict[str, List[Dict[str, Any]]] = {symbol: [] for symbol in symbols}
+        for row in rows:
+            grouped[row.pop('symbol')].append(row)
+
         # Reverse to get chronological order (oldest to newest)
-        return list(reversed(data))
+        for candles in grouped.values():
+            candles.reverse()
+
+        return grouped
 
     @staticmethod
     async def get_latest_candle(
@@ -75,7 +233,7 @@ class OHLCRepository:
     async def insert_ohlc_data(
         symbol: str,
         timeframe: str,
-        data: List[Dict[str, Any]]
+        data: Union[Iterable[Union[Sequence, Dict[str, Any]]], Any]
     ) -> None:
         """
         Insert or update OHLC data in bulk
@@ -83,11 +241,81 @@ class OHLCRepository:
         Args:
             symbol: Trading pair
             timeframe: Candle timeframe
-            data: List of OHLC candles with keys: time, open, high, low, close, volume
+            data: OHLC candles as (time, open, high, low, close, volume) tuples,
+                dicts with those keys, a DataFrame with those columns, or a
+                NumPy structured array with those fields and time in epoch
+                milliseconds
+        """
+        records = OHLCRepository._records(data)
+        if not isinstance(records, list):
+            records = list(records)
+
+        if len(records) < OHLCRepository._COPY_MIN_ROWS:
+            # asyncpg prepares the statement once per pooled connection and
+            # reuses it from its statement cache; executemany pipelines the rows
+            query = """
+                INSERT INTO ohlc_data (time, symbol, timeframe, open, high, low, close, volume)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                ON CONFLICT (time, symbol, timeframe) DO UPDATE
+                SET open = EXCLUDED.open,
+                    high = EXCLUDED.high,
+                    low = EXCLUDED.low,
+                    close = EXCLUDED.close,
+                    volume = EXCLUDED.volume
+            """
+            await db.pool.executemany(query, [
+                (row[0], symbol, timeframe, *row[1:6]) for row in records
+            ])
+            return
+
+        await OHLCRepository.bulk_insert_many(timeframe, {symbol: records})
+
+    @staticmethod
+    async def bulk_insert_many(
+        timeframe: str,
+        data_by_symbol: Dict[str, Any]
+    ) -> int:
+        """
+        Insert or update OHLC data for several symbols in one transaction
+
+        Args:
+            timeframe: Candle timeframe shared by every batch
+            data_by_symbol: Dictionary of symbol -> candles, in any form
+                accepted by insert_ohlc_data
+
+        Returns:
+            Number of candle records written
+        """
+        # Deduplicate on the upsert key before staging: a later row for the
+        # same (time, symbol) overwrites an earlier one, so the last write
+        # wins deterministically
+        deduped = {
+            (row[0], symbol): (row[0], symbol, *row[1:6])
+            for symbol, data in data_by_symbol.items()
+            for row in OHLCRepository._records(data)
+        }
+        if not deduped:
+            return 0
+        records = list(deduped.values())
+
+        # COPY every batch into a session temp table, then upsert from it in
+        # one statement. Staging columns are float8 so the binary COPY does not
+        # go through the text-format numeric codec set on the pool.
+        staging = """
+            CREATE TEMP TABLE IF NOT EXISTS ohlc_staging (
+                time TIMESTAMPTZ,
+                symbol TEXT,
+                open DOUBLE PRECISION,
+                high DOUBLE PRECISION,
+                low DOUBLE PRECISION,
+                close DOUBLE PRECISION,
+                volume DOUBLE PRECISION
+            ) ON COMMIT DELETE ROWS
         """
         query = """
             INSERT INTO ohlc_data (time, symbol, timeframe, open, high, low, close, volume)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            SELECT time, symbol, $1, open, high, low, close, volume
+            FROM ohlc_staging
             ON CONFLICT (time, symbol, timeframe) DO UPDATE
             SET open = EXCLUDED.open,
                 high = EXCLUDED.high,
@@ -97,18 +325,76 @@ class OHLCRepository:
         """
 
         async with db.pool.acquire() as conn:
-            await conn.executemany(query, [
-                (
-                    row['time'],
-                    symbol,
-                    timeframe,
-                    float(row['open']),
-                    float(row['high']),
-                    float(row['low']),
-                    float(row['close']),
-                    float(row['volume'])
+            async with conn.transaction():
+                await conn.execute(staging)
+                await conn.copy_records_to_table(
+                    'ohlc_staging',
+                    records=records,
+                    columns=OHLCRepository._STAGING_COLUMNS
                 )
-                for row in data
+                await conn.execute(query, timeframe)
+
+        return len(records)
+
+    @staticmethod
+    def _records(data: Any) -> Iterable[Sequence]:
+        """Turn any accepted candle container into COPY records"""
+        if hasattr(data, 'itertuples'):
+            # DataFrame: stream rows straight from its columns
+            return list(data[OHLCRepository._CANDLE_COLUMNS].itertuples(index=False, name=None))
+        if hasattr(data, 'dtype'):
+            # Structured array: unpack to Python scalars only here, at the
+            # COPY boundary, using the naive local-time convention for time
+            return [
+                (datetime.fromtimestamp(t * 0.001), o, h, l, c, v)
+                for t, o, h, l, c, v in data.tolist()
+            ]
+        return map(OHLCRepository._as_record, data)
+
+    @staticmethod
+    def _as_record(row: Union[Sequence, Dict[str, Any]]) -> Sequence:
+        """Normalize a candle dict to a (time, open, high, low, close, volume) tuple"""
+        if isinstance(row, dict):
+            return (
+                row['time'],
+                float(row['open']),
+                float(row['high']),
+                float(row['low']),
+                float(row['close']),
+                float(row['volume'])
+            )
+        return row
+
+    @staticmethod
+    async def update_live_candles(
+        timeframe: str,
+        candle_time: datetime,
+        prices: Dict[str, float]
+    ) -> None:
+        """
+        Fold live prices into the open candle of each symbol
+
+        Creates the candle if it does not exist yet; otherwise extends its
+        high/low and moves its close. Volume is left to the next klines sync.
+
+        Args:
+            timeframe: Candle timeframe
+            candle_time: Open time of the current candle
+            prices: Dictionary of symbol -> latest price
+        """
+        query = """
+            INSERT INTO ohlc_data (time, symbol, timeframe, open, high, low, close, volume)
+            VALUES ($1, $2, $3, $4, $4, $4, $4, 0)
+            ON CONFLICT (time, symbol, timeframe) DO UPDATE
+            SET high = GREATEST(ohlc_data.high, EXCLUDED.high),
+                low = LEAST(ohlc_data.low, EXCLUDED.low),
+                close = EXCLUDED.close
+        """
+
+        async with db.pool.acquire() as conn:
+            await conn.executemany(query, [
+                (candle_time, symbol, timeframe, price)
+                for symbol, price in prices.items()
             ])
 
     @staticmethod
@@ -175,7 +461,7 @@ class OHLCRepository:
             LIMIT $3
         """
 
-        data = await db.fetch(query, symbol, timeframe, lookback_periods)
+        data = await db.fetch_records(query, symbol, timeframe, lookback_periods)
 
         highs = [row['high'] for row in data]
         lows = [row['low'] for row in data]
@@ -290,3 +576,26 @@ class OHLCRepository:
         result = await db.execute(query, symbol, before_date)
         # Extract row count from result (format: "DELETE <count>")
         return int(result.split()[-1]) if result else 0
+
+    @staticmethod
+    async def delete_old_data_bulk(
+        symbols: List[str],
+        before_date: datetime
+    ) -> int:
+        """
+        Delete OHLC data older than specified date for several symbols at once
+
+        Args:
+            symbols: Trading pairs
+            before_date: Delete data before this date
+
+        Returns:
+            Number of rows deleted
+        """
+        query = """
+            DELETE FROM ohlc_data
+            WHERE symbol = ANY($1::text[]) AND time < $2
+        """
+        result = await db.execute(query, symbols, before_date)
+        # Extract row count from result (format: "DELETE <count>")
+        return int(result.split()[-1]) if result else 0
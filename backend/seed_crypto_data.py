@@ -2,10 +2,11 @@
 Seed database with cryptocurrency data from Binance
 """
 import asyncio
+import logging
 import sys
 sys.path.insert(0, '.')
 
-from data_ingestion.binance_fetcher import BinanceFetcher
+from data_ingestion.binance_fetcher import binance_fetcher
 from models.database import db
 
 
@@ -30,7 +31,7 @@ async def main():
     print("="*80 + "\n")
 
     await db.connect()
-    fetcher = BinanceFetcher()
+    fetcher = binance_fetcher
 
     print(f"[INFO] Fetching data for {len(CRYPTO_PAIRS)} cryptocurrencies...\n")
 
@@ -41,12 +42,12 @@ async def main():
             # Fetch 1-hour candles (last 100)
             ohlc_data = await fetcher.fetch_ohlc(symbol, interval="1h", limit=100)
 
-            if ohlc_data:
+            if len(ohlc_data):
                 # Store to database
                 await fetcher.store_to_database(symbol, "1h", ohlc_data)
 
                 # Get current price
-                current_price = ohlc_data[0]['close']
+                current_price = ohlc_data["close"][-1]  # close of the newest candle
                 print(f"[OK] {symbol}: ${current_price:,.2f} ({len(ohlc_data)} candles)\n")
             else:
                 print(f"[WARNING] No data for {symbol}\n")
@@ -76,4 +77,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Show the fetchers' progress logs
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
     asyncio.run(main())
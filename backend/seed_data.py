@@ -5,6 +5,7 @@ Run this script to fetch and store historical data before starting the API
 """
 
 import asyncio
+import logging
 import sys
 from data_ingestion.nse_fetcher import NSEFetcher
 from models.database import db
@@ -94,6 +95,7 @@ async def seed_database():
         print(f"❌ Daily data fetch failed: {e}")
 
     # Disconnect
+    await fetcher.close()
     await db.disconnect()
 
     print("\n" + "=" * 60)
@@ -111,4 +113,6 @@ async def seed_database():
 
 
 if __name__ == "__main__":
+    # Show the fetchers' progress logs
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
     asyncio.run(seed_database())
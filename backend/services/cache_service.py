@@ -1,10 +1,18 @@
-import json
+import orjson
 import redis.asyncio as redis
+from decimal import Decimal
 from typing import Any, Optional
 from datetime import timedelta
 from config.settings import settings
 
 
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively (Decimal, float subclasses)"""
+    if isinstance(obj, (Decimal, float)):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 class CacheService:
     """Service for Redis caching operations"""
 
@@ -46,14 +54,33 @@ class CacheService:
             value = await self.redis_client.get(key)
             if value:
                 try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
+                    return orjson.loads(value)
+                except orjson.JSONDecodeError:
                     return value
             return None
         except Exception:
             # Redis unavailable - gracefully return None
             return None
 
+    async def get_raw(self, key: str) -> Optional[str]:
+        """
+        Get a cached value without JSON decoding
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored string or None if not found
+        """
+        if not self.redis_client:
+            return None
+
+        try:
+            return await self.redis_client.get(key)
+        except Exception:
+            # Redis unavailable - gracefully return None
+            return None
+
     async def set(
         self,
         key: str,
@@ -77,7 +104,9 @@ class CacheService:
         try:
             # Serialize value to JSON if it's not a string
             if not isinstance(value, str):
-                value = json.dumps(value)
+                value = orjson.dumps(
+                    value, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY
+                )
 
             if expiration:
                 await self.redis_client.setex(key, expiration, value)
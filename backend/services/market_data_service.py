@@ -1,8 +1,74 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import numpy as np
 from repositories.ohlc_repository import OHLCRepository
+from cachetools import TTLCache
 from services.cache_service import cache_service
+from utils.helpers import OHLC_CACHE_TTL
+from utils.jit import njit
+
+# Process-local tier in front of Redis: absorbs identical calls that land
+# within a few seconds of each other without a network round-trip
+_local_ohlc_cache: TTLCache = TTLCache(maxsize=1024, ttl=5)
+# Same tier for the columnar (one array per field) view used by indicators
+_local_column_cache: TTLCache = TTLCache(maxsize=1024, ttl=5)
+
+# Market summaries keyed by (symbol, timeframe), plus the computations in
+# flight so concurrent callers share one instead of racing the cache
+MARKET_SUMMARY_TTL = 60
+_summary_cache: TTLCache = TTLCache(maxsize=256, ttl=MARKET_SUMMARY_TTL)
+_summary_inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+
+# Indicator recurrences, compiled by numba when it is installed. Callers
+# check lengths first: compiled code does no bounds checking.
+@njit(cache=True, fastmath=True)
+def _rsi_kernel(prices: np.ndarray, period: int) -> np.ndarray:
+    """Wilder RSI over prices (requires len(prices) > period)"""
+    n = len(prices)
+    gains = np.zeros(n - 1)
+    losses = np.zeros(n - 1)
+    for i in range(n - 1):
+        delta = prices[i + 1] - prices[i]
+        if delta > 0:
+            gains[i] = delta
+        elif delta < 0:
+            losses[i] = -delta
+
+    avg_gains = np.zeros(n)
+    avg_losses = np.zeros(n)
+    avg_gains[period] = np.mean(gains[:period])
+    avg_losses[period] = np.mean(losses[:period])
+
+    for i in range(period + 1, n):
+        avg_gains[i] = (avg_gains[i - 1] * (period - 1) + gains[i - 1]) / period
+        avg_losses[i] = (avg_losses[i - 1] * (period - 1) + losses[i - 1]) / period
+
+    rsi = np.empty(n)
+    for i in range(n):
+        rs = avg_gains[i] / (avg_losses[i] + 1e-10)  # Avoid division by zero
+        rsi[i] = 100 - (100 / (1 + rs))
+    return rsi
+
+
+@njit(cache=True, fastmath=True)
+def _ema_kernel(prices: np.ndarray, period: int) -> np.ndarray:
+    """EMA seeded with the SMA of the first period values (requires len(prices) >= period)"""
+    ema = np.zeros(len(prices))
+    multiplier = 2 / (period + 1)
+
+    ema[period - 1] = np.mean(prices[:period])
+    for i in range(period, len(prices)):
+        ema[i] = (prices[i] - ema[i - 1]) * multiplier + ema[i - 1]
+    return ema
+
+
+def warm_up_indicator_kernels():
+    """Compile the indicator kernels now rather than on the first request"""
+    prices = np.linspace(1.0, 2.0, 64)
+    _rsi_kernel(prices, 14)
+    _ema_kernel(prices, 26)
 
 
 class MarketDataService:
@@ -16,7 +82,7 @@ class MarketDataService:
         use_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
-        Get OHLC data with caching
+        Get OHLC data with two-tier caching (process-local, then Redis)
 
         Args:
             symbol: Trading pair
@@ -25,26 +91,118 @@ class MarketDataService:
             use_cache: Whether to use cache
 
         Returns:
-            List of OHLC candles
+            List of OHLC candles (times are ISO strings when served from Redis)
         """
-        # Try cache first
-        if use_cache:
-            cached_data = await cache_service.get_cached_ohlc_data(
-                symbol, timeframe, limit
-            )
-            if cached_data:
-                return cached_data
+        if not use_cache:
+            return await OHLCRepository.get_ohlc_data(symbol, timeframe, limit)
+
+        local_key = (symbol, timeframe, limit)
+        data = _local_ohlc_cache.get(local_key)
+        if data is not None:
+            return data
+
+        data = await cache_service.get_cached_ohlc_data(symbol, timeframe, limit)
+        if not data:
+            # Fetch from database
+            data = await OHLCRepository.get_ohlc_data(symbol, timeframe, limit)
+            if data:
+                await cache_service.cache_ohlc_data(
+                    symbol, timeframe, limit, data,
+                    expiration=OHLC_CACHE_TTL.get(timeframe, 60)
+                )
+
+        if data:
+            _local_ohlc_cache[local_key] = data
+        return data
 
-        # Fetch from database
-        data = await OHLCRepository.get_ohlc_data(symbol, timeframe, limit)
+    @staticmethod
+    async def get_ohlc_columns(
+        symbol: str,
+        timeframe: str = "1h",
+        limit: int = 240
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get OHLC data as one float array per field, with two-tier caching
 
-        # Cache for 1 hour (3600 seconds)
-        if use_cache and data:
-            await cache_service.cache_ohlc_data(
-                symbol, timeframe, limit, data, expiration=3600
+        Redis holds the plain column lists; the process-local tier keeps the
+        arrays themselves so repeat calls skip the conversion too.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles
+
+        Returns:
+            Dictionary with 't' (epoch seconds), 'o', 'h', 'l', 'c', 'v'
+            arrays in chronological order (empty if there is no data)
+        """
+        local_key = (symbol, timeframe, limit)
+        columns = _local_column_cache.get(local_key)
+        if columns is not None:
+            return columns
+
+        # Under the ohlc:{symbol}: prefix so invalidate_ohlc_cache clears it too
+        cache_key = f"ohlc:{symbol}:{timeframe}:{limit}:columns"
+        raw = await cache_service.get(cache_key)
+        if not raw:
+            raw = await OHLCRepository.get_ohlc_columnar(symbol, timeframe, limit)
+            if not raw["t"]:
+                return {}
+            await cache_service.set(
+                cache_key, raw, expiration=OHLC_CACHE_TTL.get(timeframe, 60)
             )
 
-        return data
+        columns = {
+            name: np.asarray(values, dtype=np.int64 if name == "t" else np.float64)
+            for name, values in raw.items()
+        }
+        _local_column_cache[local_key] = columns
+        return columns
+
+    @staticmethod
+    async def get_ohlc_data_bulk(
+        symbols: List[str],
+        timeframe: str = "1h",
+        limit: int = 240,
+        use_cache: bool = True
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get OHLC data for several symbols, fetching cache misses in one query
+
+        Args:
+            symbols: Trading pairs
+            timeframe: Candle timeframe
+            limit: Number of candles per symbol
+            use_cache: Whether to use cache
+
+        Returns:
+            Dictionary of symbol -> OHLC candles
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        missing = symbols
+
+        if use_cache:
+            cached = await asyncio.gather(*(
+                cache_service.get_cached_ohlc_data(symbol, timeframe, limit)
+                for symbol in symbols
+            ))
+            results = {symbol: data for symbol, data in zip(symbols, cached) if data}
+            missing = [symbol for symbol in symbols if symbol not in results]
+
+        if missing:
+            fetched = await OHLCRepository.get_ohlc_data_bulk(missing, timeframe, limit)
+            results.update(fetched)
+
+            if use_cache:
+                await asyncio.gather(*(
+                    cache_service.cache_ohlc_data(
+                        symbol, timeframe, limit, data,
+                        expiration=OHLC_CACHE_TTL.get(timeframe, 60)
+                    )
+                    for symbol, data in fetched.items() if data
+                ))
+
+        return results
 
     @staticmethod
     async def get_latest_price(symbol: str, timeframe: str = "1h") -> Optional[float]:
@@ -78,17 +236,15 @@ class MarketDataService:
         Returns:
             Dictionary of calculated indicators
         """
-        ohlc_data = await MarketDataService.get_ohlc_data(
+        columns = await MarketDataService.get_ohlc_columns(
             symbol, timeframe, limit
         )
 
-        if not ohlc_data:
+        if not columns:
             return {}
 
-        closes = np.array([candle['close'] for candle in ohlc_data])
-        highs = np.array([candle['high'] for candle in ohlc_data])
-        lows = np.array([candle['low'] for candle in ohlc_data])
-        volumes = np.array([candle['volume'] for candle in ohlc_data])
+        closes = columns['c']
+        volumes = columns['v']
 
         indicators = {}
 
@@ -134,24 +290,9 @@ class MarketDataService:
     @staticmethod
     def _calculate_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate RSI indicator"""
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-
-        avg_gains = np.zeros(len(prices))
-        avg_losses = np.zeros(len(prices))
-
-        avg_gains[period] = np.mean(gains[:period])
-        avg_losses[period] = np.mean(losses[:period])
-
-        for i in range(period + 1, len(prices)):
-            avg_gains[i] = (avg_gains[i-1] * (period - 1) + gains[i-1]) / period
-            avg_losses[i] = (avg_losses[i-1] * (period - 1) + losses[i-1]) / period
-
-        rs = avg_gains / (avg_losses + 1e-10)  # Avoid division by zero
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi
+        if len(prices) <= period:
+            raise IndexError(f"RSI({period}) needs more than {period} prices, got {len(prices)}")
+        return _rsi_kernel(np.ascontiguousarray(prices, dtype=np.float64), period)
 
     @staticmethod
     def _get_rsi_signal(rsi_value: float) -> str:
@@ -166,16 +307,9 @@ class MarketDataService:
     @staticmethod
     def _calculate_ema(prices: np.ndarray, period: int) -> np.ndarray:
         """Calculate EMA indicator"""
-        ema = np.zeros(len(prices))
-        multiplier = 2 / (period + 1)
-
-        # Start with SMA for first value
-        ema[period - 1] = np.mean(prices[:period])
-
-        for i in range(period, len(prices)):
-            ema[i] = (prices[i] - ema[i-1]) * multiplier + ema[i-1]
-
-        return ema
+        if len(prices) < period:
+            raise IndexError(f"EMA({period}) needs at least {period} prices, got {len(prices)}")
+        return _ema_kernel(np.ascontiguousarray(prices, dtype=np.float64), period)
 
     @staticmethod
     def _calculate_macd(
@@ -308,9 +442,46 @@ class MarketDataService:
             'current_price': current_price,
             'indicators': indicators,
             'liquidation_levels': liquidation_levels,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.utcnow()
         }
 
+    @staticmethod
+    async def get_cached_market_summary(
+        symbol: str,
+        timeframe: str = "1h"
+    ) -> Dict[str, Any]:
+        """
+        Get market summary, computed at most once per TTL per (symbol, timeframe)
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+
+        Returns:
+            Market summary (may be up to MARKET_SUMMARY_TTL seconds old)
+        """
+        key = (symbol, timeframe)
+        summary = _summary_cache.get(key)
+        if summary is not None:
+            return summary
+
+        task = _summary_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                MarketDataService.get_market_summary(symbol, timeframe)
+            )
+            _summary_inflight[key] = task
+
+            def _done(t: asyncio.Task):
+                _summary_inflight.pop(key, None)
+                if not t.cancelled() and t.exception() is None:
+                    _summary_cache[key] = t.result()
+
+            task.add_done_callback(_done)
+
+        # Shield so one caller disconnecting does not cancel the shared computation
+        return await asyncio.shield(task)
+
     @staticmethod
     async def calculate_indicators(
         symbol: str,
@@ -0,0 +1,93 @@
+"""
+Request coalescing for per-symbol lookups
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+import asyncio
+
+
+class BatchLoader:
+    """
+    Collects concurrent per-key loads and resolves them with one bulk call
+
+    Loads that share the same extra arguments are grouped; a group is
+    flushed after `window_seconds` or as soon as it holds `max_batch`
+    distinct keys, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[..., Awaitable[Dict[Hashable, Any]]],
+        window_seconds: float = 0.01,
+        max_batch: int = 50
+    ):
+        """
+        Args:
+            batch_fn: Coroutine taking (keys, *args) and returning {key: value}
+            window_seconds: How long to wait for more loads before flushing
+            max_batch: Flush early once this many keys are pending
+        """
+        self.batch_fn = batch_fn
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        # args -> {key: [futures waiting on that key]}
+        self._pending: Dict[Tuple, Dict[Hashable, List[asyncio.Future]]] = {}
+        self._timers: Dict[Tuple, asyncio.TimerHandle] = {}
+        # Strong references so in-flight dispatch tasks are not collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable, *args) -> Any:
+        """
+        Load one key, sharing the bulk call with concurrent loads
+
+        Args:
+            key: Item to load (e.g., a symbol)
+            *args: Extra bulk-call arguments; only loads with equal args batch together
+
+        Returns:
+            Value for the key, or None if the bulk call did not return it
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        group = self._pending.setdefault(args, {})
+        group.setdefault(key, []).append(future)
+
+        if len(group) >= self.max_batch:
+            self._flush(args)
+        elif args not in self._timers:
+            self._timers[args] = loop.call_later(self.window_seconds, self._flush, args)
+
+        return await future
+
+    def _flush(self, args: Tuple) -> None:
+        """Hand the pending group for `args` to a bulk-fetch task"""
+        timer = self._timers.pop(args, None)
+        if timer:
+            timer.cancel()
+
+        group = self._pending.pop(args, None)
+        if group:
+            task = asyncio.create_task(self._dispatch(group, args))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(
+        self,
+        group: Dict[Hashable, List[asyncio.Future]],
+        args: Tuple
+    ) -> None:
+        """Run the bulk call and fan results out to every waiter"""
+        try:
+            results = await self.batch_fn(list(group), *args)
+        except Exception as e:
+            for futures in group.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, futures in group.items():
+            value = results.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
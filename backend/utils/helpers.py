@@ -1,4 +1,58 @@
 from typing import Optional
+import time
+
+
+# Duration of one candle for each supported timeframe, in seconds
+TIMEFRAME_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400
+}
+
+
+# Redis TTL for cached candles: intraday data refreshes within a minute,
+# 4h/1d candles rarely change
+OHLC_CACHE_TTL = {
+    "1m": 60,
+    "5m": 60,
+    "15m": 60,
+    "30m": 60,
+    "1h": 60,
+    "4h": 86400,
+    "1d": 86400
+}
+
+
+def timeframe_to_seconds(timeframe: str, default: int = 3600) -> int:
+    """
+    Get the candle duration for a timeframe
+
+    Args:
+        timeframe: Candle timeframe (1m, 5m, 15m, 30m, 1h, 4h, 1d)
+        default: Fallback duration for unknown timeframes
+
+    Returns:
+        Candle duration in seconds
+    """
+    return TIMEFRAME_SECONDS.get(timeframe, default)
+
+
+def seconds_to_next_candle(timeframe: str) -> int:
+    """
+    Get the time left until the current candle closes
+
+    Args:
+        timeframe: Candle timeframe (1m, 5m, 15m, 30m, 1h, 4h, 1d)
+
+    Returns:
+        Seconds until the next candle boundary (UTC-aligned)
+    """
+    period = timeframe_to_seconds(timeframe)
+    return period - int(time.time()) % period
 
 
 def format_price(price: float, decimals: int = 2) -> str:
@@ -0,0 +1,91 @@
+"""
+HTTP caching helpers (ETag / Cache-Control) for GET endpoints
+"""
+from typing import Any, Dict
+from fastapi import Request, Response
+import hashlib
+import orjson
+
+
+def make_etag(data: bytes) -> str:
+    """
+    Build a strong ETag for a serialized payload
+
+    Args:
+        data: Bytes to fingerprint
+
+    Returns:
+        Quoted ETag value
+    """
+    return f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client already holds this version
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        True if If-None-Match lists the ETag
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (
+        tag.strip() for tag in if_none_match.split(",")
+    )
+
+
+def cache_headers(etag: str, max_age: int) -> Dict[str, str]:
+    """
+    Build ETag + Cache-Control headers
+
+    Args:
+        etag: Current ETag of the resource
+        max_age: Seconds the response may be reused without revalidation
+
+    Returns:
+        Header dictionary
+    """
+    return {"ETag": etag, "Cache-Control": f"max-age={max_age}"}
+
+
+def cached_json_response(
+    request: Request,
+    payload: Any,
+    max_age: int,
+    etag_source: Any = None
+) -> Response:
+    """
+    Serialize a payload with ETag/Cache-Control, answering 304 when unchanged
+
+    Args:
+        request: Incoming request
+        payload: Response body
+        max_age: Seconds the response may be reused without revalidation
+        etag_source: Stable part of the payload to fingerprint; defaults to the
+            payload itself. Pass it to keep per-request fields (timestamps) out
+            of the ETag
+
+    Returns:
+        200 JSON response, or an empty 304 if the client's copy is current
+    """
+    body = None
+    if etag_source is None:
+        body = orjson.dumps(payload)
+        etag = make_etag(body)
+    else:
+        etag = make_etag(orjson.dumps(etag_source))
+
+    headers = cache_headers(etag, max_age)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        body if body is not None else orjson.dumps(payload),
+        media_type="application/json",
+        headers=headers
+    )
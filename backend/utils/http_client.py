@@ -0,0 +1,25 @@
+"""
+Shared outbound HTTP client settings
+"""
+import httpx
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build the process-wide HTTP/2 client used by the data fetchers
+
+    One pool for every upstream (Binance, Yahoo) keeps connection limits,
+    keep-alive and timeouts tuned in a single place.
+
+    Returns:
+        New AsyncClient; the caller owns it and must close it
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0),
+        http2=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=40,
+            max_connections=100,
+            keepalive_expiry=30.0
+        )
+    )
@@ -26,6 +26,15 @@ interface Message {
   showActions?: boolean
 }
 
+type ChatIntent = "liquidity_levels" | "technical_indicators" | "trading_strategy" | "current_price"
+
+// Quick actions send a fixed intent so the backend can skip keyword detection
+const QUICK_ACTIONS: { label: string; message: string; intent: ChatIntent }[] = [
+  { label: "Price", message: "What is the current price?", intent: "current_price" },
+  { label: "Liquidity levels", message: "Show me liquidity levels", intent: "liquidity_levels" },
+  { label: "Indicators", message: "Show me technical indicators", intent: "technical_indicators" },
+]
+
 interface ChatPanelProps {
   onClose: () => void
   currentSymbol?: string
@@ -45,18 +54,16 @@ export default function ChatPanel({ onClose, currentSymbol, onSymbolChange, onMa
   const [input, setInput] = useState("")
   const [isLoading, setIsLoading] = useState(false)
 
-  const handleSend = async () => {
-    if (!input.trim() || isLoading) return
+  const sendMessage = async (userInput: string, intent?: ChatIntent) => {
+    if (!userInput.trim() || isLoading) return
 
     const userMessage: Message = {
       id: Date.now().toString(),
       role: "user",
-      content: input,
+      content: userInput,
     }
 
     setMessages((prev) => [...prev, userMessage])
-    const userInput = input
-    setInput("")
     setIsLoading(true)
 
     try {
@@ -70,6 +77,7 @@ export default function ChatPanel({ onClose, currentSymbol, onSymbolChange, onMa
           message: userInput,
           symbol: currentSymbol,
           timeframe: "1h",
+          intent,
         }),
       })
 
@@ -111,6 +119,12 @@ export default function ChatPanel({ onClose, currentSymbol, onSymbolChange, onMa
     }
   }
 
+  const handleSend = () => {
+    const userInput = input
+    setInput("")
+    sendMessage(userInput)
+  }
+
   const handleAcceptLevels = (messageId: string) => {
     const message = messages.find((m) => m.id === messageId)
     if (message && message.liquidityData && message.symbol && onMarkLevels) {
@@ -210,6 +224,22 @@ export default function ChatPanel({ onClose, currentSymbol, onSymbolChange, onMa
 
       {/* Input Area */}
       <div className="border-t border-border p-4">
+        {currentSymbol && (
+          <div className="mb-2 flex gap-2">
+            {QUICK_ACTIONS.map((action) => (
+              <Button
+                key={action.intent}
+                size="sm"
+                variant="outline"
+                onClick={() => sendMessage(action.message, action.intent)}
+                disabled={isLoading}
+                className="h-7 text-xs"
+              >
+                {action.label}
+              </Button>
+            ))}
+          </div>
+        )}
         <div className="flex gap-2">
           <Input
             value={input}